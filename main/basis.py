@@ -0,0 +1,108 @@
+import numpy as np
+
+STRUCTURAL = 0
+SLACK = 1
+ARTIFICIAL = 2
+
+
+class Basis:
+    """
+    Basis bookkeeping by column index.
+
+    head[i] is the column basic in row i (-1 if none), row_of[j] the row
+    where column j is basic (-1 if nonbasic) and kind[j] tells whether
+    column j is structural, slack or artificial. Every query is an array
+    lookup; variable names are only generated for reports.
+    """
+
+    __slots__ = ("head", "row_of", "kind")
+
+    def __init__(self, num_rows, kinds):
+        self.head = np.full(num_rows, -1, dtype=np.intp)
+        self.kind = np.asarray(kinds, dtype=np.int8)
+        self.row_of = np.full(len(self.kind), -1, dtype=np.intp)
+
+    def __len__(self):
+        return len(self.head)
+
+    def __getitem__(self, row):
+        return int(self.head[row])
+
+    def enter(self, row, col):
+        """
+        Makes col basic in row and returns the column that left (-1 if none).
+        """
+        leaving = int(self.head[row])
+        if leaving >= 0:
+            self.row_of[leaving] = -1
+        self.head[row] = col
+        self.row_of[col] = row
+        return leaving
+
+    def is_basic(self, col):
+        return self.row_of[col] >= 0
+
+    def basic_mask(self):
+        return self.row_of >= 0
+
+    def artificial_rows(self):
+        """
+        Rows whose basic variable is an artificial one.
+        """
+        basic = self.head >= 0
+        rows = np.flatnonzero(basic)
+        return rows[self.kind[self.head[rows]] == ARTIFICIAL]
+
+    def drop_rows(self, rows):
+        if len(rows) == 0:
+            return
+        self.head = np.delete(self.head, rows)
+        self._reindex()
+
+    def drop_artificial_columns(self):
+        """
+        Removes the artificial columns, which are always the last ones.
+        """
+        keep = self.kind != ARTIFICIAL
+        if keep.all():
+            return
+        first = int(np.argmin(keep))
+        self.kind = self.kind[:first]
+        self.head[self.head >= first] = -1
+        self._reindex()
+
+    def add_row(self, col, kind):
+        """
+        Inserts a new column of the given kind at index col (later columns
+        shift by one) and makes it basic in a new last row.
+        """
+        self.kind = np.insert(self.kind, col, kind)
+        head = self.head.copy()
+        head[head >= col] += 1
+        self.head = np.append(head, col)
+        self._reindex()
+
+    def _reindex(self):
+        self.row_of = np.full(len(self.kind), -1, dtype=np.intp)
+        basic = self.head >= 0
+        self.row_of[self.head[basic]] = np.flatnonzero(basic)
+
+    def copy(self):
+        other = Basis.__new__(Basis)
+        other.head = self.head.copy()
+        other.row_of = self.row_of.copy()
+        other.kind = self.kind
+        return other
+
+
+def column_names(kinds):
+    """
+    Report names for the columns: x1.., w1.. for slacks, a1.. for artificials.
+    """
+    prefix = {STRUCTURAL: "x", SLACK: "w", ARTIFICIAL: "a"}
+    counts = {STRUCTURAL: 0, SLACK: 0, ARTIFICIAL: 0}
+    names = []
+    for k in np.asarray(kinds).tolist():
+        counts[k] += 1
+        names.append(f"{prefix[k]}{counts[k]}")
+    return names
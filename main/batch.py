@@ -0,0 +1,204 @@
+# batch.py
+import argparse
+import glob
+import json
+import os
+import time
+from multiprocessing import Pool
+
+from cache import SolveCache
+from interior_point import InteriorPoint, auto_engine
+from readers import read_model
+from revised_simplex import RevisedSimplex
+from simplex import Simplex
+
+ENGINES = {
+    "tableau": Simplex,
+    "revised": RevisedSimplex,
+    "interior": InteriorPoint,
+    # InteriorPoint or Simplex depending on the model's size and density
+    "auto": auto_engine,
+}
+
+# one cache per worker process, opened on its first task
+_cache = None
+
+
+def worker_cache(path, maxsize):
+    global _cache
+    if _cache is None or _cache.store.path != path:
+        _cache = SolveCache(maxsize=maxsize, path=path)
+    return _cache
+
+
+def collect_problems(source):
+    """
+    Problem files named by source, which can be:
+        a directory  every file directly inside it
+        a glob       e.g. "input/*.txt" (recursive with "**")
+        a manifest   text file with one problem path per line (relative
+                     paths are taken from the manifest's directory; blank
+                     lines and lines starting with # are skipped)
+    """
+    if os.path.isdir(source):
+        return sorted(
+            os.path.join(source, name) for name in os.listdir(source)
+            if os.path.isfile(os.path.join(source, name))
+        )
+    if glob.has_magic(source):
+        return sorted(p for p in glob.glob(source, recursive=True) if os.path.isfile(p))
+    if os.path.isfile(source):
+        base = os.path.dirname(source)
+        paths = []
+        with open(source, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    paths.append(os.path.join(base, line))
+        return paths
+    raise ValueError(f"No problem files found for: {source}")
+
+
+def solve_file(task):
+    """
+    Parses and solves one problem file. Runs in the worker processes, so it
+    never raises: any failure is reported in the record's "error" field.
+
+    task: (path, engine, solver_options, cache), cache being None or
+        (sqlite path, memory entries) of a SolveCache shared by the workers
+    """
+    path, engine, options, cache = task
+    record = {
+        "file": path,
+        "status": "error",
+        "optimal_value": None,
+        "solution": None,
+        "iterations": 0,
+        "primal_residual": None,
+        "parse_time": 0.0,
+        "solve_time": 0.0,
+        "cached": False,
+        "error": None,
+    }
+    try:
+        if cache is not None:
+            start = time.perf_counter()
+            stored, record["cached"] = worker_cache(*cache).solve_file(
+                path, ENGINES[engine], **options
+            )
+            record["solve_time"] = time.perf_counter() - start
+            for field in ("status", "optimal_value", "solution", "iterations"):
+                record[field] = stored[field]
+            return record
+
+        start = time.perf_counter()
+        result = read_model(path, sparse=True)
+        record["parse_time"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        simplex = ENGINES[engine](
+            objective_coeffs=result["objective_coeffs"],
+            constraints=result["constraints"],
+            objective_type=result["objective_type"],
+            var_signs=result["var_signs"],
+            bounds=result["bounds"],
+            trace="off",
+            **options
+        )
+        solution = simplex.solve()
+        record["solve_time"] = time.perf_counter() - start
+
+        record["status"] = solution["status"]
+        record["optimal_value"] = solution["optimal_value"]
+        record["solution"] = solution["solution"]
+        record["iterations"] = simplex.iterations
+        residuals = simplex.residuals()
+        if residuals is not None:
+            record["primal_residual"] = max(residuals.values())
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def run_batch(paths, output_path, workers=None, chunksize=8, engine="tableau", cache=None,
+              cache_size=256, **options):
+    """
+    Solves every file in paths over a pool of worker processes and writes
+    one JSON object per problem to output_path as soon as its chunk is done
+    (so the order of the lines is the completion order, not the input
+    order).
+
+    Args:
+        workers: number of processes (None = os.cpu_count())
+        chunksize: problems sent to a worker per task
+        engine: "tableau" (Simplex), "revised" (RevisedSimplex), "interior"
+            (InteriorPoint) or "auto" (interior_point.auto_engine)
+        cache: sqlite file of a cache.SolveCache shared by the workers and
+            by later runs; repeated problems are then not solved again (their
+            records have "cached": true and no primal_residual)
+        cache_size: records kept in memory by each worker's cache
+        options: passed to the solver (method, pricing, backend, ...)
+
+    Returns:
+        dict {status: count}, plus "cached": count when a cache is used
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine: {engine}")
+    directory = os.path.dirname(output_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    cache = (cache, cache_size) if cache else None
+    tasks = [(path, engine, options, cache) for path in paths]
+    counts = {}
+    with open(output_path, "w", encoding="utf-8") as out, Pool(workers) as pool:
+        for record in pool.imap_unordered(solve_file, tasks, chunksize=max(1, chunksize)):
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+            counts[record["status"]] = counts.get(record["status"], 0) + 1
+            if record["cached"]:
+                counts["cached"] = counts.get("cached", 0) + 1
+    return counts
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Solves many LP files in parallel.")
+    ap.add_argument("source", help="directory, glob pattern or manifest file")
+    ap.add_argument("-o", "--output", default="output/batch.jsonl", help="JSON-lines results file")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: all CPUs)")
+    ap.add_argument("--chunksize", type=int, default=8, help="problems per task sent to a worker")
+    ap.add_argument("--engine", choices=sorted(ENGINES), default="tableau")
+    ap.add_argument("--method", choices=["big_m", "two_phase", "dual"], default="big_m")
+    ap.add_argument("--pricing", default="dantzig")
+    ap.add_argument("--backend", choices=["numpy", "list"], default="numpy")
+    ap.add_argument("--presolve", action="store_true", help="reduce each model before solving")
+    ap.add_argument("--scaling", choices=["geometric", "equilibrate", "geometric+equilibrate"],
+                    default=None, help="scale each model before solving")
+    ap.add_argument("--crash", action="store_true", help="crash basis instead of all artificials")
+    ap.add_argument("--anti-cycling", choices=["perturb", "bland", "off"], default="perturb",
+                    help="what to do when degenerate pivots stall the simplex")
+    ap.add_argument("--max-iterations", type=int, default=None, help="pivots allowed per simplex loop")
+    ap.add_argument("--cache", default=None, help="sqlite file caching results across runs")
+    ap.add_argument("--cache-size", type=int, default=256, help="cached results kept in memory per worker")
+    args = ap.parse_args()
+
+    paths = collect_problems(args.source)
+    options = {"method": args.method, "pricing": args.pricing, "presolve": args.presolve,
+               "scaling": args.scaling, "crash": args.crash, "anti_cycling": args.anti_cycling,
+               "max_iterations": args.max_iterations}
+    if args.engine != "revised":
+        options["backend"] = args.backend
+
+    start = time.perf_counter()
+    counts = run_batch(paths, args.output, workers=args.workers, chunksize=args.chunksize,
+                       engine=args.engine, cache=args.cache, cache_size=args.cache_size,
+                       **options)
+    elapsed = time.perf_counter() - start
+
+    print(f"{len(paths)} problemas em {elapsed:.2f}s -> {args.output}")
+    for status, count in sorted(counts.items()):
+        print(f"  {status}: {count}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""
+Benchmark suite: seeded random LPs and known hard cases, timed phase by
+phase, with JSON baselines to track regressions.
+
+    python -m benchmark run -o output/benchmark.json
+    python -m benchmark compare output/benchmark.json output/new.json
+"""
+from benchmark.generator import benchmark_cases, format_model, random_lp
+from benchmark.runner import compare_results, run_case, run_suite
@@ -0,0 +1,80 @@
+import argparse
+import sys
+
+from batch import ENGINES
+
+from benchmark.generator import SHAPES, benchmark_cases
+from benchmark.runner import compare_results, load_results, run_suite, save_results
+
+
+def run(args):
+    options = {"method": args.method, "pricing": args.pricing}
+    if args.engine != "revised":
+        options["backend"] = args.backend
+    cases = benchmark_cases(args.grid, args.seed)
+    if args.only:
+        cases = [case for case in cases if args.only in case[0]]
+
+    def progress(name, result):
+        flag = "" if result["ok"] else "  <- resultado inesperado"
+        print(f"{name:<40} {result['status']:<22} {result['iterations']:>6} it "
+              f"{result['total_time'] * 1000:>9.2f} ms{flag}")
+
+    results = run_suite(cases, args.engine, args.repeat, progress, **options)
+    save_results(results, args.output)
+    print(f"{len(cases)} casos -> {args.output}")
+    if args.baseline:
+        return report_regressions(load_results(args.baseline), results, args.threshold)
+    return 0
+
+
+def report_regressions(baseline, current, threshold):
+    regressions = compare_results(baseline, current, threshold)
+    for name, metric, old, new in regressions:
+        if isinstance(old, float):
+            print(f"REGRESSÃO {name}: {metric} {old * 1000:.2f} ms -> {new * 1000:.2f} ms "
+                  f"({(new / old - 1) * 100 if old else float('inf'):+.0f}%)")
+        else:
+            print(f"REGRESSÃO {name}: {metric} {old} -> {new}")
+    if not regressions:
+        print(f"Nenhuma regressão acima de {threshold * 100:.0f}%")
+    return 1 if regressions else 0
+
+
+def compare(args):
+    return report_regressions(load_results(args.baseline), load_results(args.current),
+                              args.threshold)
+
+
+def main():
+    ap = argparse.ArgumentParser(prog="python -m benchmark",
+                                 description="Benchmarks the solver and tracks regressions.")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    run_ap = sub.add_parser("run", help="run the suite and save the results as JSON")
+    run_ap.add_argument("-o", "--output", default="output/benchmark.json")
+    run_ap.add_argument("--grid", choices=sorted(SHAPES), default="full")
+    run_ap.add_argument("--seed", type=int, default=0)
+    run_ap.add_argument("--repeat", type=int, default=3, help="runs per case (best time is kept)")
+    run_ap.add_argument("--only", default=None, help="run only the cases whose name contains this")
+    run_ap.add_argument("--engine", choices=sorted(ENGINES), default="tableau")
+    run_ap.add_argument("--method", choices=["big_m", "two_phase", "dual"], default="two_phase")
+    run_ap.add_argument("--pricing", default="dantzig")
+    run_ap.add_argument("--backend", choices=["numpy", "list"], default="numpy")
+    run_ap.add_argument("--baseline", default=None, help="compare against this results file")
+    run_ap.add_argument("--threshold", type=float, default=0.10)
+    run_ap.set_defaults(func=run)
+
+    cmp_ap = sub.add_parser("compare", help="compare two results files")
+    cmp_ap.add_argument("baseline")
+    cmp_ap.add_argument("current")
+    cmp_ap.add_argument("--threshold", type=float, default=0.10,
+                        help="relative slowdown flagged as a regression (0.10 = 10%%)")
+    cmp_ap.set_defaults(func=compare)
+
+    args = ap.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
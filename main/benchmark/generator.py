@@ -0,0 +1,212 @@
+import random
+
+INF = float("inf")
+
+SIGN_BOUNDS = {
+    ">=0": (0, INF),
+    "<=0": (-INF, 0),
+    "free": (-INF, INF),
+}
+
+
+def model_dict(objective_type, c, constraints, var_signs):
+    """
+    A model in the layout returned by Parser.parse().
+    """
+    return {
+        "objective_type": objective_type,
+        "objective_coeffs": list(c),
+        "constraints": constraints,
+        "num_vars": len(c),
+        "non_negative": [s == ">=0" for s in var_signs],
+        "var_signs": list(var_signs),
+        "bounds": [SIGN_BOUNDS[s] for s in var_signs],
+    }
+
+
+def random_lp(m, n, density=1.0, mix=(1.0, 0.0, 0.0), signs=(1.0, 0.0, 0.0), seed=0):
+    """
+    Seeded random LP with an optimal solution.
+
+    A point x0 with the drawn signs makes every row feasible ("<=" rows
+    get slack above A x0, ">=" rows below, "=" rows none) and the
+    objective is c = A^T y adjusted by a dual feasible y, so the LP is
+    bounded as well.
+
+    Args:
+        m, n: rows and variables
+        density: fraction of nonzero coefficients (every row keeps one)
+        mix: weights of "<=", ">=" and "=" rows
+        signs: weights of ">=0", "<=0" and free variables
+    """
+    rng = random.Random(seed)
+    var_signs = rng.choices([">=0", "<=0", "free"], weights=signs, k=n)
+    ops = rng.choices(["<=", ">=", "="], weights=mix, k=m)
+
+    x0 = []
+    for s in var_signs:
+        value = rng.randint(0, 5)
+        x0.append(-value if s == "<=0" else value if s == ">=0" else rng.randint(-5, 5))
+
+    rows = []
+    for _ in range(m):
+        row = [rng.randint(1, 9) * rng.choice((1, 1, 1, -1)) if rng.random() < density else 0
+               for _ in range(n)]
+        if not any(row):
+            row[rng.randrange(n)] = rng.randint(1, 9)
+        rows.append(row)
+
+    constraints = []
+    y = []
+    for row, op in zip(rows, ops):
+        lhs = sum(a * x for a, x in zip(row, x0))
+        if op == "<=":
+            constraints.append((row, op, lhs + rng.randint(0, 20)))
+            y.append(rng.randint(0, 3))
+        elif op == ">=":
+            constraints.append((row, op, lhs - rng.randint(0, 20)))
+            y.append(-rng.randint(0, 3))
+        else:
+            constraints.append((row, op, lhs))
+            y.append(rng.randint(-3, 3))
+
+    # dual feasibility for max c^T x: A^T y >= c on >=0 columns, <= c on
+    # <=0 columns, = c on free ones
+    c = []
+    for j, s in enumerate(var_signs):
+        aty = sum(row[j] * yi for row, yi in zip(rows, y))
+        if s == ">=0":
+            c.append(aty - rng.randint(0, 5))
+        elif s == "<=0":
+            c.append(aty + rng.randint(0, 5))
+        else:
+            c.append(aty)
+
+    if rng.random() < 0.5:
+        return model_dict("Max", c, constraints, var_signs)
+    return model_dict("Min", [-x for x in c], constraints, var_signs)
+
+
+def infeasible_lp(m, n, seed=0):
+    """
+    random_lp plus two rows that cannot hold together.
+    """
+    model = random_lp(m, n, mix=(0.7, 0.2, 0.1), seed=seed)
+    row = [1] * n
+    model["constraints"] = model["constraints"] + [(row, "<=", 1), (list(row), ">=", 3)]
+    model["var_signs"] = [">=0"] * n
+    model["non_negative"] = [True] * n
+    model["bounds"] = [SIGN_BOUNDS[">=0"]] * n
+    return model
+
+
+def unbounded_lp(m, n, seed=0):
+    """
+    random_lp with an extra variable that improves the objective and only
+    appears with non-positive coefficients in "<=" rows.
+    """
+    model = random_lp(m, n, mix=(1.0, 0.0, 0.0), seed=seed)
+    rng = random.Random(seed)
+    constraints = [(row + [-rng.randint(0, 3)], op, rhs) for row, op, rhs in model["constraints"]]
+    sense = 1 if model["objective_type"] == "Max" else -1
+    model = model_dict(model["objective_type"], model["objective_coeffs"] + [sense],
+                       constraints, model["var_signs"] + [">=0"])
+    return model
+
+
+def beale_lp():
+    """
+    Beale's example (in Chvatal's coefficients): cycles under Dantzig
+    pricing with a careless tie-breaking rule. Optimal value 5/4, at
+    x = (1, 0, 1, 0).
+    """
+    constraints = [
+        ([0.25, -8, -1, 9], "<=", 0),
+        ([0.5, -12, -0.5, 3], "<=", 0),
+        ([0, 0, 1, 0], "<=", 1),
+    ]
+    return model_dict("Max", [0.75, -20, 0.5, -6], constraints, [">=0"] * 4)
+
+
+def klee_minty_lp(n):
+    """
+    Klee-Minty cube: Dantzig pricing visits all 2^n vertices. Optimal value
+    5^n.
+    """
+    constraints = []
+    for i in range(n):
+        row = [2 * 2 ** (i - j) for j in range(i)] + [1] + [0] * (n - i - 1)
+        constraints.append((row, "<=", 5 ** (i + 1)))
+    return model_dict("Max", [2 ** (n - 1 - j) for j in range(n)], constraints, [">=0"] * n)
+
+
+def degenerate_lp(m, n, seed=0):
+    """
+    random_lp whose "<=" rows all pass through the origin (zero RHS), so
+    most pivots are degenerate. The origin is optimal or the LP is
+    unbounded, depending on the objective.
+    """
+    model = random_lp(m, n, density=0.6, seed=seed)
+    model["constraints"] = [(row, "<=", 0) for row, _, _ in model["constraints"]]
+    model["var_signs"] = [">=0"] * n
+    model["non_negative"] = [True] * n
+    model["bounds"] = [SIGN_BOUNDS[">=0"]] * n
+    return model
+
+
+SHAPES = {
+    "small": [(10, 10), (30, 10)],
+    "full": [(10, 10), (30, 10), (40, 40), (80, 50), (120, 80)],
+}
+DENSITIES = {"dense": 1.0, "sparse": 0.3}
+MIXES = {"le": (1.0, 0.0, 0.0), "mixed": (0.7, 0.2, 0.1)}
+SIGNS = {"nonneg": (1.0, 0.0, 0.0), "signed": (0.6, 0.2, 0.2)}
+
+
+def benchmark_cases(grid="full", seed=0):
+    """
+    The benchmark suite: random LPs over the grid of shapes x densities x
+    row mixes x sign patterns, then the special cases.
+
+    Returns:
+        list of (name, model, expected) where expected is a dict with the
+        known "status" (and "optimal_value") or None
+    """
+    cases = []
+    for m, n in SHAPES[grid]:
+        for dname, density in DENSITIES.items():
+            for mname, mix in MIXES.items():
+                for sname, signs in SIGNS.items():
+                    name = f"random_{m}x{n}_{dname}_{mname}_{sname}"
+                    model = random_lp(m, n, density, mix, signs, seed=seed + len(cases))
+                    cases.append((name, model, {"status": "optimal"}))
+
+    cases.append(("beale", beale_lp(), {"status": "optimal", "optimal_value": 1.25}))
+    cases.append(("klee_minty_6", klee_minty_lp(6), {"status": "optimal", "optimal_value": 5.0 ** 6}))
+    cases.append(("degenerate_20x15", degenerate_lp(20, 15, seed), None))
+    cases.append(("infeasible_20x15", infeasible_lp(20, 15, seed), {"status": "infeasible"}))
+    cases.append(("unbounded_20x15", unbounded_lp(20, 15, seed), {"status": "unbounded"}))
+    return cases
+
+
+def format_term(coeff, j, first):
+    sign = "-" if coeff < 0 else ("" if first else "+")
+    return f"{sign} {abs(coeff)!r} x{j + 1}".strip()
+
+
+def format_model(model):
+    """
+    The model in the text format read by Parser (as in input/input.txt).
+    """
+    n = model["num_vars"]
+    terms = [format_term(a, j, k == 0) for k, (j, a) in
+             enumerate((j, a) for j, a in enumerate(model["objective_coeffs"]) if a != 0)]
+    lines = [model["objective_type"].upper() + " " + (" ".join(terms) or "0 x1"), ""]
+    for row, op, rhs in model["constraints"]:
+        nonzero = [(j, a) for j, a in enumerate(row) if a != 0]
+        terms = [format_term(a, j, k == 0) for k, (j, a) in enumerate(nonzero)]
+        lines.append(f"{' '.join(terms)} {op} {rhs!r}")
+    lines.append("")
+    for j, sign in enumerate(model["var_signs"][:n]):
+        lines.append(f"x{j + 1} livre" if sign == "free" else f"x{j + 1} {sign[:2]} 0")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,174 @@
+import json
+import os
+import platform
+import tempfile
+import time
+
+import numpy as np
+
+from batch import ENGINES
+from parser import Parser
+
+from benchmark.generator import format_model
+
+TIMINGS = ("parse_time", "build_time", "iteration_time", "report_time")
+
+
+class PhaseTimer:
+    """
+    Accumulates the time spent in the wrapped engine methods.
+    """
+
+    def __init__(self):
+        self.elapsed = 0.0
+
+    def wrap(self, method):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.elapsed += time.perf_counter() - start
+        return timed
+
+
+def run_case(name, model, expected=None, engine="tableau", repeat=3, workdir=None, **options):
+    """
+    Writes the model in the text format, then parses, solves and writes
+    the report of it `repeat` times, keeping the best time of each phase:
+        parse_time      Parser on the model file
+        build_time      building the starting tableau / basis
+        iteration_time  the rest of solve() (the pivots)
+        report_time     write_report
+
+    Returns:
+        dict with the status, optimal value, iterations, the timings and
+        "ok" (False when the result differs from expected)
+    """
+    workdir = workdir or tempfile.gettempdir()
+    model_path = os.path.join(workdir, f"{name}.txt")
+    report_path = os.path.join(workdir, f"{name}.out")
+    with open(model_path, "w", encoding="utf-8") as f:
+        f.write(format_model(model))
+
+    best = dict.fromkeys(TIMINGS, float("inf"))
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        parsed = Parser(model_path).parse()
+        parse_time = time.perf_counter() - start
+
+        simplex = ENGINES[engine](
+            objective_coeffs=parsed["objective_coeffs"],
+            constraints=parsed["constraints"],
+            objective_type=parsed["objective_type"],
+            var_signs=parsed["var_signs"],
+            bounds=parsed["bounds"],
+            trace="off",
+            **options
+        )
+        timer = PhaseTimer()
+        simplex.prepare_tableau = timer.wrap(simplex.prepare_tableau)
+        simplex.prepare_warm_start = timer.wrap(simplex.prepare_warm_start)
+        start = time.perf_counter()
+        solution = simplex.solve()
+        solve_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        simplex.write_report(report_path)
+        report_time = time.perf_counter() - start
+
+        for key, value in zip(TIMINGS, (parse_time, timer.elapsed, solve_time - timer.elapsed,
+                                        report_time)):
+            best[key] = min(best[key], value)
+
+    for path in (model_path, report_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    ok = True
+    if expected is not None:
+        ok = solution["status"] == expected["status"]
+        if ok and "optimal_value" in expected:
+            ok = abs(solution["optimal_value"] - expected["optimal_value"]) <= \
+                1e-6 * max(1.0, abs(expected["optimal_value"]))
+    return {
+        "status": solution["status"],
+        "optimal_value": solution["optimal_value"],
+        "iterations": simplex.iterations,
+        "rows": len(parsed["constraints"]),
+        "vars": parsed["num_vars"],
+        **best,
+        "total_time": sum(best.values()),
+        "ok": ok,
+    }
+
+
+def run_suite(cases, engine="tableau", repeat=3, progress=None, **options):
+    """
+    Runs every (name, model, expected) case.
+
+    Returns:
+        {"meta": {...}, "cases": {name: run_case result}}
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, model, expected in cases:
+            results[name] = run_case(name, model, expected, engine, repeat, workdir, **options)
+            if progress:
+                progress(name, results[name])
+    return {
+        "meta": {
+            "engine": engine,
+            "options": options,
+            "repeat": repeat,
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "cases": results,
+    }
+
+
+def save_results(results, path):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def load_results(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_results(baseline, current, threshold=0.10, min_time=1e-3):
+    """
+    Flags the cases of current that regressed against baseline:
+        status   a different status, or a failed expectation
+        time     a phase (or the total) slower by more than threshold
+                 (relative), ignoring phases under min_time seconds in both
+                 runs, where timer noise dominates
+        iterations  more pivots than threshold allows
+
+    Returns:
+        list of (case, metric, old, new) regressions
+    """
+    regressions = []
+    for name, new in current["cases"].items():
+        old = baseline["cases"].get(name)
+        if old is None:
+            continue
+        if new["status"] != old["status"] or (old["ok"] and not new["ok"]):
+            regressions.append((name, "status", old["status"], new["status"]))
+            continue
+        for key in TIMINGS + ("total_time",):
+            if max(old[key], new[key]) < min_time:
+                continue
+            if new[key] > old[key] * (1.0 + threshold):
+                regressions.append((name, key, old[key], new[key]))
+        if new["iterations"] > old["iterations"] * (1.0 + threshold):
+            regressions.append((name, "iterations", old["iterations"], new["iterations"]))
+    return regressions
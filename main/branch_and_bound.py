@@ -0,0 +1,415 @@
+import heapq
+import itertools
+import math
+import multiprocessing
+import os
+import time
+
+from simplex import SIGN_BOUNDS, Simplex
+
+INF = float("inf")
+
+NODE_SELECTION = ("best_bound", "depth_first")
+
+# engine of a pool worker, built once by start_worker
+_engine = None
+
+
+def make_engine(model, engine=Simplex, options=None):
+    """
+    LP engine for a model dict (as returned by Parser.parse / read_model).
+    """
+    options = dict(options or {})
+    options.setdefault("trace", "off")
+    return engine(
+        objective_coeffs=model["objective_coeffs"],
+        constraints=model["constraints"],
+        objective_type=model["objective_type"],
+        var_signs=model.get("var_signs"),
+        bounds=model.get("bounds"),
+        **options
+    )
+
+
+def solve_node(simplex, bounds, basis=None, flipped=None):
+    """
+    Solves the LP of one node: the model with the node's bounds, warm
+    started from basis (the parent's final basis) when there is one.
+
+    Returns:
+        dict with status, optimal_value, solution, iterations and the
+        final basis / flipped columns (None when there is no basis)
+    """
+    if basis is None:
+        simplex.update_bounds(bounds)
+        result = simplex.solve()
+    else:
+        # update_bounds drops what no longer fits the new bounds (flipped
+        # columns without an upper bound, the basis of another layout)
+        simplex.load_basis(basis, flipped)
+        simplex.update_bounds(bounds)
+        result = simplex.resolve()
+    final = simplex.final_basis
+    return {
+        "status": result["status"],
+        "optimal_value": result["optimal_value"],
+        "solution": result["solution"],
+        "iterations": simplex.iterations,
+        "basis": None if final is None else [int(j) for j in final],
+        "flipped": None if final is None else [bool(f) for f in simplex.final_flipped],
+    }
+
+
+def start_worker(model, engine, options):
+    global _engine
+    _engine = make_engine(model, engine, options)
+
+
+def evaluate_node(task):
+    return solve_node(_engine, *task)
+
+
+class BranchAndBound:
+    """
+    Branch and bound for models with integer variables, on top of an LP
+    engine (Simplex by default).
+
+    Every node is the LP relaxation of the model with tightened bounds. A
+    node whose solution has a fractional integer variable x_j = v (the most
+    fractional one) gets two children, x_j <= floor(v) and x_j >= ceil(v),
+    which are solved from the parent's final basis (Simplex.update_bounds
+    and resolve: the basis stays dual feasible, so a few dual simplex
+    pivots instead of a solve from scratch). Nodes whose LP value cannot
+    beat the incumbent by more than the gap are pruned.
+
+    node_selection:
+        "best_bound"   the open node with the best LP value first (fewest
+                       nodes to prove optimality)
+        "depth_first"  the deepest node first, the child on the side v
+                       rounds to before the other (incumbents early, few
+                       open nodes)
+
+    With workers > 1 the open nodes are evaluated in batches of `workers`
+    nodes on a process pool; each worker builds the engine once and keeps
+    it warm between nodes.
+
+    progress holds one entry at most every log_interval seconds, plus one
+    per new incumbent and one at the end: time, nodes, open, incumbent,
+    bound, gap and nodes_per_second (report() formats them).
+    """
+
+    def __init__(self, model, integer=None, engine=Simplex, node_selection="best_bound",
+                 workers=1, gap=1e-6, max_nodes=100000, time_limit=None, tolerance=1e-6,
+                 log_interval=1.0, **options):
+        """
+        Args:
+            model: dict as returned by Parser.parse() / read_model
+            integer: the integer variables, as a list of 0-based indices or
+                of booleans per variable (default: model["integer"])
+            engine: LP engine class; only with native bounds (Simplex)
+                do children keep the parent's columns and warm start, other
+                engines solve every node from scratch
+            workers: processes evaluating nodes (None: all CPUs)
+            gap: relative gap between the best bound and the incumbent at
+                which the search stops (also the pruning tolerance)
+            max_nodes, time_limit: the search stops after that many nodes
+                or seconds (status "node_limit" / "time_limit")
+            tolerance: distance to the nearest integer still taken as
+                integral
+            options: passed to the engine (method, pricing, ...)
+        """
+        if node_selection not in NODE_SELECTION:
+            raise ValueError(f"Unknown node selection: {node_selection}")
+        self.model = model
+        n = len(model["objective_coeffs"])
+        if integer is None:
+            integer = model.get("integer") or []
+        if len(integer) == n and all(isinstance(flag, bool) for flag in integer):
+            integer = [j for j, flag in enumerate(integer) if flag]
+        self.integer = sorted(set(integer))
+        self.engine = engine
+        self.node_selection = node_selection
+        self.workers = workers or multiprocessing.cpu_count()
+        self.gap = gap
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.tolerance = tolerance
+        self.log_interval = log_interval
+        self.options = options
+        self.sense = 1.0 if model["objective_type"].capitalize() == "Max" else -1.0
+
+        self.status = None
+        self.solution = None
+        self.optimal_value = None
+        self.nodes = 0
+        self.iterations = 0
+        self.progress = []
+
+    def root_bounds(self):
+        """
+        (lower, upper) of every variable, rounded inwards for the integer
+        ones; None when that leaves an integer variable without a value.
+        """
+        model = self.model
+        n = len(model["objective_coeffs"])
+        if model.get("bounds") is not None:
+            bounds = [(-INF if lower is None else float(lower), INF if upper is None else float(upper))
+                      for lower, upper in model["bounds"][:n]]
+        else:
+            signs = model.get("var_signs") or []
+            bounds = [SIGN_BOUNDS.get(s, (-INF, INF)) for s in signs[:n]]
+        bounds += [(0.0, INF)] * (n - len(bounds))
+        for j in self.integer:
+            lower, upper = bounds[j]
+            if math.isfinite(lower):
+                lower = float(math.ceil(lower - self.tolerance))
+            if math.isfinite(upper):
+                upper = float(math.floor(upper + self.tolerance))
+            if lower > upper:
+                return None
+            bounds[j] = (lower, upper)
+        return bounds
+
+    def branching_variable(self, solution):
+        """
+        Most fractional integer variable of solution, or None if all of
+        them are integral.
+        """
+        best, best_distance = None, self.tolerance
+        for j in self.integer:
+            value = solution[j]
+            distance = abs(value - round(value))
+            if distance > best_distance:
+                best, best_distance = j, distance
+        return best
+
+    def solve(self):
+        """
+        Runs the search.
+
+        Returns:
+            dict with status ("optimal", "infeasible", "unbounded" when the
+            root LP is, "node_limit", "time_limit" or the status of a node
+            the engine could not finish), solution and optimal_value (the
+            incumbent, None if there is none), bound (best possible value),
+            gap and nodes
+        """
+        self.start = time.perf_counter()
+        self.nodes = 0
+        self.iterations = 0
+        self.progress = []
+        self.solution = None
+        self.incumbent = -INF
+        self.last_log = self.start
+        order = itertools.count()
+        self.open = []
+
+        bounds = self.root_bounds()
+        if bounds is None:
+            return self.finish("infeasible")
+        self.push(bounds, 0, INF, None, None, 0.0, order)
+
+        pool = None
+        if self.workers > 1:
+            pool = multiprocessing.get_context().Pool(
+                self.workers, initializer=start_worker,
+                initargs=(self.model, self.engine, self.options),
+            )
+            evaluate = lambda tasks: pool.map(evaluate_node, tasks, chunksize=1)
+        else:
+            simplex = make_engine(self.model, self.engine, self.options)
+            evaluate = lambda tasks: [solve_node(simplex, *task) for task in tasks]
+
+        status = None
+        try:
+            while self.open:
+                if self.gap_closed():
+                    break
+                if self.nodes >= self.max_nodes:
+                    status = "node_limit"
+                    break
+                if self.time_limit is not None and time.perf_counter() - self.start >= self.time_limit:
+                    status = "time_limit"
+                    break
+
+                batch = self.next_nodes()
+                if not batch:
+                    break
+                results = evaluate([(node_bounds, basis, flipped)
+                                    for _, _, node_bounds, basis, flipped in batch])
+                for node, result in zip(batch, results):
+                    self.nodes += 1
+                    self.iterations += result["iterations"]
+                    if result["status"] == "optimal":
+                        self.branch(node, result, order)
+                    elif result["status"] == "unbounded" and self.nodes == 1:
+                        return self.finish("unbounded")
+                    elif result["status"] not in ("infeasible", "unbounded"):
+                        # a node the engine could not finish (iteration
+                        # limit) cannot be pruned: the search stops with its
+                        # status and the incumbent so far
+                        return self.finish(result["status"])
+                if time.perf_counter() - self.last_log >= self.log_interval:
+                    self.log_progress()
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+        if status is None:
+            status = "optimal" if self.solution is not None else "infeasible"
+        return self.finish(status)
+
+    def push(self, bounds, depth, bound, basis, flipped, preference, order):
+        """
+        Adds an open node. The heap key is the LP bound of its parent (best
+        bound) or its depth, then which side of the branch it is on (depth
+        first).
+        """
+        if self.node_selection == "best_bound":
+            key = (-bound, -depth)
+        else:
+            key = (-depth, preference)
+        heapq.heappush(self.open, (key, next(order), (depth, bound, bounds, basis, flipped)))
+
+    def next_nodes(self):
+        """
+        Up to `workers` open nodes that can still beat the incumbent.
+        """
+        batch = []
+        while self.open and len(batch) < self.workers:
+            _, _, node = heapq.heappop(self.open)
+            if not self.prunable(node[1]):
+                batch.append(node)
+        return batch
+
+    def prunable(self, bound):
+        if self.incumbent == -INF:
+            return False
+        return bound <= self.incumbent + self.gap * max(1.0, abs(self.incumbent))
+
+    def branch(self, node, result, order):
+        """
+        Prunes an optimal node, takes it as the incumbent when its solution
+        is integral, or pushes its two children.
+        """
+        depth, _, bounds, _, _ = node
+        value = self.sense * result["optimal_value"]
+        if self.prunable(value):
+            return
+        solution = result["solution"]
+        j = self.branching_variable(solution)
+        if j is None:
+            self.incumbent = value
+            self.solution = list(solution)
+            for k in self.integer:
+                self.solution[k] = float(round(solution[k]))
+            self.log_progress()
+            return
+
+        v = solution[j]
+        lower, upper = bounds[j]
+        down = list(bounds)
+        down[j] = (lower, float(math.floor(v)))
+        up = list(bounds)
+        up[j] = (float(math.ceil(v)), upper)
+        # depth first explores the side v rounds to first
+        up_first = v - math.floor(v) >= 0.5
+        # without native bounds the columns and rows follow the bounds, so
+        # the parent's basis may not fit the child
+        basis, flipped = None, None
+        if self.engine.supports_bounds and not self.options.get("presolve"):
+            basis, flipped = result["basis"], result["flipped"]
+        for child, second in ((down, up_first), (up, not up_first)):
+            if child[j][0] <= child[j][1]:
+                self.push(child, depth + 1, value, basis, flipped, float(second), order)
+
+    def best_bound(self):
+        """
+        Best value any open node could still reach (the incumbent when the
+        search is over).
+        """
+        if self.node_selection == "best_bound":
+            # the heap is ordered by bound
+            bounds = [self.open[0][2][1]] if self.open else []
+        else:
+            bounds = [node[1] for _, _, node in self.open]
+        bounds = [bound for bound in bounds if not self.prunable(bound)]
+        if not bounds:
+            return self.incumbent
+        return max(max(bounds), self.incumbent)
+
+    def current_gap(self):
+        if self.incumbent == -INF:
+            return INF
+        return max(0.0, self.best_bound() - self.incumbent) / max(1.0, abs(self.incumbent))
+
+    def gap_closed(self):
+        return self.incumbent > -INF and self.current_gap() <= self.gap
+
+    def log_progress(self):
+        now = time.perf_counter()
+        self.last_log = now
+        elapsed = now - self.start
+        bound = self.best_bound()
+        if self.progress and self.progress[-1]["nodes"] == self.nodes:
+            # no node since the last entry: it is superseded
+            self.progress.pop()
+        self.progress.append({
+            "time": elapsed,
+            "nodes": self.nodes,
+            "open": len(self.open),
+            "incumbent": None if self.incumbent == -INF else self.sense * self.incumbent,
+            "bound": None if bound in (INF, -INF) else self.sense * bound,
+            "gap": self.current_gap(),
+            "nodes_per_second": self.nodes / elapsed if elapsed > 0 else 0.0,
+        })
+
+    def finish(self, status):
+        self.log_progress()
+        self.status = status
+        found = self.solution is not None
+        self.optimal_value = self.sense * self.incumbent if found else None
+        last = self.progress[-1]
+        return {
+            "status": status,
+            "solution": self.solution,
+            "optimal_value": self.optimal_value,
+            "bound": last["bound"],
+            "gap": last["gap"],
+            "nodes": self.nodes,
+        }
+
+    def report(self):
+        """
+        The progress log as text lines (time, nodes, throughput, incumbent,
+        bound and gap).
+        """
+        def value(v):
+            return "-" if v is None else f"{v:.4f}"
+
+        lines = []
+        for entry in self.progress:
+            gap = "-" if entry["gap"] == INF else f"{100.0 * entry['gap']:.4f}%"
+            lines.append(
+                f"{entry['time']:8.3f}s  nós {entry['nodes']:>7}  abertos {entry['open']:>6}  "
+                f"{entry['nodes_per_second']:>8.1f} nós/s  incumbente {value(entry['incumbent'])}  "
+                f"limite {value(entry['bound'])}  gap {gap}"
+            )
+        return lines
+
+    def write_report(self, filepath):
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        lines = ["=" * 80, "Solução (branch and bound)", ""]
+        lines.append(f"Status: {self.status}")
+        lines.append(f"Nós: {self.nodes} ({self.iterations} pivôs)")
+        if self.solution is not None:
+            lines.append(f"FO: {self.optimal_value:.4f}")
+            for i, v in enumerate(self.solution, start=1):
+                lines.append(f"x{i} = {v:.4f}")
+        lines.append("")
+        lines.extend(self.report())
+        with open(filepath, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
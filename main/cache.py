@@ -0,0 +1,279 @@
+import hashlib
+import json
+import os
+import sqlite3
+import struct
+from collections import OrderedDict
+
+from readers import read_model
+from simplex import SIGN_BOUNDS, Simplex
+from sparse import iter_row
+
+INF = float("inf")
+
+# solver options that can change the stored record (status, basis), so they
+# are part of the key; pricing rules and backends only change the path
+OUTCOME_OPTIONS = ("method", "presolve", "scaling", "max_iterations", "anti_cycling", "crossover")
+
+# only these results are stored: a run cut short by an iteration limit says
+# nothing about the model
+FINAL_STATUSES = ("optimal", "infeasible", "unbounded")
+
+
+def pack_float(value):
+    """
+    Exact 8-byte encoding of a number; -0.0 becomes 0.0 and integers and
+    floats with the same value encode alike.
+    """
+    return struct.pack("<d", float(value) + 0.0)
+
+
+def model_key(objective_type, objective_coeffs, constraints, var_signs=None, bounds=None,
+              namespace=""):
+    """
+    SHA-256 of the canonical form of a model, so models that differ only in
+    how they were written get the same key: dense and sparse rows, explicit
+    zeros, 2 vs 2.0, "max" vs "Max" and var_signs vs the equivalent bounds.
+
+    namespace separates results that must not be shared (e.g. engines whose
+    final bases use different layouts).
+    """
+    n = len(objective_coeffs)
+    objective_type = objective_type.capitalize()
+    if objective_type not in ("Max", "Min"):
+        raise ValueError(f"Objective must be Max or Min, got: {objective_type}")
+    if bounds is None:
+        signs = var_signs if var_signs else []
+        bounds = [SIGN_BOUNDS.get(s, (-INF, INF)) for s in signs[:n]]
+    bounds = list(bounds[:n]) + [(0.0, INF)] * (n - len(bounds))
+
+    h = hashlib.sha256()
+    h.update(f"{namespace}|{objective_type}|{n}|{len(constraints)}|".encode())
+    for coeff in objective_coeffs:
+        h.update(pack_float(coeff))
+    for lower, upper in bounds:
+        h.update(pack_float(-INF if lower is None else lower))
+        h.update(pack_float(INF if upper is None else upper))
+    for coeffs, op, rhs in constraints:
+        h.update(op.encode())
+        for j, a in sorted(iter_row(coeffs)):
+            h.update(struct.pack("<q", j))
+            h.update(pack_float(a))
+        h.update(b"|")
+        h.update(pack_float(rhs))
+    return h.hexdigest()
+
+
+def cache_namespace(engine, options):
+    """
+    Key namespace of a solve: the engine class and the options in
+    OUTCOME_OPTIONS that were given.
+    """
+    given = [f"{name}={options[name]!r}" for name in OUTCOME_OPTIONS if name in options]
+    return "|".join([engine.__name__] + given)
+
+
+def file_key(path, namespace=""):
+    """
+    SHA-256 of the raw bytes of a model file (and its extension, which
+    selects the reader), so byte-identical files skip parsing too.
+    """
+    h = hashlib.sha256()
+    h.update(f"{namespace}|{os.path.splitext(path)[1].lower()}|".encode())
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class SqliteStore:
+    """
+    Results on disk, one row per key with the record as JSON. Several
+    processes can share the file: each opens its own connection (WAL mode,
+    waiting up to `timeout` seconds for locks).
+    """
+
+    def __init__(self, path, timeout=30.0):
+        self.path = path
+        self.timeout = timeout
+        self._conn = None
+        self._pid = None
+
+    def connection(self):
+        # connections must not cross a fork
+        if self._conn is None or self._pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, timeout=self.timeout)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, record TEXT NOT NULL)"
+            )
+            self._conn.commit()
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key):
+        row = self.connection().execute(
+            "SELECT record FROM results WHERE key = ?", (key,)
+        ).fetchone()
+        return None if row is None else json.loads(row[0])
+
+    def put(self, key, record):
+        conn = self.connection()
+        conn.execute("INSERT OR REPLACE INTO results (key, record) VALUES (?, ?)",
+                     (key, json.dumps(record)))
+        conn.commit()
+
+    def __len__(self):
+        return self.connection().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
+
+
+class SolveCache:
+    """
+    Solve results keyed on model_key (or file_key): an in-memory LRU of at
+    most `maxsize` records in front of an optional SqliteStore at `path`.
+
+    A record holds status, solution, optimal_value, iterations and the final
+    basis (Simplex.final_basis / final_flipped as lists, None when there is
+    no reusable basis); Simplex.load_basis takes them back for a warm start.
+
+    Counters: hits (memory or disk), disk_hits, misses, evictions (from the
+    memory front only; the disk store keeps everything).
+    """
+
+    def __init__(self, maxsize=256, path=None):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.memory = OrderedDict()
+        self.store = SqliteStore(path) if path else None
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, count_miss=True):
+        """
+        The record stored under key (a copy), or None. count_miss=False
+        leaves the miss to a lookup that follows (solve_file's model key).
+        """
+        record = self.memory.get(key)
+        if record is not None:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return copy_record(record)
+        if self.store is not None:
+            record = self.store.get(key)
+            if record is not None:
+                self.hits += 1
+                self.disk_hits += 1
+                self.remember(key, record)
+                return copy_record(record)
+        if count_miss:
+            self.misses += 1
+        return None
+
+    def put(self, key, record):
+        self.remember(key, copy_record(record))
+        if self.store is not None:
+            self.store.put(key, record)
+
+    def remember(self, key, record):
+        self.memory[key] = record
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.maxsize:
+            self.memory.popitem(last=False)
+            self.evictions += 1
+
+    def solve(self, model, engine=Simplex, **options):
+        """
+        Solves a model dict (as returned by Parser.parse / read_model) with
+        engine(**options), or returns the stored record of an identical
+        model solved with the same engine class and OUTCOME_OPTIONS (the
+        pricing rule or backend do not matter). Only results with a
+        FINAL_STATUSES status are stored.
+
+        Returns:
+            (record, cached)
+        """
+        key = model_key(model["objective_type"], model["objective_coeffs"],
+                        model["constraints"], model.get("var_signs"), model.get("bounds"),
+                        namespace=cache_namespace(engine, options))
+        record = self.get(key)
+        if record is not None:
+            return record, True
+        record = solve_record(model, engine, **options)
+        if record["status"] in FINAL_STATUSES:
+            self.put(key, record)
+        return record, False
+
+    def solve_file(self, path, engine=Simplex, **options):
+        """
+        Like solve() for a model file: byte-identical files are found
+        without parsing, other files are parsed and looked up by model_key.
+        Either way one solve counts one hit or one miss.
+
+        Returns:
+            (record, cached)
+        """
+        fkey = file_key(path, namespace=cache_namespace(engine, options))
+        record = self.get(fkey, count_miss=False)
+        if record is not None:
+            return record, True
+        record, cached = self.solve(read_model(path, sparse=True), engine, **options)
+        if record["status"] in FINAL_STATUSES:
+            self.put(fkey, record)
+        return record, cached
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.memory),
+        }
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+
+
+def copy_record(record):
+    record = dict(record)
+    for field in ("solution", "basis", "flipped"):
+        if record.get(field) is not None:
+            record[field] = list(record[field])
+    return record
+
+
+def solve_record(model, engine=Simplex, **options):
+    """
+    Solves model with engine and returns the record stored by SolveCache.
+    """
+    options.setdefault("trace", "off")
+    simplex = engine(
+        objective_coeffs=model["objective_coeffs"],
+        constraints=model["constraints"],
+        objective_type=model["objective_type"],
+        var_signs=model.get("var_signs"),
+        bounds=model.get("bounds"),
+        **options
+    )
+    solution = simplex.solve()
+    basis = simplex.final_basis
+    return {
+        "status": solution["status"],
+        "solution": solution["solution"],
+        "optimal_value": solution["optimal_value"],
+        "iterations": simplex.iterations,
+        "basis": None if basis is None else [int(j) for j in basis],
+        "flipped": None if basis is None else [bool(f) for f in simplex.final_flipped],
+    }
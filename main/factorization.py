@@ -0,0 +1,110 @@
+import numpy as np
+
+
+class LUFactorization:
+    """
+    LU factorization of a basis matrix B (P B = L U) with product-form
+    (eta file) updates.
+
+    After k basis changes B_k^-1 = E_k ... E_1 B_0^-1, where each E_i is an
+    identity matrix with one column replaced by an eta vector. ftran/btran
+    solve with B_k without ever forming it.
+    """
+
+    def __init__(self, B, pivot_tol=1e-12):
+        self.pivot_tol = pivot_tol
+        self.factorize(B)
+
+    def factorize(self, B):
+        U = np.array(B, dtype=np.float64, copy=True)
+        m = U.shape[0]
+        L = np.eye(m)
+        perm = np.arange(m)
+
+        for k in range(m):
+            p = k + int(np.argmax(np.abs(U[k:, k])))
+            if abs(U[p, k]) < self.pivot_tol:
+                raise ValueError("Singular basis matrix.")
+            if p != k:
+                U[[k, p], k:] = U[[p, k], k:]
+                L[[k, p], :k] = L[[p, k], :k]
+                perm[[k, p]] = perm[[p, k]]
+            factors = U[k + 1:, k] / U[k, k]
+            L[k + 1:, k] = factors
+            U[k + 1:, k:] -= np.outer(factors, U[k, k:])
+
+        self.m = m
+        self.L = L
+        self.U = U
+        self.perm = perm
+        self.etas = []
+
+    @property
+    def num_updates(self):
+        return len(self.etas)
+
+    def ftran(self, v):
+        """
+        Solves B x = v.
+        """
+        x = np.asarray(v, dtype=np.float64)[self.perm]
+        L, U = self.L, self.U
+        for j in range(self.m):
+            if x[j] != 0.0:
+                x[j + 1:] -= L[j + 1:, j] * x[j]
+        for j in range(self.m - 1, -1, -1):
+            if x[j] != 0.0:
+                x[j] /= U[j, j]
+                x[:j] -= U[:j, j] * x[j]
+
+        for r, eta in self.etas:
+            xr = x[r]
+            if xr != 0.0:
+                x += eta * xr
+                x[r] -= xr
+        return x
+
+    def ftran_many(self, V):
+        """
+        Solves B X = V for a matrix V (one right-hand side per column).
+        """
+        X = np.array(V, dtype=np.float64)[self.perm]
+        L, U = self.L, self.U
+        for j in range(self.m):
+            X[j + 1:] -= np.outer(L[j + 1:, j], X[j])
+        for j in range(self.m - 1, -1, -1):
+            X[j] /= U[j, j]
+            X[:j] -= np.outer(U[:j, j], X[j])
+
+        for r, eta in self.etas:
+            xr = X[r].copy()
+            X += np.outer(eta, xr)
+            X[r] -= xr
+        return X
+
+    def btran(self, v):
+        """
+        Solves B^T y = v.
+        """
+        y = np.array(v, dtype=np.float64, copy=True)
+        for r, eta in reversed(self.etas):
+            y[r] = eta @ y
+
+        L, U = self.L, self.U
+        for j in range(self.m):
+            y[j] = (y[j] - U[:j, j] @ y[:j]) / U[j, j]
+        for j in range(self.m - 1, -1, -1):
+            y[j] -= L[j + 1:, j] @ y[j + 1:]
+
+        out = np.empty_like(y)
+        out[self.perm] = y
+        return out
+
+    def update(self, r, alpha):
+        """
+        Records the replacement of basis position r by a column whose
+        ftran is alpha.
+        """
+        eta = -alpha / alpha[r]
+        eta[r] = 1.0 / alpha[r]
+        self.etas.append((r, eta))
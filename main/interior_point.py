@@ -0,0 +1,310 @@
+import numpy as np
+
+from simplex import Simplex
+from sparse import iter_row
+
+# auto_engine picks the interior point method for models at least this
+# large (rows and columns) and this dense; below that the tableau simplex
+# finishes first
+AUTO_MIN_ROWS = 150
+AUTO_MIN_COLUMNS = 150
+AUTO_MIN_DENSITY = 0.2
+
+
+class InteriorPoint(Simplex):
+    """
+    Mehrotra predictor-corrector interior point engine.
+
+    Works on the warm start layout of the internal model (structural
+    columns plus one slack per inequality row, all >= 0):
+
+        min -c^T x   s.t.   [A | S] x = b,   x >= 0
+
+    Each iteration solves the normal equations A D A^T dy = r (D = X / Z)
+    twice, predictor and corrector, with one NumPy Cholesky factorization,
+    so its cost depends on the size of A and not on the number of pivots.
+
+    With crossover (the default) the interior solution is turned into a
+    basic one: the columns that are clearly positive, then slacks, then
+    the rest by x_j / (x_j + z_j), form a basis (the first linearly
+    independent ones), which is loaded as a warm start and finished with
+    the primal simplex (basic values left slightly negative are shifted to
+    zero first and the shift is removed with the dual simplex, as in
+    Simplex.remove_perturbation). The result then has a final basis, so
+    resolve, add_constraint, ranging and sensitivity work as with Simplex.
+    Without crossover the solution is the interior one (no final basis).
+
+    When the method does not converge (infeasible or unbounded models
+    drift off instead) or the columns do not give a full basis, the model
+    is solved with the simplex method instead, which also certifies
+    infeasible and unbounded models.
+
+    Upper bounds and free variables become rows and split columns.
+    """
+
+    supports_bounds = False
+
+    def __init__(self, objective_coeffs, constraints, objective_type="Max", var_signs=None,
+                 crossover=True, tolerance=1e-8, barrier_limit=100, **options):
+        """
+        crossover: finish with a basic solution (see above).
+        tolerance: relative primal, dual and gap residuals to stop at.
+        barrier_limit: interior point iterations before falling back to
+            the simplex method.
+        Other options (backend, method, pricing, trace, ...) are the ones
+        of Simplex; they apply to the crossover and the fallback.
+        """
+        super().__init__(objective_coeffs, constraints, objective_type, var_signs, **options)
+        self.crossover = crossover
+        self.tolerance = tolerance
+        self.barrier_limit = barrier_limit
+        self.barrier_iterations = 0
+        self.barrier_z = None
+        self.interior_solution = None
+
+    def cold_iterations(self):
+        """
+        Interior point method, then crossover; the simplex cold start when
+        either fails.
+        """
+        self.interior_solution = None
+        self.barrier_iterations = 0
+        # diverging iterates overflow before they are detected
+        with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+            x = self.interior_point()
+        if x is None:
+            self.log("Pontos interiores sem convergência: simplex")
+            return super().cold_iterations()
+        if not self.crossover:
+            self.interior_solution = x[:self.num_vars]
+            return "optimal"
+
+        basis = self.crossover_basis(x)
+        if basis is None:
+            self.log("Crossover sem base: simplex")
+            return super().cold_iterations()
+        self.prepare_warm_start(basis)
+        if not self.primal_feasible():
+            # the negative basics are shifted up to zero; the primal simplex
+            # then optimizes and remove_perturbation takes the shift back
+            # (dual simplex from the optimal basis)
+            self.tableau_obj.shift_rhs(np.maximum(-self.basic_values(), 0.0))
+            self.perturbed = True
+        status = self.simplex_iterations()
+        self.log(f"Crossover: {self.iterations} pivôs")
+        return status
+
+    # --- Mehrotra predictor-corrector --------------------------------------
+
+    def interior_point(self):
+        """
+        Runs the predictor-corrector iterations on the working model.
+
+        Returns:
+            x over the warm start columns, or None without convergence
+        """
+        if not self.ops:
+            return None
+        A = self.warm_columns(np.arange(self.num_vars + sum(op != "=" for op in self.ops)))
+        b = np.asarray(self.rhs, dtype=np.float64)
+        c = -np.concatenate([np.asarray(self.c, dtype=np.float64),
+                             np.zeros(A.shape[1] - self.num_vars)])
+        self.barrier_z = None
+
+        solve = self.normal_equations(A, np.ones(A.shape[1]))
+        if solve is None:
+            return None
+        x, y, z = self.starting_point(A, b, c, solve)
+        n = len(x)
+        b_norm = 1.0 + np.linalg.norm(b)
+        c_norm = 1.0 + np.linalg.norm(c)
+        divergence = 1e10 * max(b_norm, c_norm)
+
+        for iteration in range(1, self.barrier_limit + 1):
+            r_p = b - A @ x
+            r_d = c - A.T @ y - z
+            mu = float(x @ z) / n
+            primal, dual = c @ x, b @ y
+            if (np.linalg.norm(r_p) / b_norm < self.tolerance
+                    and np.linalg.norm(r_d) / c_norm < self.tolerance
+                    and abs(primal - dual) / (1.0 + abs(primal)) < self.tolerance):
+                self.log(f"Pontos interiores: {iteration - 1} iterações")
+                self.barrier_z = z
+                return x
+            # infeasible or unbounded models drive the iterates to infinity
+            if max(np.abs(x).max(), np.abs(z).max(), np.abs(y).max(initial=0.0)) > divergence:
+                return None
+
+            solve = self.normal_equations(A, x / z)
+            if solve is None:
+                return None
+
+            # predictor: pure Newton step towards mu = 0
+            dx, dy, dz = self.newton_direction(A, x, z, r_p, r_d, -x * z, solve)
+            alpha_p = self.step_length(x, dx)
+            alpha_d = self.step_length(z, dz)
+            mu_affine = float((x + alpha_p * dx) @ (z + alpha_d * dz)) / n
+            sigma = min(1.0, max(mu_affine, 0.0) / mu) ** 3
+
+            # corrector: centering plus the second order term of the predictor
+            r_xz = sigma * mu - x * z - dx * dz
+            dx, dy, dz = self.newton_direction(A, x, z, r_p, r_d, r_xz, solve)
+            if not (np.isfinite(dx).all() and np.isfinite(dz).all()):
+                return None
+            alpha_p = min(1.0, 0.99 * self.step_length(x, dx, limit=np.inf))
+            alpha_d = min(1.0, 0.99 * self.step_length(z, dz, limit=np.inf))
+            x = x + alpha_p * dx
+            y = y + alpha_d * dy
+            z = z + alpha_d * dz
+            self.barrier_iterations = iteration
+        return None
+
+    def normal_equations(self, A, d):
+        """
+        Cholesky factorization of A diag(d) A^T, regularized when round-off
+        (or dependent rows) makes it singular. Systems are solved against the
+        factor (cholesky_solve), never through an inverse.
+
+        Returns:
+            function r -> (A diag(d) A^T)^-1 r, or None
+        """
+        M = (A * d) @ A.T
+        scale = max(1.0, float(np.abs(np.diag(M)).max(initial=0.0)))
+        shift = 0.0
+        for _ in range(8):
+            try:
+                L = np.linalg.cholesky(M + shift * np.eye(len(M)))
+            except np.linalg.LinAlgError:
+                shift = max(1e-14 * scale, 100.0 * shift)
+                continue
+            return lambda r: cholesky_solve(L, r)
+        return None
+
+    @staticmethod
+    def starting_point(A, b, c, solve):
+        """
+        Mehrotra's starting point: least squares x and (y, z), shifted to be
+        positive and balanced.
+        """
+        x = A.T @ solve(b)
+        y = solve(A @ c)
+        z = c - A.T @ y
+        x = x + max(-1.5 * x.min(), 0.0)
+        z = z + max(-1.5 * z.min(), 0.0)
+        xz = float(x @ z)
+        x = x + 0.5 * xz / max(z.sum(), 1e-12)
+        z = z + 0.5 * xz / max(x.sum(), 1e-12)
+        # all-zero x or z (e.g. b = 0) would stall the iterations
+        return np.maximum(x, 1e-4), y, np.maximum(z, 1e-4)
+
+    @staticmethod
+    def newton_direction(A, x, z, r_p, r_d, r_xz, solve):
+        """
+        Solves  A dx = r_p,  A^T dy + dz = r_d,  Z dx + X dz = r_xz
+        through the normal equations.
+        """
+        dy = solve(r_p - A @ ((r_xz - x * r_d) / z))
+        dz = r_d - A.T @ dy
+        dx = (r_xz - x * dz) / z
+        return dx, dy, dz
+
+    @staticmethod
+    def step_length(v, dv, limit=1.0):
+        """
+        Largest step in [0, limit] that keeps v + step * dv >= 0.
+        """
+        negative = dv < 0
+        if not negative.any():
+            return limit
+        return min(limit, float(np.min(-v[negative] / dv[negative])))
+
+    # --- crossover ---------------------------------------------------------
+
+    def crossover_basis(self, x):
+        """
+        Basis (warm start columns) guessed from the interior solution x, or
+        None when the columns do not reach full rank.
+        """
+        z = self.barrier_z
+        columns = len(x)
+        positive = np.flatnonzero(x > z)
+        rest = np.flatnonzero(x <= z)
+        slack = rest >= self.num_vars
+        # clearly positive columns first, by value; then the slacks; then
+        # the rest by how close to positive they are
+        order = np.concatenate([
+            positive[np.argsort(-x[positive])],
+            rest[np.lexsort((-(x / (x + z))[rest], ~slack))],
+        ])
+        A = self.warm_columns(np.arange(columns))
+        basis = independent_columns(A, order)
+        if len(basis) < A.shape[0]:
+            return None
+        return np.array(basis, dtype=np.intp)
+
+    def extract_solution(self):
+        if self.interior_solution is None:
+            return super().extract_solution()
+        x = self.interior_solution
+        self.set_solution(x.tolist(), float(np.asarray(self.c) @ x))
+
+    def saved_basis(self):
+        if self.interior_solution is not None:
+            return None
+        return super().saved_basis()
+
+
+def cholesky_solve(L, r):
+    """
+    Solves L L^T x = r for a lower triangular L: forward substitution, then
+    back substitution with L^T.
+    """
+    x = np.array(r, dtype=np.float64)
+    m = len(x)
+    for j in range(m):
+        x[j] /= L[j, j]
+        x[j + 1:] -= L[j + 1:, j] * x[j]
+    for j in range(m - 1, -1, -1):
+        x[j] = (x[j] - L[j + 1:, j] @ x[j + 1:]) / L[j, j]
+    return x
+
+
+def independent_columns(A, order, tol=1e-9):
+    """
+    The first columns of A, taken in the given order, that are linearly
+    independent of the ones taken before (Gram-Schmidt with
+    reorthogonalization), up to rank A.
+    """
+    m = A.shape[0]
+    Q = np.zeros((m, m))
+    taken = []
+    for j in np.asarray(order).tolist():
+        v = A[:, j]
+        norm = np.linalg.norm(v)
+        if norm == 0.0:
+            continue
+        r = v - Q[:, :len(taken)] @ (Q[:, :len(taken)].T @ v)
+        r -= Q[:, :len(taken)] @ (Q[:, :len(taken)].T @ r)
+        rest = np.linalg.norm(r)
+        if rest <= tol * norm:
+            continue
+        Q[:, len(taken)] = r / rest
+        taken.append(j)
+        if len(taken) == m:
+            break
+    return taken
+
+
+def auto_engine(objective_coeffs, constraints, **options):
+    """
+    Creates the engine suited to the model: InteriorPoint for large dense
+    models (see AUTO_MIN_ROWS, AUTO_MIN_COLUMNS and AUTO_MIN_DENSITY),
+    Simplex otherwise. Takes the same arguments as Simplex.
+    """
+    m, n = len(constraints), len(objective_coeffs)
+    nonzeros = sum(sum(1 for _, a in iter_row(coeffs) if a) for coeffs, _, _ in constraints)
+    if m >= AUTO_MIN_ROWS and n >= AUTO_MIN_COLUMNS and nonzeros >= AUTO_MIN_DENSITY * m * n:
+        return InteriorPoint(objective_coeffs, constraints, **options)
+    for option in ("crossover", "tolerance", "barrier_limit"):
+        options.pop(option, None)
+    return Simplex(objective_coeffs, constraints, **options)
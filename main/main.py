@@ -1,11 +1,16 @@
 # main.py
-from parser import Parser
+import sys
+
+from branch_and_bound import BranchAndBound
+from readers import read_model
 from simplex import Simplex
 
 def main():
-    filepath = "input/input.txt"
-    parser = Parser(filepath)
-    result = parser.parse()
+    # model file from the command line (.mps, .lp or the text format; "-"
+    # reads the text format from stdin)
+    filepath = sys.argv[1] if len(sys.argv) > 1 else "input/input.txt"
+    report_path = "output/resultado.txt"
+    result = read_model(filepath)
     
     print("="*80)
     print(f"Tipo: {result['objective_type']}")
@@ -14,16 +19,22 @@ def main():
     print(f"Restrições: {result['constraints']}")
     print("="*80 + "\n")
     
-    simplex = Simplex(
-        objective_coeffs=result['objective_coeffs'],
-        constraints=result['constraints'],
-        objective_type=result['objective_type'],
-        var_signs=result['var_signs']
-    )
+    if any(result.get('integer', ())):
+        # integer variables: branch and bound over the LP relaxation
+        simplex = BranchAndBound(result)
+    else:
+        simplex = Simplex(
+            objective_coeffs=result['objective_coeffs'],
+            constraints=result['constraints'],
+            objective_type=result['objective_type'],
+            var_signs=result['var_signs'],
+            bounds=result['bounds'],
+            report_path=report_path
+        )
     
     solution = simplex.solve()
 
-    simplex.write_report("output/resultado.txt")
+    simplex.write_report(report_path)
     
     print()
     print("="*80)
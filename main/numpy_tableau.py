@@ -0,0 +1,177 @@
+import numpy as np
+
+from basis import SLACK, Basis
+from tableau import Tableau
+
+
+class NumpyTableau(Tableau):
+    """
+    Tableau stored as a contiguous float64 ndarray.
+
+    Same layout as Tableau (constraint rows, objective row last, RHS in the
+    last column), but the pivot kernels work on whole arrays instead of
+    Python loops.
+    """
+
+    def build_tableau(self, slack_indices, artificial_indices=None, M=1000000, slack_types=None,
+                      phase_one=False):
+        if phase_one:
+            M = 1.0
+        m = self.num_constraints
+        n = self.num_vars
+        num_slack = len(slack_indices) if slack_indices else 0
+        num_artificial = len(artificial_indices) if artificial_indices else 0
+        num_cols = n + num_slack + num_artificial + 1
+        T = np.zeros((m + 1, num_cols), dtype=np.float64)
+
+        T[self.A.row_ids, self.A.indices] = self.A.data
+        T[:m, -1] = np.asarray(self.b, dtype=np.float64)
+
+        self.num_slack = num_slack
+        self.num_artificial = num_artificial
+        basis = Basis(m, self.column_kinds())
+
+        slack_col = n
+        for idx in (slack_indices or []):
+            coef = 1.0 if slack_types is None else slack_types.get(idx, 1.0)
+            T[idx, slack_col] = coef
+            if coef == 1.0:
+                basis.enter(idx, slack_col)
+            slack_col += 1
+
+        artificial_col = n + num_slack
+        for idx in (artificial_indices or []):
+            T[idx, artificial_col] = 1.0
+            basis.enter(idx, artificial_col)
+            artificial_col += 1
+
+        if not phase_one:
+            T[-1, :n] = -np.asarray(self.c, dtype=np.float64)
+        T[-1, n + num_slack:-1] = M
+        if artificial_indices:
+            T[-1] -= M * T[artificial_indices].sum(axis=0)
+
+        self.tableau = T
+        self.basis = basis
+
+    def set_objective(self, costs):
+        costs = np.asarray(costs, dtype=np.float64)
+        cb = costs[self.basis_columns()]
+        obj = cb @ self.tableau[:-1]
+        obj[:-1] -= costs
+        self.tableau[-1] = obj
+
+    def drop_rows(self, rows):
+        if not rows:
+            return
+        self.tableau = np.delete(self.tableau, rows, axis=0)
+        self.basis.drop_rows(rows)
+        self.num_constraints = len(self.basis)
+
+    def drop_artificial_variables(self):
+        k = self.num_artificial
+        if k:
+            T = self.tableau
+            self.tableau = np.ascontiguousarray(np.delete(T, np.s_[-k - 1:-1], axis=1))
+        self.basis.drop_artificial_columns()
+        self.num_artificial = 0
+        self._var_names = None
+
+    def load_basis(self, columns):
+        columns = np.asarray(columns, dtype=np.intp)
+        m = len(self.basis)
+        T = self.tableau
+        B = T[:m, columns]
+        try:
+            T[:m] = np.linalg.solve(B, T[:m])
+        except np.linalg.LinAlgError:
+            raise ValueError("Singular basis.")
+        T[-1] -= T[-1, columns] @ T[:m]
+        basis = Basis(m, self.column_kinds())
+        for i, col in enumerate(columns.tolist()):
+            basis.enter(i, col)
+        self.basis = basis
+
+    def add_row(self, cols, vals, slack_coef, rhs):
+        slack_col = self.num_vars + self.num_slack
+        T = np.insert(self.tableau, slack_col, 0.0, axis=1)
+        new_row = np.zeros(T.shape[1])
+        new_row[np.asarray(cols, dtype=np.intp)] = slack_coef * np.asarray(vals, dtype=np.float64)
+        new_row[slack_col] = 1.0
+        new_row[-1] = slack_coef * float(rhs)
+
+        self.basis.add_row(slack_col, SLACK)
+        head = self.basis.head[:-1]
+        rows = np.flatnonzero(head >= 0)
+        new_row -= new_row[head[rows]] @ T[rows]
+
+        self.tableau = np.ascontiguousarray(np.insert(T, len(head), new_row, axis=0))
+        self.num_slack += 1
+        self.num_constraints += 1
+        self._var_names = None
+
+    def complement_column(self, j, value):
+        T = self.tableau
+        T[:, -1] -= T[:, j] * value
+        T[:, j] *= -1.0
+
+    def complement_row(self, r, j, value):
+        row = self.tableau[r]
+        row *= -1.0
+        row[j] = 1.0
+        row[-1] += value
+
+    def shift_rhs(self, delta):
+        self.tableau[:-1, -1] += delta
+
+    def basic_values(self):
+        return self.tableau[:-1, -1]
+
+    def find_pivot_row(self, pivot_col, tie_keys=None):
+        m = len(self.basis)
+        column = self.tableau[:m, pivot_col]
+        # round-off can leave degenerate basics at -1e-15; they still block
+        # the step
+        rhs = np.maximum(self.tableau[:m, -1], 0.0)
+
+        positive = column > 1e-10
+        ratios = np.full(m, np.inf)
+        np.divide(rhs, column, out=ratios, where=positive)
+        valid = positive & (ratios >= 0)
+        if not valid.any():
+            return None
+
+        min_ratio = ratios[valid].min()
+        ties = np.flatnonzero(valid & (ratios - min_ratio < 1e-10))
+        if tie_keys is not None:
+            return int(ties[np.argmin(np.asarray(tie_keys)[ties])])
+        return int(ties[0])
+
+    def reduced_costs(self):
+        return self.tableau[-1, :-1]
+
+    def row_values(self, r):
+        return self.tableau[r, :-1]
+
+    def column_values(self, q):
+        return self.tableau[:-1, q].copy()
+
+    def column_dots(self, alpha):
+        return alpha @ self.tableau[:-1, :-1]
+
+    def column_norms_sq(self):
+        body = self.tableau[:-1, :-1]
+        return np.einsum("ij,ij->j", body, body)
+
+    def pivot(self, pivot_row, pivot_col):
+        T = self.tableau
+        T[pivot_row] /= T[pivot_row, pivot_col]
+        multipliers = T[:, pivot_col].copy()
+        multipliers[pivot_row] = 0.0
+        rows = np.flatnonzero(multipliers)
+        # rank-1 update of the rows with a nonzero multiplier; when most rows
+        # are touched the full update is cheaper than fancy indexing
+        if len(rows) * 2 < len(multipliers):
+            T[rows] -= np.outer(multipliers[rows], T[pivot_row])
+        else:
+            T -= np.outer(multipliers, T[pivot_row])
@@ -0,0 +1,129 @@
+import time
+
+
+def no_clock():
+    """
+    Stands in for time.perf_counter when nobody observes the solve.
+    """
+    return 0.0
+
+
+class PivotEvent:
+    """
+    One iteration as seen by the observers.
+
+        iteration     iteration number within the current simplex loop
+        entering      column that entered the basis
+        leaving       column that left it (the entering one for a bound flip)
+        objective     objective value after the pivot (internal, max form)
+        degenerate    True when the pivot did not change the objective
+        pricing_time  seconds choosing the entering column (leaving row for dual)
+        ratio_time    seconds in the ratio test
+        pivot_time    seconds updating the tableau / factorization
+        phase         1 or 2 with the two-phase method, else None
+        kind          "primal", "dual" or "flip"
+    """
+
+    __slots__ = ("iteration", "entering", "leaving", "objective", "degenerate",
+                 "pricing_time", "ratio_time", "pivot_time", "phase", "kind")
+
+    def __init__(self, iteration, entering, leaving, objective, degenerate,
+                 pricing_time, ratio_time, pivot_time, phase, kind):
+        self.iteration = iteration
+        self.entering = entering
+        self.leaving = leaving
+        self.objective = objective
+        self.degenerate = degenerate
+        self.pricing_time = pricing_time
+        self.ratio_time = ratio_time
+        self.pivot_time = pivot_time
+        self.phase = phase
+        self.kind = kind
+
+
+class SolverObserver:
+    """
+    Base class for solve observers; override what is needed.
+
+    on_start runs when the engine starts optimizing (solve, resolve or
+    add_constraint), on_pivot after every pivot or bound flip and on_finish
+    once the iterations end, before the solution is extracted. status is
+    None when a warm start was abandoned; a cold solve, with its own
+    on_start, follows.
+
+    The engines only time the iterations and build events when at least
+    one observer is registered.
+    """
+
+    def on_start(self, engine):
+        pass
+
+    def on_pivot(self, engine, event):
+        pass
+
+    def on_finish(self, engine, status):
+        pass
+
+
+class MetricsCollector(SolverObserver):
+    """
+    Totals over every solve it observed: runs, pivots by kind, degenerate
+    pivots, time per iteration step and wall time.
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.iterations = 0
+        self.kinds = {"primal": 0, "dual": 0, "flip": 0}
+        self.degenerate = 0
+        self.pricing_time = 0.0
+        self.ratio_time = 0.0
+        self.pivot_time = 0.0
+        self.solve_time = 0.0
+        self.statuses = []
+        self._started = None
+
+    def on_start(self, engine):
+        self.runs += 1
+        self._started = time.perf_counter()
+
+    def on_pivot(self, engine, event):
+        self.iterations += 1
+        self.kinds[event.kind] += 1
+        self.degenerate += event.degenerate
+        self.pricing_time += event.pricing_time
+        self.ratio_time += event.ratio_time
+        self.pivot_time += event.pivot_time
+
+    def on_finish(self, engine, status):
+        if self._started is not None:
+            self.solve_time += time.perf_counter() - self._started
+            self._started = None
+        self.statuses.append(status)
+
+    def totals(self):
+        return {
+            "runs": self.runs,
+            "iterations": self.iterations,
+            "primal_pivots": self.kinds["primal"],
+            "dual_pivots": self.kinds["dual"],
+            "bound_flips": self.kinds["flip"],
+            "degenerate_pivots": self.degenerate,
+            "pricing_time": self.pricing_time,
+            "ratio_time": self.ratio_time,
+            "pivot_time": self.pivot_time,
+            "solve_time": self.solve_time,
+            "statuses": list(self.statuses),
+        }
+
+    def report(self):
+        t = self.totals()
+        other = t["solve_time"] - t["pricing_time"] - t["ratio_time"] - t["pivot_time"]
+        return "\n".join([
+            f"Execuções: {t['runs']} ({', '.join(str(s) for s in t['statuses'])})",
+            f"Iterações: {t['iterations']} (primal {t['primal_pivots']}, dual {t['dual_pivots']}, "
+            f"trocas de limite {t['bound_flips']}, degeneradas {t['degenerate_pivots']})",
+            f"Tempo: {t['solve_time'] * 1000:.2f} ms (pricing {t['pricing_time'] * 1000:.2f} ms, "
+            f"razão {t['ratio_time'] * 1000:.2f} ms, pivô {t['pivot_time'] * 1000:.2f} ms, "
+            f"resto {other * 1000:.2f} ms)",
+        ])
@@ -1,50 +1,180 @@
 import re
+import sys
+
+# NUMBER: an integer, decimal or scientific notation literal:
+#     \d+(?:\.\d*)?    - digits with an optional fractional part (2, 2.5, 2.)
+#     |\.\d+           - or only a fractional part (.5)
+#     (?:[eE][+-]?\d+)? - optional exponent (1e3, 2.5E-2)
+NUMBER = r"(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?"
+
+# TERM_RE, one "coefficient x index" term:
+# ([+-]?\s*NUMBER?) - 1st step, we search for the coefficient of the variable:
+#     [+-]?      - an optional '+' or '-' sign
+#     \s*        - followed by any number of spaces
+#     NUMBER?    - followed by the (optional) coefficient itself
+# \s*x\s*(\d+)       - 2nd step, we look for the variable part:
+#     \s*        - any number of spaces
+#     x          - the character 'x' indicating a variable
+#     \s*        - any number of spaces
+#     (\d+)      - followed by one or more digits (the variable index, e.g. x1, x2, etc.)
+TERM_RE = re.compile(r"([+-]?\s*(?:" + NUMBER + r")?)\s*x\s*(\d+)")
+
+# BOUND_RE, a bound on one variable written without a coefficient
+# (x1 >= 0, x3 <= 40, x4 = 2, -5 <= x2 <= 5):
+#     (?:([+-]?NUMBER)\s*<=\s*)? - optional lower bound of the "l <= x <= u" form
+#     x(\d+)                     - 'x' followed by the variable index
+#     \s*(>=|<=|=)\s*            - the comparison operator
+#     ([+-]?NUMBER)              - the bound value
+#     $                          - end of line anchor, so "x1 - x2 >= 0" or
+#                                  "x1 >= 0 + 1" stay constraints
+BOUND_RE = re.compile(
+    r"(?:([+-]?" + NUMBER + r")\s*<=\s*)?x(\d+)\s*(>=|<=|=)\s*([+-]?" + NUMBER + r")$"
+)
+
+# RHS_RE, the right-hand side at the end of a constraint:
+#     [+-]?NUMBER - an optional sign followed by the number
+#     \s*$        - only trailing spaces up to the end of the line
+RHS_RE = re.compile(r"([+-]?" + NUMBER + r")\s*$")
+
+VAR_RE = re.compile(r"x(\d+)")
+
+# INTEGER_RE, a line declaring integer variables ("inteiras x1, x3" or
+# "inteiro x2", Portuguese for "integer"):
+#     inteir[ao]s?  - inteira, inteiras, inteiro or inteiros
+#     \b            - as a whole word, followed by the variables
+INTEGER_RE = re.compile(r"inteir[ao]s?\b", re.I)
+
+INF = float("inf")
+
+
+def parse_number(text):
+    """
+    Integer literals stay int (so integer models print as before); decimal
+    and scientific ones become float.
+    """
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def parse_coefficient(raw_coeff):
+    raw_coeff = raw_coeff.replace(" ", "")
+    if raw_coeff == '' or raw_coeff == '+':
+        return 1
+    if raw_coeff == '-':
+        return -1
+    return parse_number(raw_coeff)
+
+
+def variable_sign(lower, upper):
+    """
+    The var_signs entry (">=0", "<=0" or "free") of a variable with bounds
+    [lower, upper].
+    """
+    if lower >= 0:
+        return ">=0"
+    if upper <= 0:
+        return "<=0"
+    return "free"
+
 
 class Parser:
     """
-    Max 2x1 + 3x2 
+    Max 2x1 + 3x2
     2x1 + x2 <= 10
     x1 + 3x2 <= 5
     x1 >= 0
-    x2 >= 0
+    -4 <= x2 <= 8
+
+    Coefficients and right-hand sides can be integers, decimals (2.5, .5)
+    or in scientific notation (1e-3). The input is read line by line in a
+    single pass, so large models are never held in memory as text.
+
+    A line with a single variable and no coefficient is a bound (see
+    BOUND_RE), "xj livre" makes xj free. Variables are >= 0 by default;
+    "xj <= 0" with no lower bound given makes xj nonpositive (its old
+    meaning), any other "xj <= v" is an upper bound on the default lower
+    bound 0 (so "x1 <= -2" makes the model infeasible, as the row did).
+
+    "inteiras x1, x3" declares integer variables (see INTEGER_RE; any
+    number of such lines). Simplex solves the LP relaxation;
+    branch_and_bound.BranchAndBound (main.py when there are any) honours
+    them.
     """
 
-    def __init__(self, filepath):
-        self.filepath = filepath
-        self.objective_type = None 
+    def __init__(self, source, sparse=False):
+        """
+        source: path of the model file, "-" for stdin, or any file-like
+            object with text lines (an open file, io.StringIO, ...)
+        sparse: if True, constraint rows are dicts {variable_index: coeff}
+            (0-based, zeros omitted) instead of dense lists.
+        """
+        self.source = source
+        self.filepath = source if isinstance(source, str) else getattr(source, "name", None)
+        self.sparse = sparse
+        self.objective_type = None
         self.objective_coeffs = []
+        self.objective_terms = {}
         self.constraints = []
         self.num_vars = 0
         self.non_negative = []
         self.var_signs = []
+        self.bounds = []
+        self.lower_given = set()
+        self.integer_vars = set()
 
-    def parse(self):
-        lines = [line.strip() for line in open(self.filepath)]
-
-        idx = None
-        for i, l in enumerate(lines):
-            ll = l.lower()
-            if ll.startswith("max") or ll.startswith("min"):
-                idx = i
-                break
-        if idx is None:
-            raise ValueError("Objective function must be Max or Min.")
-
-        self.parse_objective(lines[idx])
+    def lines(self):
+        """
+        Yields the stripped lines of the source. Files opened here are
+        closed when the generator finishes.
+        """
+        if self.source == "-":
+            stream = sys.stdin
+        elif isinstance(self.source, str):
+            with open(self.source, encoding="utf-8") as f:
+                for line in f:
+                    yield line.strip()
+            return
+        else:
+            stream = self.source
+        for line in stream:
+            if isinstance(line, bytes):
+                line = line.decode("utf-8")
+            yield line.strip()
 
-        for line in lines[idx+1:]:
+    def parse(self):
+        found_objective = False
+        for line in self.lines():
+            if not found_objective:
+                ll = line.lower()
+                # everything before the objective function is ignored
+                if ll.startswith("max") or ll.startswith("min"):
+                    self.parse_objective(line)
+                    found_objective = True
+                continue
             if not line:
                 continue
-            if self.is_non_negative(line):
-                self.parse_non_negative(line)
+            if INTEGER_RE.match(line):
+                self.parse_integers(line)
+            elif self.is_bound(line):
+                self.parse_bound(line)
             elif "<=" in line or ">=" in line or "=" in line:
                 self.parse_constraint(line)
+        if not found_objective:
+            raise ValueError("Objective function must be Max or Min.")
 
-        #if some variables were not mentioned in non-negativity constraints, assume they are non-negative
-        while len(self.non_negative) < self.num_vars:
-            self.non_negative.append(True)
-        while len(self.var_signs) < self.num_vars:
-            self.var_signs.append(">=0")
+        #if some variables were not mentioned in bounds, assume they are non-negative
+        while len(self.bounds) < self.num_vars:
+            self.bounds.append((0, INF))
+        self.var_signs = [variable_sign(lower, upper) for lower, upper in self.bounds]
+        self.non_negative = [sign == ">=0" for sign in self.var_signs]
+        # variables missing from the objective have coefficient 0
+        self.objective_coeffs = [self.objective_terms.get(j, 0) for j in range(1, self.num_vars + 1)]
+        if not self.sparse:
+            # rows parsed before a higher variable index appeared are padded
+            for row, _, _ in self.constraints:
+                row.extend([0] * (self.num_vars - len(row)))
 
         return {
             "objective_type": self.objective_type,
@@ -52,49 +182,60 @@ class Parser:
             "constraints": self.constraints,
             "num_vars": self.num_vars,
             "non_negative": self.non_negative,
-            "var_signs": self.var_signs
+            "var_signs": self.var_signs,
+            "bounds": self.bounds,
+            "integer": [j in self.integer_vars for j in range(1, self.num_vars + 1)],
         }
-        
-    def is_non_negative(self, line):
+
+    def is_bound(self, line):
         """
-        x\d+\s*(>=|<=)\s*0$:
-            x\d+      - 'x' followed by one or more digits (variable index, e.g. x1, x2)
-            \s*       - any number of spaces
-            (>=|<=)   - either the ">=" or "<=" comparison operator
-            \s*       - any number of spaces
-            0         - the numeric bound zero
-            $         - end of line anchor to ensure the entire tail matches (so it wont match extra trailing chars)
-
-        This pattern matches lines like: "x1 >= 0" or "x2 <= 0".
-        In addition, we also treat lines containing the word "livre" (Portuguese for "free")
-        as indicating a free variable (no sign restriction).
+        Lines like "x1 >= 0", "x3 <= 40" or "-5 <= x2 <= 5" (see BOUND_RE).
+        In addition, we also treat lines containing the word "livre"
+        (Portuguese for "free") as indicating a free variable (no bounds).
         """
-        return re.match(r"x\d+\s*(>=|<=)\s*0$", line) is not None or "livre" in line.lower()
-    
-    def parse_non_negative(self, line):
-        var_match = re.findall(r"x(\d+)", line)
+        return BOUND_RE.match(line) is not None or "livre" in line.lower()
+
+    def parse_bound(self, line):
+        var_match = VAR_RE.search(line)
         if not var_match:
             return
-            
-        var = int(var_match[0])
-        
+
+        var = int(var_match.group(1))
+
         self.num_vars = max(self.num_vars, var)
-        
-        while len(self.non_negative) < var:
-            self.non_negative.append(True)
-        while len(self.var_signs) < var:
-            self.var_signs.append(">=0")
-        
+
+        while len(self.bounds) < var:
+            self.bounds.append((0, INF))
+
+        lower, upper = self.bounds[var - 1]
+        match = BOUND_RE.match(line)
         if "livre" in line.lower():
-            self.non_negative[var - 1] = False
-            self.var_signs[var - 1] = "free"
-        elif "<=" in line:
-            self.non_negative[var - 1] = False
-            self.var_signs[var - 1] = "<=0"
+            lower, upper = -INF, INF
+        elif match.group(1) is not None:
+            if match.group(3) != "<=":
+                raise ValueError(f"Bound must be written as l <= x <= u: {line}")
+            lower, upper = parse_number(match.group(1)), parse_number(match.group(4))
+            self.lower_given.add(var)
         else:
-            self.non_negative[var - 1] = True
-            self.var_signs[var - 1] = ">=0"
-    
+            value = parse_number(match.group(4))
+            if match.group(3) == "=":
+                lower = upper = value
+                self.lower_given.add(var)
+            elif match.group(3) == ">=":
+                lower = value
+                self.lower_given.add(var)
+            else:
+                upper = value
+                if value == 0 and var not in self.lower_given:
+                    lower = -INF
+        self.bounds[var - 1] = (lower, upper)
+
+    def parse_integers(self, line):
+        for var in VAR_RE.findall(line):
+            var = int(var)
+            self.num_vars = max(self.num_vars, var)
+            self.integer_vars.add(var)
+
     def parse_objective(self, line):
         line_lower = line.lower()
         if line_lower.startswith("max"):
@@ -104,63 +245,41 @@ class Parser:
         else:
             raise ValueError("Objective function must be Max or Min.")
 
-        """
-        Explaining the regex:
-        ([+-]?\s*\d*) - 1st step, we search for the coefficient of the variable:
-            [+-]?      - an optional '+' or '-' sign
-            \s*        - followed by any number of spaces
-            \d*        - followed by any number of digits (the coefficient itself)
-        \s*x\s*(\d+)       - 2nd step, we look for the variable part:
-            \s*        - any number of spaces
-            x          - the character 'x' indicating a variable
-            \s*        - any number of spaces
-            (\d+)      - followed by one or more digits (the variable index, e.g. x1, x2, etc.)
-        """
-        coeffs = re.findall(r'([+-]?\s*\d*)\s*x\s*(\d+)', line)
-        
-        for raw_coeff, var in coeffs:
-            raw_coeff = raw_coeff.replace(" ", "")
-            if raw_coeff == '+' or raw_coeff == '' or raw_coeff == '+ ':
-                raw_coeff = 1
-            elif raw_coeff == '-':
-                raw_coeff = -1
-            else:
-                raw_coeff = int(raw_coeff)
+        # {variable index: coeff}; expanded to a list once num_vars is known
+        self.objective_terms = {}
+        for raw_coeff, var in TERM_RE.findall(line):
             var = int(var)
             self.num_vars = max(self.num_vars, var)
-            self.objective_coeffs.append((var, raw_coeff))
-
-        self.objective_coeffs = [c for _, c in sorted(self.objective_coeffs)]
+            self.objective_terms[var] = parse_coefficient(raw_coeff)
 
     def parse_constraint(self, line):
-        coeffs = re.findall(r'([+-]?\s*\d*)\s*x\s*(\d+)', line)
-        parsed = [0] * (self.num_vars)
-
-        for raw_coeff, var in coeffs:
-            raw_coeff = raw_coeff.replace(" ", "")
-            if raw_coeff == '' or raw_coeff == '+':
-                raw_coeff = 1
-            elif raw_coeff == '-':
-                raw_coeff = -1
-            else:
-                raw_coeff = int(raw_coeff)
-
-            var = int(var)
-            parsed[var - 1] = raw_coeff
-
         if "<=" in line:
             comp = "<="
         elif ">=" in line:
             comp = ">="
         else:
             comp = "="
-            
-        """
-        (-?\d+)$
-            -? - matches an optional negative sign
-            \d+ - matches one or more digits
-            $ - guarantees that the match is at the end of the line
-        """
-        b = int(re.findall(r'(-?\d+)$', line)[0])
+        lhs, _, rhs = line.partition(comp)
+
+        parsed = {} if self.sparse else [0] * (self.num_vars)
+        for raw_coeff, var in TERM_RE.findall(lhs):
+            coeff = parse_coefficient(raw_coeff)
+            var = int(var)
+            if var > self.num_vars:
+                self.num_vars = var
+            if self.sparse:
+                if coeff == 0:
+                    parsed.pop(var - 1, None)
+                else:
+                    parsed[var - 1] = coeff
+            else:
+                if var > len(parsed):
+                    parsed.extend([0] * (var - len(parsed)))
+                parsed[var - 1] = coeff
+
+        match = RHS_RE.search(rhs)
+        if match is None:
+            raise ValueError(f"Constraint without a numeric right-hand side: {line}")
+        b = parse_number(match.group(1))
 
-        self.constraints.append((parsed, comp, b))
\ No newline at end of file
+        self.constraints.append((parsed, comp, b))
@@ -0,0 +1,238 @@
+import numpy as np
+
+from sparse import CSRMatrix
+
+FIX = "fix"
+SHIFT = "shift"
+
+
+class Presolve:
+    """
+    Presolve of the internal model (max c^T x, rows op rhs, x >= 0), as
+    built by Simplex.expand_variables.
+
+    Reductions, repeated until a pass changes nothing:
+        empty rows         dropped, or the problem is infeasible
+        singleton rows     a x_j op b is a bound: x_j = v fixes the column,
+                           x_j >= l > 0 shifts it (x_j = l + x_j'), x_j >= l
+                           with l <= 0 is redundant, x_j <= 0 fixes it at 0
+        fixed columns      removed, their contribution moves to the RHS and
+                           to the objective offset
+        parallel rows      rows that are multiples of each other are merged
+                           into one interval on the common expression
+        dominated columns  c_j <= 0 and every entry only tightens its row
+                           (>= 0 in <= rows, <= 0 in >= rows, none in = rows):
+                           x_j = 0 is optimal
+
+    Every column change is pushed on a postsolve stack; restore() undoes
+    them in reverse order to map a solution of the reduced model back.
+    """
+
+    def __init__(self, c, A, ops, rhs, tol=1e-9):
+        self.tol = tol
+        self.num_rows, self.num_cols = A.shape
+        self.cost = [float(x) for x in c]
+        self.row_coeffs = [{} for _ in range(self.num_rows)]
+        self.col_rows = [set() for _ in range(self.num_cols)]
+        for i, j, a in zip(A.row_ids.tolist(), A.indices.tolist(), A.data.tolist()):
+            self.row_coeffs[i][j] = a
+            self.col_rows[j].add(i)
+        self.row_op = list(ops)
+        self.row_rhs = [float(b) for b in rhs]
+        self.active_rows = set(range(self.num_rows))
+        self.active_cols = set(range(self.num_cols))
+
+        self.stack = []
+        self.offset = 0.0
+        self.status = None
+
+    def run(self):
+        """
+        Applies the reductions until nothing changes. Sets status to
+        "infeasible" when a reduction proves it.
+        """
+        changed = True
+        while changed and self.status is None:
+            changed = False
+            for reduction in (self.empty_rows, self.singleton_rows,
+                              self.parallel_rows, self.dominated_columns):
+                changed |= reduction()
+                if self.status is not None:
+                    break
+        return self
+
+    # --- model edits -----------------------------------------------------
+
+    def remove_row(self, i):
+        for j in self.row_coeffs[i]:
+            self.col_rows[j].discard(i)
+        self.row_coeffs[i] = {}
+        self.active_rows.discard(i)
+
+    def fix_column(self, j, value):
+        """
+        x_j = value: moves the column into the RHS and the objective offset.
+        """
+        for i in self.col_rows[j]:
+            self.row_rhs[i] -= self.row_coeffs[i].pop(j) * value
+        self.col_rows[j] = set()
+        self.offset += self.cost[j] * value
+        self.active_cols.discard(j)
+        self.stack.append((FIX, j, value))
+
+    def shift_column(self, j, lower):
+        """
+        x_j = lower + x_j' with x_j' >= 0.
+        """
+        for i in self.col_rows[j]:
+            self.row_rhs[i] -= self.row_coeffs[i][j] * lower
+        self.offset += self.cost[j] * lower
+        self.stack.append((SHIFT, j, lower))
+
+    def infeasible(self):
+        self.status = "infeasible"
+        return True
+
+    # --- reductions ------------------------------------------------------
+
+    def empty_rows(self):
+        changed = False
+        tol = self.tol
+        for i in [i for i in self.active_rows if not self.row_coeffs[i]]:
+            op, b = self.row_op[i], self.row_rhs[i]
+            if (op == "<=" and b < -tol) or (op == ">=" and b > tol) or (op == "=" and abs(b) > tol):
+                return self.infeasible()
+            self.remove_row(i)
+            changed = True
+        return changed
+
+    def singleton_rows(self):
+        changed = False
+        tol = self.tol
+        for i in sorted(self.active_rows):
+            if i not in self.active_rows or len(self.row_coeffs[i]) != 1:
+                continue
+            (j, a), = self.row_coeffs[i].items()
+            op, bound = self.row_op[i], self.row_rhs[i] / a
+            if a < 0:
+                op = {"<=": ">=", ">=": "<=", "=": "="}[op]
+
+            if op == "=":
+                if bound < -tol:
+                    return self.infeasible()
+                self.remove_row(i)
+                self.fix_column(j, max(bound, 0.0))
+            elif op == "<=":
+                if bound < -tol:
+                    return self.infeasible()
+                if bound > tol:
+                    continue  # an upper bound stays a row
+                self.remove_row(i)
+                self.fix_column(j, 0.0)
+            else:
+                self.remove_row(i)
+                if bound > tol:
+                    self.shift_column(j, bound)
+            changed = True
+        return changed
+
+    def parallel_rows(self):
+        """
+        Groups the rows by their coefficients scaled so that the entry of the
+        lowest column is 1; each group becomes at most an "=" row or a "<="
+        and a ">=" row on the common expression.
+        """
+        groups = {}
+        for i in sorted(self.active_rows):
+            coeffs = self.row_coeffs[i]
+            if len(coeffs) < 2:
+                continue
+            cols = sorted(coeffs)
+            scale = 1.0 / coeffs[cols[0]]
+            key = tuple((j, round(coeffs[j] * scale, 9)) for j in cols)
+            groups.setdefault(key, []).append((i, scale))
+
+        changed = False
+        tol = self.tol
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+            lower, upper = -np.inf, np.inf
+            for i, scale in group:
+                op, b = self.row_op[i], self.row_rhs[i] * scale
+                if scale < 0:
+                    op = {"<=": ">=", ">=": "<=", "=": "="}[op]
+                if op in ("<=", "="):
+                    upper = min(upper, b)
+                if op in (">=", "="):
+                    lower = max(lower, b)
+            if lower > upper + tol * (1.0 + abs(upper)):
+                return self.infeasible()
+
+            if np.isfinite(upper) and upper - lower <= tol * (1.0 + abs(upper)):
+                wanted = [("=", upper)]
+            else:
+                wanted = [(op, b) for op, b in (("<=", upper), (">=", lower)) if np.isfinite(b)]
+            if len(wanted) == len(group):
+                continue
+
+            for (i, scale), (op, b) in zip(group, wanted):
+                coeffs = self.row_coeffs[i]
+                for j in coeffs:
+                    coeffs[j] *= scale
+                self.row_op[i] = op
+                self.row_rhs[i] = b
+            for i, _ in group[len(wanted):]:
+                self.remove_row(i)
+            changed = True
+        return changed
+
+    def dominated_columns(self):
+        changed = False
+        for j in sorted(self.active_cols):
+            if self.cost[j] > 0:
+                continue
+            dominated = True
+            for i in self.col_rows[j]:
+                op, a = self.row_op[i], self.row_coeffs[i][j]
+                if op == "=" or (op == "<=" and a < 0) or (op == ">=" and a > 0):
+                    dominated = False
+                    break
+            if dominated:
+                self.fix_column(j, 0.0)
+                changed = True
+        return changed
+
+    # --- reduced model / postsolve ---------------------------------------
+
+    def reduced_model(self):
+        """
+        Returns:
+            (c, A, ops, rhs) of the reduced model; self.cols and self.rows
+            hold the original index of each remaining column and row
+        """
+        self.cols = sorted(self.active_cols)
+        self.rows = sorted(self.active_rows)
+        new_index = {j: k for k, j in enumerate(self.cols)}
+        A = CSRMatrix.from_rows(
+            [{new_index[j]: a for j, a in self.row_coeffs[i].items()} for i in self.rows],
+            len(self.cols),
+        )
+        c = [self.cost[j] for j in self.cols]
+        ops = [self.row_op[i] for i in self.rows]
+        rhs = [self.row_rhs[i] for i in self.rows]
+        return c, A, ops, rhs
+
+    def restore(self, x, objective):
+        """
+        Maps a solution (and objective value) of the reduced model back to
+        the columns of the original one.
+        """
+        full = np.zeros(self.num_cols)
+        full[self.cols] = x
+        for kind, j, value in reversed(self.stack):
+            if kind == FIX:
+                full[j] = value
+            else:
+                full[j] += value
+        return full.tolist(), objective + self.offset
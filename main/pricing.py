@@ -0,0 +1,213 @@
+import numpy as np
+
+
+class PricingRule:
+    """
+    Chooses the entering column of a primal simplex iteration.
+
+    Rules talk to the engine (Simplex or RevisedSimplex) only through:
+        engine.reduced_costs(cols=None)  reduced costs, negative = improving
+        engine.pivot_row_values(r)       row r of B^-1 A
+        engine.column_dots(alpha)        alpha^T B^-1 A for every column
+        engine.column_norms_sq()         ||B^-1 a_j||^2, or None if too costly
+        engine.basic_column(r)           column index basic in row r
+    """
+
+    tol = 1e-10
+    # if True the ratio test breaks ties by the lowest basic column index
+    lowest_index_ties = False
+
+    def reset(self, engine):
+        pass
+
+    def select(self, engine):
+        raise NotImplementedError
+
+    def update(self, engine, pivot_row, pivot_col, alpha):
+        """
+        Called once per pivot, before the basis changes. alpha is the
+        entering column B^-1 a_q.
+        """
+        pass
+
+
+class DantzigPricing(PricingRule):
+    """
+    Most negative reduced cost.
+    """
+
+    def select(self, engine):
+        d = engine.reduced_costs()
+        if len(d) == 0:
+            return None
+        col = int(np.argmin(d))
+        if d[col] >= -self.tol:
+            return None
+        return col
+
+
+class BlandPricing(PricingRule):
+    """
+    Bland's rule: lowest-index improving column, and lowest-index basic
+    variable among ratio test ties. Never cycles, but usually needs more
+    iterations than the other rules.
+    """
+
+    lowest_index_ties = True
+
+    def select(self, engine):
+        candidates = np.flatnonzero(engine.reduced_costs() < -self.tol)
+        if len(candidates) == 0:
+            return None
+        return int(candidates[0])
+
+
+class PartialPricing(PricingRule):
+    """
+    Splits the columns into segments and prices one segment at a time,
+    starting after the segment that supplied the last entering column.
+    Only when a whole cycle of segments has no improving column is the
+    basis declared optimal.
+    """
+
+    def __init__(self, num_segments=4):
+        self.num_segments = num_segments
+        self.start = 0
+
+    def reset(self, engine):
+        self.start = 0
+
+    def select(self, engine):
+        num_cols = engine.num_columns()
+        if num_cols == 0:
+            return None
+        size = -(-num_cols // self.num_segments)
+        num_segments = -(-num_cols // size)
+        for k in range(num_segments):
+            seg = (self.start + k) % num_segments
+            cols = np.arange(seg * size, min((seg + 1) * size, num_cols))
+            d = engine.reduced_costs(cols)
+            best = int(np.argmin(d))
+            if d[best] < -self.tol:
+                self.start = (seg + 1) % num_segments
+                return int(cols[best])
+        return None
+
+
+class MultiplePricing(PricingRule):
+    """
+    Multiple pricing: a full pricing pass keeps the num_candidates most
+    attractive columns, and the following (minor) iterations only re-price
+    those candidates until none of them is attractive any more.
+    """
+
+    def __init__(self, num_candidates=8):
+        self.num_candidates = num_candidates
+        self.candidates = None
+
+    def reset(self, engine):
+        self.candidates = None
+
+    def select(self, engine):
+        if self.candidates is not None and len(self.candidates):
+            d = engine.reduced_costs(self.candidates)
+            best = int(np.argmin(d))
+            if d[best] < -self.tol:
+                return int(self.candidates[best])
+
+        d = engine.reduced_costs()
+        improving = np.flatnonzero(d < -self.tol)
+        if len(improving) == 0:
+            self.candidates = None
+            return None
+        if len(improving) > self.num_candidates:
+            keep = np.argpartition(d[improving], self.num_candidates)[:self.num_candidates]
+            improving = improving[keep]
+        self.candidates = improving
+        return int(improving[np.argmin(d[improving])])
+
+
+class DevexPricing(PricingRule):
+    """
+    Devex: maximizes d_j^2 / w_j, where the reference weights w_j
+    approximate the steepest edge norms and are updated from the pivot row.
+    """
+
+    def reset(self, engine):
+        self.weights = np.ones(engine.num_columns())
+
+    def select(self, engine):
+        d = engine.reduced_costs()
+        improving = np.flatnonzero(d < -self.tol)
+        if len(improving) == 0:
+            return None
+        scores = d[improving] ** 2 / self.weights[improving]
+        return int(improving[np.argmax(scores)])
+
+    def update(self, engine, pivot_row, pivot_col, alpha):
+        row = engine.pivot_row_values(pivot_row)
+        alpha_rq = row[pivot_col]
+        leaving = engine.basic_column(pivot_row)
+        w_q = self.weights[pivot_col]
+        ratio_sq = (row / alpha_rq) ** 2
+        np.maximum(self.weights, ratio_sq * w_q, out=self.weights)
+        self.weights[leaving] = max(w_q / alpha_rq ** 2, 1.0)
+        self.weights[pivot_col] = 1.0
+
+
+class SteepestEdgePricing(PricingRule):
+    """
+    Steepest edge: maximizes d_j^2 / gamma_j with gamma_j = 1 + ||B^-1 a_j||^2,
+    kept exact by the Goldfarb-Reid recurrences. When the engine cannot give
+    the initial norms cheaply, the weights start at 1 (Devex reference
+    framework) and are updated with the same recurrences.
+    """
+
+    def reset(self, engine):
+        norms = engine.column_norms_sq()
+        if norms is None:
+            self.weights = np.ones(engine.num_columns())
+        else:
+            self.weights = 1.0 + norms
+
+    def select(self, engine):
+        d = engine.reduced_costs()
+        improving = np.flatnonzero(d < -self.tol)
+        if len(improving) == 0:
+            return None
+        scores = d[improving] ** 2 / self.weights[improving]
+        return int(improving[np.argmax(scores)])
+
+    def update(self, engine, pivot_row, pivot_col, alpha):
+        row = engine.pivot_row_values(pivot_row)
+        alpha_rq = row[pivot_col]
+        leaving = engine.basic_column(pivot_row)
+        gamma_q = self.weights[pivot_col]
+        ratio = row / alpha_rq
+        dots = engine.column_dots(alpha)
+        w = self.weights - 2.0 * ratio * dots + ratio ** 2 * gamma_q
+        np.maximum(w, 1.0 + ratio ** 2, out=w)
+        w[leaving] = max(gamma_q / alpha_rq ** 2, 1.0)
+        w[pivot_col] = 1.0
+        self.weights = w
+
+
+PRICING_RULES = {
+    "dantzig": DantzigPricing,
+    "bland": BlandPricing,
+    "partial": PartialPricing,
+    "multiple": MultiplePricing,
+    "devex": DevexPricing,
+    "steepest_edge": SteepestEdgePricing,
+}
+
+
+def make_pricing(pricing):
+    """
+    Accepts a rule name from PRICING_RULES or a PricingRule instance.
+    """
+    if isinstance(pricing, PricingRule):
+        return pricing
+    if pricing not in PRICING_RULES:
+        raise ValueError(f"Unknown pricing rule: {pricing}")
+    return PRICING_RULES[pricing]()
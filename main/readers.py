@@ -0,0 +1,495 @@
+import mmap
+import os
+import re
+
+import numpy as np
+
+from parser import Parser, variable_sign
+
+INF = float("inf")
+
+
+def map_file(path):
+    """
+    Contents of path through a read-only memory map (b"" for an empty file,
+    which cannot be mapped).
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def build_model(objective_type, names, objective, rows, lower, upper, sparse=False,
+                integer=()):
+    """
+    Turns a model read from a standard format into the dict returned by
+    Parser.parse().
+
+    Args:
+        names: column names, in column order
+        objective: {column: coeff}
+        rows: list of ({column: coeff}, op, rhs)
+        lower, upper: bounds per column (-inf / inf when absent)
+        sparse: rows as dicts {column: coeff} instead of dense lists
+        integer: columns declared integer
+
+    The bounds are returned as they are ("bounds"), together with the sign
+    of each variable ("<=0", ">=0" or "free") for callers that only use
+    var_signs.
+    """
+    n = len(names)
+    var_signs = [variable_sign(lower[j], upper[j]) for j in range(n)]
+    integer = set(integer)
+
+    constraints = []
+    for coeffs, op, rhs in rows:
+        coeffs = {j: a for j, a in coeffs.items() if a != 0}
+        if not sparse:
+            dense = [0.0] * n
+            for j, a in coeffs.items():
+                dense[j] = a
+            coeffs = dense
+        constraints.append((coeffs, op, float(rhs)))
+
+    return {
+        "objective_type": objective_type,
+        "objective_coeffs": [objective.get(j, 0.0) for j in range(n)],
+        "constraints": constraints,
+        "num_vars": n,
+        "non_negative": [s == ">=0" for s in var_signs],
+        "var_signs": var_signs,
+        "bounds": list(zip(lower, upper)),
+        "integer": [j in integer for j in range(n)],
+        "var_names": list(names),
+    }
+
+
+# --- MPS -----------------------------------------------------------------
+
+MPS_SECTION_RE = re.compile(
+    rb"^(NAME|OBJSENSE|ROWS|COLUMNS|RHS|RANGES|BOUNDS|ENDATA)\b([^\n]*)$", re.M
+)
+
+MPS_ROW_OPS = {b"L": "<=", b"G": ">=", b"E": "=", b"N": None}
+
+# fixed MPS fields: columns 2-3, 5-12, 15-22, 25-36, 40-47 and 50-61
+MPS_FIXED_FIELDS = ((1, 3), (4, 12), (14, 22), (24, 36), (39, 47), (49, 61))
+
+
+def mps_lines(body, fixed):
+    """
+    Field lists of the data lines of a section, comments and blank lines
+    skipped. Free MPS splits on whitespace; fixed MPS cuts the standard
+    field columns (names may then contain spaces).
+    """
+    fields = []
+    for line in body.split(b"\n"):
+        line = line.rstrip(b"\r")
+        stripped = line.strip()
+        if not stripped or stripped.startswith(b"*"):
+            continue
+        if fixed:
+            fields.append([line[a:b].strip() for a, b in MPS_FIXED_FIELDS])
+        else:
+            fields.append(stripped.split())
+    return fields
+
+
+def mps_pairs(fields, fixed):
+    """
+    (name, value) pairs of a COLUMNS / RHS / RANGES line without its first
+    name (column or set name). In free MPS the RHS / RANGES set name may be
+    omitted, which leaves an even number of fields.
+    """
+    if fixed:
+        rest = fields[2:]
+    else:
+        rest = fields[1:] if len(fields) % 2 == 1 else fields
+    return [(rest[k], rest[k + 1]) for k in range(0, len(rest) - 1, 2) if rest[k]]
+
+
+def read_mps(path, sparse=False, fixed=False):
+    """
+    Reads a free (default) or fixed MPS file. The objective is the first N
+    row; OBJSENSE MAX (or MAXIMIZE) makes it a maximization. Columns
+    between the INTORG / INTEND markers, and BV columns (bounds [0, 1]),
+    are flagged in "integer"; Simplex solves the LP relaxation.
+    """
+    data = map_file(path)
+    try:
+        headers = list(MPS_SECTION_RE.finditer(data))
+        sections = {}
+        for k, m in enumerate(headers):
+            end = headers[k + 1].start() if k + 1 < len(headers) else len(data)
+            sections[m.group(1)] = (m.group(2).strip(), data[m.end():end])
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+    if b"ROWS" not in sections or b"COLUMNS" not in sections:
+        raise ValueError(f"{path}: not an MPS file (ROWS / COLUMNS missing).")
+
+    objective_type = "Min"
+    if b"OBJSENSE" in sections:
+        inline, body = sections[b"OBJSENSE"]
+        # the sense is on the header line or on the next one
+        words = (inline + b" " + body).split()
+        if words and words[0].upper().startswith(b"MAX"):
+            objective_type = "Max"
+
+    # rows: index of every constraint row, -1 for the objective
+    row_index = {}
+    row_ops = []
+    objective_row = None
+    for fields in mps_lines(sections[b"ROWS"][1], fixed):
+        kind, name = fields[0].upper(), fields[1]
+        if kind not in MPS_ROW_OPS:
+            raise ValueError(f"{path}: unknown row type {kind.decode()}")
+        op = MPS_ROW_OPS[kind]
+        if op is None:
+            if objective_row is None:
+                objective_row = name
+                row_index[name] = -1
+            continue
+        row_index[name] = len(row_ops)
+        row_ops.append(op)
+
+    # columns: collected as coordinate lists, values converted in one go
+    col_index = {}
+    names = []
+    entry_cols, entry_rows, entry_vals = [], [], []
+    integer = set()
+    in_integers = False
+    for fields in mps_lines(sections[b"COLUMNS"][1], fixed):
+        if b"'MARKER'" in fields:
+            in_integers = b"'INTORG'" in fields
+            continue
+        col = fields[1] if fixed else fields[0]
+        j = col_index.get(col)
+        if j is None:
+            j = col_index[col] = len(names)
+            names.append(col.decode())
+        if in_integers:
+            integer.add(j)
+        for row, value in mps_pairs(fields, fixed):
+            if row not in row_index:
+                continue  # extra N rows
+            entry_cols.append(j)
+            entry_rows.append(row_index[row])
+            entry_vals.append(value)
+    values = np.array(entry_vals, dtype=np.bytes_).astype(np.float64) if entry_vals else []
+
+    objective = {}
+    rows = [{} for _ in row_ops]
+    for j, i, a in zip(entry_cols, entry_rows, np.asarray(values).tolist()):
+        if i < 0:
+            objective[j] = objective.get(j, 0.0) + a
+        else:
+            rows[i][j] = rows[i].get(j, 0.0) + a
+
+    rhs = [0.0] * len(row_ops)
+    for fields in mps_lines(sections.get(b"RHS", (b"", b""))[1], fixed):
+        for row, value in mps_pairs(fields, fixed):
+            i = row_index.get(row, -1)
+            if i >= 0:  # a RHS on the objective is a constant, ignored
+                rhs[i] = float(value)
+
+    model_rows = [(rows[i], row_ops[i], rhs[i]) for i in range(len(row_ops))]
+
+    # a range r turns row i into an interval; the other side is an extra row
+    for fields in mps_lines(sections.get(b"RANGES", (b"", b""))[1], fixed):
+        for row, value in mps_pairs(fields, fixed):
+            i = row_index.get(row, -1)
+            if i < 0:
+                continue
+            r = float(value)
+            op = row_ops[i]
+            if op == "<=":
+                model_rows.append((rows[i], ">=", rhs[i] - abs(r)))
+            elif op == ">=":
+                model_rows.append((rows[i], "<=", rhs[i] + abs(r)))
+            elif r > 0:
+                model_rows[i] = (rows[i], ">=", rhs[i])
+                model_rows.append((rows[i], "<=", rhs[i] + r))
+            else:
+                model_rows[i] = (rows[i], "<=", rhs[i])
+                model_rows.append((rows[i], ">=", rhs[i] + r))
+
+    n = len(names)
+    lower = [0.0] * n
+    upper = [INF] * n
+    for fields in mps_lines(sections.get(b"BOUNDS", (b"", b""))[1], fixed):
+        kind = fields[0].upper()
+        if fixed:
+            col, value = fields[2], fields[3]
+        elif kind in (b"FR", b"MI", b"PL", b"BV"):
+            col, value = fields[-1], b""
+        else:
+            col, value = fields[-2], fields[-1]
+        j = col_index.get(col)
+        if j is None:
+            raise ValueError(f"{path}: bound on unknown column {col.decode()}")
+        if kind == b"UP":
+            upper[j] = float(value)
+            if upper[j] < 0 and lower[j] == 0:
+                lower[j] = -INF
+        elif kind in (b"LO", b"LI"):
+            lower[j] = float(value)
+        elif kind == b"UI":
+            upper[j] = float(value)
+        elif kind == b"FX":
+            lower[j] = upper[j] = float(value)
+        elif kind == b"FR":
+            lower[j], upper[j] = -INF, INF
+        elif kind == b"MI":
+            lower[j] = -INF
+        elif kind == b"PL":
+            upper[j] = INF
+        elif kind == b"BV":
+            lower[j], upper[j] = 0.0, 1.0
+            integer.add(j)
+        else:
+            raise ValueError(f"{path}: unsupported bound type {kind.decode()}")
+
+    return build_model(objective_type, names, objective, model_rows, lower, upper, sparse,
+                       integer)
+
+
+# --- CPLEX LP --------------------------------------------------------------
+
+LP_SECTION_RE = re.compile(
+    r"^[ \t]*(maximi[sz]e|maximum|max|minimi[sz]e|minimum|min|subject[ \t]+to|such[ \t]+that|s\.t\.|st\.?"
+    r"|bounds?|generals?|gen|integers?|binary|binaries|bin|semi-continuous|semis?|sos|end)"
+    r"(?=\s|$)",
+    re.I | re.M,
+)
+
+LP_TOKEN_RE = re.compile(
+    r"\s*(?:(?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)"
+    r"|(?P<op><=|=<|>=|=>|<|>|=)"
+    r"|(?P<sign>[+-])"
+    r"|(?P<colon>:)"
+    r"|(?P<name>[A-Za-z_!\"#$%&()/,;?@`'{}|~][\w!\"#$%&()/,.;?@`'{}|~\[\]^]*))"
+)
+
+LP_OPS = {"<=": "<=", "=<": "<=", "<": "<=", ">=": ">=", "=>": ">=", ">": ">=", "=": "="}
+
+LP_INFINITY = ("inf", "infinity")
+
+
+def lp_tokens(text):
+    """
+    (kind, value) tokens of an LP section, scanned in one finditer pass.
+    The matches never overlap, so they cover the whole text exactly when
+    their lengths add up to its length; otherwise the first gap is
+    reported.
+    """
+    text = text.rstrip()
+    matches = list(LP_TOKEN_RE.finditer(text))
+    if sum(m.end() - m.start() for m in matches) != len(text):
+        pos = 0
+        for m in matches:
+            if m.start() != pos:
+                break
+            pos = m.end()
+        raise ValueError(f"Unexpected text in LP file: {text[pos:pos + 30]!r}")
+    return [(m.lastgroup, m.group(m.lastgroup)) for m in matches]
+
+
+class LPReader:
+    """
+    CPLEX LP format reader: objective (Maximize / Minimize), Subject To,
+    Bounds, Binary and General / Integer sections. General, integer and
+    binary columns are flagged in "integer" (Simplex solves the LP
+    relaxation); semi-continuous and SOS sections are not supported.
+
+    A constant on the left side of a constraint moves to the right side; a
+    constant in the objective is ignored (the optimal value is reported
+    without it).
+    """
+
+    def __init__(self, path, sparse=False):
+        self.path = path
+        self.sparse = sparse
+        self.col_index = {}
+        self.names = []
+
+    def column(self, name):
+        j = self.col_index.get(name)
+        if j is None:
+            j = self.col_index[name] = len(self.names)
+            self.names.append(name)
+        return j
+
+    def read(self):
+        data = map_file(self.path)
+        try:
+            text = data[:].decode("utf-8")
+        finally:
+            if isinstance(data, mmap.mmap):
+                data.close()
+        # comments run from a backslash to the end of the line
+        text = re.sub(r"\\[^\n]*", "", text)
+
+        headers = list(LP_SECTION_RE.finditer(text))
+        if not headers:
+            raise ValueError(f"{self.path}: not an LP file (no objective section).")
+
+        objective_type = None
+        objective = {}
+        rows = []
+        lower = {}
+        upper = {}
+        integer = set()
+        for k, m in enumerate(headers):
+            keyword = re.sub(r"\s+", " ", m.group(1).lower())
+            end = headers[k + 1].start() if k + 1 < len(headers) else len(text)
+            body = text[m.end():end]
+            if keyword.startswith("max") or keyword.startswith("min"):
+                objective_type = "Max" if keyword.startswith("max") else "Min"
+                tokens = lp_tokens(body)
+                if len(tokens) >= 2 and tokens[1][0] == "colon":
+                    tokens = tokens[2:]
+                objective, _, pos = self.expression(tokens, 0)
+                if pos != len(tokens):
+                    raise ValueError(f"{self.path}: bad objective function.")
+            elif keyword in ("subject to", "such that", "s.t.", "st", "st."):
+                rows.extend(self.constraints(lp_tokens(body)))
+            elif keyword.startswith("bound"):
+                for line in body.split("\n"):
+                    if line.strip():
+                        self.bound(lp_tokens(line), lower, upper)
+            elif keyword.startswith("bin"):
+                for _, name in lp_tokens(body):
+                    j = self.column(name)
+                    lower[j], upper[j] = 0.0, 1.0
+                    integer.add(j)
+            elif keyword.startswith("gen") or keyword.startswith("int"):
+                for _, name in lp_tokens(body):
+                    integer.add(self.column(name))
+            elif keyword == "end":
+                break
+            else:
+                raise ValueError(f"{self.path}: section {m.group(1)!r} is not supported.")
+
+        if objective_type is None:
+            raise ValueError(f"{self.path}: not an LP file (no objective section).")
+        n = len(self.names)
+        return build_model(
+            objective_type, self.names, objective, rows,
+            [lower.get(j, 0.0) for j in range(n)],
+            [upper.get(j, INF) for j in range(n)],
+            self.sparse,
+            integer,
+        )
+
+    def expression(self, tokens, pos):
+        """
+        Linear expression starting at tokens[pos]; stops at an operator.
+        Returns ({column: coeff}, sum of the constant terms, next position).
+        """
+        coeffs = {}
+        constant = 0.0
+        n = len(tokens)
+        while pos < n and tokens[pos][0] not in ("op", "colon"):
+            sign = 1.0
+            while pos < n and tokens[pos][0] == "sign":
+                if tokens[pos][1] == "-":
+                    sign = -sign
+                pos += 1
+            coeff = 1.0
+            if pos < n and tokens[pos][0] == "num":
+                coeff = float(tokens[pos][1])
+                pos += 1
+                if pos == n or tokens[pos][0] != "name":
+                    constant += sign * coeff
+                    continue
+            if pos == n or tokens[pos][0] != "name":
+                raise ValueError(f"{self.path}: expected a variable in a linear expression.")
+            j = self.column(tokens[pos][1])
+            coeffs[j] = coeffs.get(j, 0.0) + sign * coeff
+            pos += 1
+        return coeffs, constant, pos
+
+    def constant(self, tokens, pos):
+        sign = 1.0
+        while pos < len(tokens) and tokens[pos][0] == "sign":
+            if tokens[pos][1] == "-":
+                sign = -sign
+            pos += 1
+        if pos == len(tokens):
+            raise ValueError(f"{self.path}: missing number.")
+        kind, value = tokens[pos]
+        if kind == "num":
+            return sign * float(value), pos + 1
+        if kind == "name" and value.lower() in LP_INFINITY:
+            return sign * INF, pos + 1
+        raise ValueError(f"{self.path}: expected a number, found {value!r}.")
+
+    def constraints(self, tokens):
+        rows = []
+        pos = 0
+        n = len(tokens)
+        while pos < n:
+            if tokens[pos][0] == "name" and pos + 1 < n and tokens[pos + 1][0] == "colon":
+                pos += 2  # constraint name
+            coeffs, constant, pos = self.expression(tokens, pos)
+            if pos >= n or tokens[pos][0] != "op":
+                raise ValueError(f"{self.path}: constraint without a comparison operator.")
+            op = LP_OPS[tokens[pos][1]]
+            rhs, pos = self.constant(tokens, pos + 1)
+            rows.append((coeffs, op, rhs - constant))
+        return rows
+
+    def bound(self, tokens, lower, upper):
+        """
+        One bound line: "x free", "x op v", "v op x" or "l <= x <= u".
+        """
+        if len(tokens) == 2 and tokens[1][1].lower() == "free":
+            j = self.column(tokens[0][1])
+            lower[j], upper[j] = -INF, INF
+            return
+
+        # the variable is the name token that is not an infinity keyword
+        at = next((k for k, (kind, value) in enumerate(tokens)
+                   if kind == "name" and value.lower() not in LP_INFINITY), None)
+        if at is None:
+            raise ValueError(f"{self.path}: bound without a variable.")
+        j = self.column(tokens[at][1])
+
+        if at > 0:
+            # v op x [op u]
+            value, _ = self.constant(tokens, 0)
+            op = LP_OPS[tokens[at - 1][1]]
+            self.apply_bound(j, {"<=": ">=", ">=": "<=", "=": "="}[op], value, lower, upper)
+        if at + 1 < len(tokens):
+            op = LP_OPS[tokens[at + 1][1]]
+            value, _ = self.constant(tokens, at + 2)
+            self.apply_bound(j, op, value, lower, upper)
+
+    @staticmethod
+    def apply_bound(j, op, value, lower, upper):
+        if op == "<=":
+            upper[j] = value
+        elif op == ">=":
+            lower[j] = value
+        else:
+            lower[j] = upper[j] = value
+
+
+def read_lp(path, sparse=False):
+    return LPReader(path, sparse).read()
+
+
+def read_model(path, sparse=False):
+    """
+    Reads a model by extension: .mps (free MPS), .lp (CPLEX LP), anything
+    else with Parser.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".mps":
+        return read_mps(path, sparse)
+    if ext == ".lp":
+        return read_lp(path, sparse)
+    return Parser(path, sparse=sparse).parse()
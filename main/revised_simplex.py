@@ -0,0 +1,396 @@
+import time
+
+import numpy as np
+
+from basis import ARTIFICIAL, SLACK, STRUCTURAL, Basis, column_names
+from factorization import LUFactorization
+from observers import no_clock
+from simplex import Simplex
+
+# relative round-off of a reduced cost c_B B^-1 a_j - c_j: with Big M the
+# duals are of the size of M, so an exact zero can come out as -1e-10
+ROUNDOFF = 1e-14
+
+
+class RevisedSimplex(Simplex):
+    """
+    Revised simplex engine.
+
+    Keeps only the original A (sparse, CSR for pricing and CSC for
+    entering columns), b and c plus an LU factorization of the
+    basis (updated with eta vectors and refactorized every
+    refactor_frequency pivots). Each iteration prices the nonbasic columns
+    with one btran and computes only the entering column with one ftran,
+    instead of updating the full tableau.
+
+    Slack and artificial columns are never stored: they are unit columns,
+    kept as (row, sign) pairs.
+
+    Upper bounds and free variables become rows and split columns (the
+    bounded-variable ratio test is only implemented on the tableau).
+
+    Stalls: the perturbation is applied to b itself (b + B delta), so
+    refactorizations keep it and remove_perturbation restores the real b.
+    While artificial columns are in the problem (Big M, Phase I) the
+    artificial costs must not see perturbed values, so a stall switches
+    straight to Bland's rule instead.
+    """
+
+    supports_bounds = False
+
+    def __init__(self, objective_coeffs, constraints,
+                 objective_type="Max", var_signs=None, refactor_frequency=50, **options):
+        """
+        refactor_frequency: eta vectors kept before the basis is refactorized.
+        Other options (method, pricing, trace, ...) are the ones of Simplex.
+        """
+        super().__init__(objective_coeffs, constraints, objective_type, var_signs, **options)
+        self.refactor_frequency = refactor_frequency
+        self.factor = None
+        self.basis = None
+        self.x_B = None
+        self._y = None
+        # the real b while b is perturbed
+        self.unperturbed_b = None
+
+    def prepare_tableau(self):
+        """
+        Builds the standard form data (A, b, costs) and the initial
+        slack/artificial basis, with the crash columns when crash is on. No
+        tableau is created.
+        """
+        A, b, slack_rows, slack_types, artificial_rows = self.standard_form()
+        crash = self.crash_basis(A, b, artificial_rows) if self.crash else {}
+        artificial_rows = [i for i in artificial_rows if i not in crash]
+        n = self.num_vars
+        slack_signs = [slack_types[i] for i in slack_rows]
+        self.setup(A, b, slack_rows, slack_signs, artificial_rows)
+
+        num_slack = len(slack_rows)
+        if self.method != "big_m" and artificial_rows:
+            self.costs[:n + num_slack] = 0.0
+            self.costs[n + num_slack:] = -1.0
+
+        for k, (row, sign) in enumerate(zip(slack_rows, slack_signs)):
+            if sign == 1.0:
+                self.basis.enter(row, n + k)
+        for k, row in enumerate(artificial_rows):
+            self.basis.enter(row, n + num_slack + k)
+        for row, col in crash.items():
+            self.basis.enter(row, col)
+        if crash:
+            self.log(f"Crash: {len(crash)} artificiais evitadas")
+        self.refactor()
+
+    def prepare_warm_start(self, basis_columns, flipped=None):
+        A, b, slack_rows, slack_types = self.warm_standard_form()
+        self.setup(A, b, slack_rows, [slack_types[i] for i in slack_rows], [])
+        for i, j in enumerate(basis_columns):
+            self.basis.enter(i, j)
+        self.refactor()
+
+    def setup(self, A, b, slack_rows, slack_signs, artificial_rows):
+        n = self.num_vars
+        num_slack = len(slack_rows)
+        num_artificial = len(artificial_rows)
+
+        self.A_csr = A
+        self.A_csc = A.tocsc()
+        self.b = np.asarray(b, dtype=np.float64)
+        self.unperturbed_b = None
+        self.logical_rows = np.array(slack_rows + artificial_rows, dtype=np.intp)
+        self.logical_signs = np.array(slack_signs + [1.0] * num_artificial)
+        self.costs = np.concatenate([
+            np.asarray(self.c, dtype=np.float64),
+            np.zeros(num_slack),
+            np.full(num_artificial, -float(self.M)),
+        ])
+        # columns allowed to enter the basis
+        self.enterable = np.ones(len(self.costs), dtype=bool)
+        self.num_slack = num_slack
+        self.artificial_indices = list(range(n + num_slack, n + num_slack + num_artificial))
+
+        # largest |a_ij| of every column, to size the round-off of its reduced cost
+        self.column_scale = np.ones(len(self.costs))
+        self.column_scale[:n] = 0.0
+        np.maximum.at(self.column_scale, A.indices, np.abs(A.data))
+        self.kinds = [STRUCTURAL] * n + [SLACK] * num_slack + [ARTIFICIAL] * num_artificial
+        self.basis = Basis(len(b), self.kinds)
+        self._var_names = None
+
+    def column(self, j):
+        if j < self.num_vars:
+            return self.A_csc.column(j)
+        col = np.zeros(len(self.b))
+        k = j - self.num_vars
+        col[self.logical_rows[k]] = self.logical_signs[k]
+        return col
+
+    def refactor(self):
+        m = len(self.b)
+        B = np.empty((m, m))
+        for i, j in enumerate(self.basis.head.tolist()):
+            B[:, i] = self.column(j)
+        self.factor = LUFactorization(B)
+        self.x_B = self.factor.ftran(self.b)
+        self._y = None
+
+    def pricing_vector(self):
+        """
+        y = c_B B^-1, computed once per basis.
+        """
+        if self._y is None:
+            self._y = self.factor.btran(self.costs[self.basis.head])
+        return self._y
+
+    def btran_row(self, v):
+        """
+        (B^-T v)^T A over every column, structural and logical.
+        """
+        rho = self.factor.btran(v)
+        return np.concatenate([
+            self.A_csr.rmatvec(rho),
+            self.logical_signs * rho[self.logical_rows],
+        ])
+
+    def num_columns(self):
+        return len(self.costs)
+
+    def reduced_costs(self, cols=None):
+        """
+        Pricing row d = c_B B^-1 A - c (zero for basic and excluded columns),
+        for every column or only for cols. Values within the round-off of
+        their dot product (ROUNDOFF times |y| |a_j| + |c_j|) are zero.
+        """
+        y = self.pricing_vector()
+        n = self.num_vars
+        if cols is None:
+            d = np.empty(len(self.costs))
+            d[:n] = self.A_csr.rmatvec(y) - self.costs[:n]
+            d[n:] = self.logical_signs * y[self.logical_rows] - self.costs[n:]
+            d[self.basis.head] = 0.0
+            d[~self.enterable] = 0.0
+            d[np.abs(d) <= self.pricing_noise(y)] = 0.0
+            return d
+
+        cols = np.asarray(cols, dtype=np.intp)
+        d = np.empty(len(cols))
+        structural = cols < n
+        d[structural] = self.A_csc.rmatvec(y, cols[structural])
+        k = cols[~structural] - n
+        d[~structural] = self.logical_signs[k] * y[self.logical_rows[k]]
+        d -= self.costs[cols]
+        d[self.basis.is_basic(cols) | ~self.enterable[cols]] = 0.0
+        d[np.abs(d) <= self.pricing_noise(y, cols)] = 0.0
+        return d
+
+    def pricing_noise(self, y, cols=None):
+        """
+        Round-off level of the reduced costs of cols (every column when
+        None) for the duals y.
+        """
+        y_max = float(np.abs(y).max(initial=0.0))
+        if cols is None:
+            return ROUNDOFF * (y_max * self.column_scale + np.abs(self.costs))
+        return ROUNDOFF * (y_max * self.column_scale[cols] + np.abs(self.costs[cols]))
+
+    def pivot_row_values(self, r):
+        e_r = np.zeros(len(self.b))
+        e_r[r] = 1.0
+        row = self.btran_row(e_r)
+        row[~self.enterable] = 0.0
+        return row
+
+    def column_dots(self, alpha):
+        return self.btran_row(alpha)
+
+    def column_norms_sq(self):
+        # only known cheaply while the basis is made of unit (logical) columns
+        if (self.basis.head < self.num_vars).any():
+            return None
+        norms = np.ones(len(self.costs))
+        norms[:self.num_vars] = np.bincount(self.A_csr.indices, weights=self.A_csr.data ** 2,
+                                            minlength=self.num_vars)
+        return norms
+
+    def basic_column(self, r):
+        return self.basis[r]
+
+    def end_phase_one(self):
+        """
+        Pivots zero-level artificials out of the basis where a non-artificial
+        column can replace them, then excludes the artificial columns from
+        pricing and switches to the real costs. Artificials that cannot be
+        pivoted out belong to redundant rows and stay basic at zero.
+        """
+        n = self.num_vars
+        first_artificial = n + self.num_slack
+        for r in self.basis.artificial_rows().tolist():
+            row = self.pivot_row_values(r)
+            row[first_artificial:] = 0.0
+            row[self.basis.head] = 0.0
+            candidates = np.flatnonzero(np.abs(row) > 1e-10)
+            if len(candidates) == 0:
+                continue
+            self.pivot(r, int(candidates[0]))
+
+        self.enterable[first_artificial:] = False
+        self.costs[:n] = self.c
+        self.costs[n:] = 0.0
+        self._y = None
+        self.artificial_indices = []
+
+    def primal_pivots(self):
+        limit = self.iteration_limit()
+        stall_limit = self.stall_limit()
+        stall = 0
+        iteration = 0
+
+        self.pricing.reset(self)
+        tracer = self.tracer
+        observing = bool(self.observers)
+        clock = time.perf_counter if observing else no_clock
+        objective = self.objective_value()
+
+        if tracer.enabled:
+            tracer.iteration(self, 0)
+
+        while iteration < limit:
+            iteration += 1
+
+            # Phase I can stop as soon as the artificials reach zero (up to
+            # the round-off of x_B, which grows with b)
+            if self.phase == 1 and self.objective_value() >= -1e-10 * self.rhs_scale():
+                return "optimal"
+
+            t0 = clock()
+            pivot_col = self.find_pivot_column()
+            if pivot_col is None:
+                if self.check_artificial_in_basis():
+                    return "infeasible"
+                return "optimal"
+
+            t1 = clock()
+            alpha = self.factor.ftran(self.column(pivot_col))
+            pivot_row = self.find_pivot_row(alpha)
+            if pivot_row is None:
+                if self.factor.num_updates:
+                    # the ray may come from eta file round-off: refactorize
+                    # and price again before calling the model unbounded
+                    self.refactor()
+                    iteration -= 1
+                    continue
+                return "unbounded"
+
+            t2 = clock()
+            self.pricing.update(self, pivot_row, pivot_col, alpha)
+            leaving = self.pivot(pivot_row, pivot_col, alpha)
+            self.iterations += 1
+            objective, degenerate = self.pivot_progress(objective)
+
+            if observing:
+                self.notify_pivot(iteration, pivot_col, leaving, objective, degenerate,
+                                  (t0, t1, t2, clock()), "primal")
+
+            if tracer.enabled:
+                tracer.iteration(self, iteration, pivot_col, leaving)
+
+            stall = stall + 1 if degenerate else 0
+            if stall >= stall_limit and self.anti_cycling != "off":
+                self.break_stall()
+                stall = 0
+
+        return self.limit_reached(limit)
+
+    def can_perturb(self):
+        return not self.artificial_indices
+
+    def perturb(self):
+        delta = self.perturbation(self.x_B, self.basis.head)
+        shift = np.zeros(len(self.b))
+        for i in np.flatnonzero(delta).tolist():
+            shift += delta[i] * self.column(int(self.basis[i]))
+        self.unperturbed_b = self.b
+        self.b = self.b + shift
+        self.x_B = self.x_B + delta
+
+    def reload_rhs(self):
+        if self.unperturbed_b is not None:
+            self.b = self.unperturbed_b
+            self.unperturbed_b = None
+        self.refactor()
+
+    def pivot(self, pivot_row, pivot_col, alpha=None):
+        """
+        Replaces the basic variable of pivot_row by pivot_col, updating x_B and
+        the factorization. Returns the leaving column.
+        """
+        if alpha is None:
+            alpha = self.factor.ftran(self.column(pivot_col))
+        theta = self.x_B[pivot_row] / alpha[pivot_row]
+        self.x_B -= theta * alpha
+        self.x_B[pivot_row] = theta
+        leaving = self.basis.enter(pivot_row, pivot_col)
+        self.factor.update(pivot_row, alpha)
+        self._y = None
+        if self.factor.num_updates >= self.refactor_frequency:
+            self.refactor()
+        return leaving
+
+    def basic_values(self):
+        return self.x_B
+
+    def column_kinds(self):
+        return self.basis.kind
+
+    def add_basic_row(self, basis_columns, cols, vals, slack_coef, rhs):
+        # the factorization cannot grow a row: refactor the extended basis
+        self.prepare_warm_start(np.append(basis_columns, self.slack_basis()[-1]))
+
+    def saved_basis(self):
+        if self.presolve:
+            return None
+        if (self.basis.kind[self.basis.head] == ARTIFICIAL).any():
+            return None
+        return self.basis.head.copy()
+
+    def find_pivot_row(self, alpha):
+        positive = alpha > 1e-10
+        if not positive.any():
+            return None
+        # round-off can leave degenerate basics at -1e-15; treat them as zero
+        # so they still block the step
+        ratios = np.full(len(alpha), np.inf)
+        np.divide(np.maximum(self.x_B, 0.0), alpha, out=ratios, where=positive)
+        min_ratio = ratios.min()
+        ties = np.flatnonzero(positive & (ratios - min_ratio < 1e-10))
+        if self.pricing.lowest_index_ties:
+            return int(ties[np.argmin(self.basis.head[ties])])
+        return int(ties[0])
+
+    def objective_value(self):
+        return float(self.costs[self.basis.head] @ self.x_B)
+
+    def column_names(self):
+        if self._var_names is None:
+            self._var_names = column_names(self.kinds)
+        return self._var_names
+
+    def format_iteration(self, iteration, entering=None, leaving=None):
+        # there is no tableau to show, a full trace is the summary line
+        return self.format_summary(iteration, entering, leaving)
+
+    def rhs_scale(self):
+        return max(1.0, float(np.abs(self.b).max(initial=0.0)))
+
+    def check_artificial_in_basis(self):
+        rows = self.basis.artificial_rows()
+        return bool((self.x_B[rows] > 1e-10 * self.rhs_scale()).any())
+
+    def extract_solution(self):
+        internal_solution = [0.0] * self.num_vars
+        for i, j in enumerate(self.basis.head.tolist()):
+            if j < self.num_vars:
+                internal_solution[j] = float(self.x_B[i])
+
+        self.set_solution(internal_solution, self.objective_value())
@@ -0,0 +1,94 @@
+import numpy as np
+
+SCALING_METHODS = ("geometric", "equilibrate", "geometric+equilibrate")
+
+
+def power_of_two(factors):
+    """
+    Rounds scale factors to powers of two, so scaling itself adds no
+    rounding error.
+    """
+    return np.exp2(np.round(np.log2(factors)))
+
+
+def segment_extremes(values, ids, size):
+    """
+    Largest and smallest of values grouped by ids (1 for empty groups).
+    """
+    largest = np.zeros(size)
+    smallest = np.full(size, np.inf)
+    np.maximum.at(largest, ids, values)
+    np.minimum.at(smallest, ids, values)
+    empty = largest == 0
+    largest[empty] = 1.0
+    smallest[empty] = 1.0
+    return largest, smallest
+
+
+class Scaling:
+    """
+    Row and column scale factors r, s for the constraint matrix, giving the
+    scaled model A' = diag(r) A diag(s), b' = r b, c' = s c with x = s x'.
+    The objective value does not change, and the rows keep their sense
+    because every factor is positive.
+
+    Methods:
+        geometric    up to `passes` sweeps of r_i = 1 / sqrt(min_j |a_ij| max_j |a_ij|)
+                     followed by the same for columns, stopping early when a
+                     sweep improves the spread max|a| / min|a| by less than
+                     `min_gain`
+        equilibrate  rows and then columns divided by their largest |a_ij|
+    """
+
+    def __init__(self, A, method="geometric+equilibrate", passes=8, min_gain=0.9):
+        if method not in SCALING_METHODS:
+            raise ValueError(f"Unknown scaling method: {method}")
+        m, n = A.shape
+        rows, cols = A.row_ids, A.indices
+        values = np.abs(A.data)
+        r = np.ones(m)
+        s = np.ones(n)
+
+        if "geometric" in method:
+            spread = self.spread(values)
+            for _ in range(passes):
+                largest, smallest = segment_extremes(values * s[cols], rows, m)
+                r = 1.0 / np.sqrt(largest * smallest)
+                largest, smallest = segment_extremes(values * r[rows], cols, n)
+                s = 1.0 / np.sqrt(largest * smallest)
+                new_spread = self.spread(values * r[rows] * s[cols])
+                if new_spread > min_gain * spread:
+                    break
+                spread = new_spread
+
+        if "equilibrate" in method:
+            largest, _ = segment_extremes(values * r[rows] * s[cols], rows, m)
+            r = r / largest
+            largest, _ = segment_extremes(values * r[rows] * s[cols], cols, n)
+            s = s / largest
+
+        self.method = method
+        self.row_factors = power_of_two(r)
+        self.col_factors = power_of_two(s)
+
+    @staticmethod
+    def spread(values):
+        if len(values) == 0:
+            return 1.0
+        return float(values.max() / values.min())
+
+    def apply(self, c, A, b):
+        """
+        Returns:
+            (c', A', b') of the scaled model
+        """
+        A = A.scale_rows(self.row_factors).scale_columns(self.col_factors)
+        c = (np.asarray(c, dtype=np.float64) * self.col_factors).tolist()
+        b = (np.asarray(b, dtype=np.float64) * self.row_factors).tolist()
+        return c, A, b
+
+    def unscale(self, x, objective):
+        """
+        Maps a solution of the scaled model back (x = s x').
+        """
+        return (np.asarray(x, dtype=np.float64) * self.col_factors).tolist(), objective
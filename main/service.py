@@ -0,0 +1,373 @@
+# service.py
+import argparse
+import asyncio
+import io
+import json
+import multiprocessing
+import time
+
+from batch import ENGINES
+from parser import Parser
+
+SOLVER_OPTIONS = ("method", "pricing", "backend", "presolve", "scaling", "crash",
+                  "anti_cycling", "max_iterations", "crossover")
+
+
+def read_job_model(job):
+    """
+    The model of a request: "text" in the input.txt format, or "model" as
+    the dict returned by Parser.parse() (objective_type, objective_coeffs,
+    constraints and optionally var_signs / bounds).
+    """
+    if "text" in job:
+        return Parser(io.StringIO(job["text"])).parse()
+    model = job.get("model")
+    if not isinstance(model, dict):
+        raise ValueError('Request needs "text" or "model".')
+    for field in ("objective_type", "objective_coeffs", "constraints"):
+        if field not in model:
+            raise ValueError(f'Model without "{field}".')
+    bounds = model.get("bounds")
+    return {
+        "objective_type": model["objective_type"],
+        "objective_coeffs": model["objective_coeffs"],
+        # sparse rows come with the (0-based) column indices as JSON strings
+        "constraints": [
+            ({int(j): a for j, a in coeffs.items()} if isinstance(coeffs, dict) else coeffs, op, rhs)
+            for coeffs, op, rhs in model["constraints"]
+        ],
+        "var_signs": model.get("var_signs"),
+        # JSON has no infinity: null means no bound on that side
+        "bounds": None if bounds is None else [tuple(b) for b in bounds],
+    }
+
+
+def solve_job(job):
+    """
+    Parses and solves one request in a worker process. Never raises: any
+    failure is reported in the "error" field.
+    """
+    record = {
+        "status": "error",
+        "optimal_value": None,
+        "solution": None,
+        "iterations": 0,
+        "primal_residual": None,
+        "solve_time": 0.0,
+        "error": None,
+    }
+    try:
+        start = time.perf_counter()
+        result = read_job_model(job)
+        options = {k: v for k, v in job.get("options", {}).items() if k in SOLVER_OPTIONS}
+        engine = job.get("engine", "tableau")
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        if engine == "revised":
+            options.pop("backend", None)
+        simplex = ENGINES[engine](
+            objective_coeffs=result["objective_coeffs"],
+            constraints=result["constraints"],
+            objective_type=result["objective_type"],
+            var_signs=result["var_signs"],
+            bounds=result["bounds"],
+            trace="off",
+            **options
+        )
+        solution = simplex.solve()
+        record["solve_time"] = time.perf_counter() - start
+        record["status"] = solution["status"]
+        record["optimal_value"] = solution["optimal_value"]
+        record["solution"] = solution["solution"]
+        record["iterations"] = simplex.iterations
+        residuals = simplex.residuals()
+        if residuals is not None:
+            record["primal_residual"] = max(residuals.values())
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+    return record
+
+
+def worker_main(conn):
+    """
+    Worker process loop: solves the jobs received on conn until it gets
+    None or the pipe closes. The solver modules stay imported between jobs.
+    """
+    while True:
+        try:
+            job = conn.recv()
+        except EOFError:
+            break
+        if job is None:
+            break
+        conn.send(solve_job(job))
+
+
+class Worker:
+    """
+    One worker process and its end of the pipe.
+    """
+
+    def __init__(self, context):
+        self.conn, child = context.Pipe()
+        self.process = context.Process(target=worker_main, args=(child,), daemon=True)
+        self.process.start()
+        child.close()
+
+    async def call(self, job):
+        """
+        Sends job and waits for the record without blocking the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        fd = self.conn.fileno()
+
+        def ready():
+            loop.remove_reader(fd)
+            if future.done():
+                return
+            try:
+                future.set_result(self.conn.recv())
+            except (EOFError, OSError) as e:
+                future.set_exception(RuntimeError(f"Worker died: {e}"))
+
+        self.conn.send(job)
+        loop.add_reader(fd, ready)
+        try:
+            return await future
+        finally:
+            loop.remove_reader(fd)
+
+    def stop(self):
+        try:
+            self.conn.send(None)
+        except (BrokenPipeError, OSError):
+            pass
+        self.conn.close()
+        self.process.join(1.0)
+        if self.process.is_alive():
+            self.process.kill()
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class WorkerPool:
+    """
+    A fixed number of warm worker processes. A job waits for an idle
+    worker; a worker whose job times out or is cancelled is killed and
+    replaced, so an abandoned solve never keeps a slot busy.
+    """
+
+    def __init__(self, workers=None):
+        self.size = workers or multiprocessing.cpu_count()
+        self.context = multiprocessing.get_context()
+        self.idle = None
+        self.workers = []
+
+    def start(self):
+        self.idle = asyncio.Queue()
+        for _ in range(self.size):
+            self.release(self.spawn())
+
+    def spawn(self):
+        worker = Worker(self.context)
+        self.workers.append(worker)
+        return worker
+
+    def release(self, worker):
+        self.idle.put_nowait(worker)
+
+    async def run(self, job, timeout=None):
+        """
+        Solves job on a worker. Raises asyncio.TimeoutError if it takes more
+        than timeout seconds (waiting for a worker included).
+        """
+        async def solve():
+            worker = await self.idle.get()
+            try:
+                record = await worker.call(job)
+            except BaseException:
+                # the worker may be in the middle of the solve
+                self.workers.remove(worker)
+                worker.kill()
+                self.release(self.spawn())
+                raise
+            self.release(worker)
+            return record
+
+        return await asyncio.wait_for(solve(), timeout)
+
+    def close(self):
+        for worker in self.workers:
+            worker.stop()
+        self.workers = []
+
+
+def valid_id(request_id):
+    """
+    Request ids are echoed back and index the pending requests: strings,
+    integers or null.
+    """
+    return request_id is None or (isinstance(request_id, (str, int)) and not isinstance(request_id, bool))
+
+
+def valid_timeout(timeout):
+    """
+    Time limits are positive numbers of seconds, or null for no limit.
+    """
+    if timeout is None:
+        return True
+    return isinstance(timeout, (int, float)) and not isinstance(timeout, bool) and timeout > 0
+
+
+class SolveService:
+    """
+    JSON-lines server: one request object per line, one response per line
+    (in completion order, matched by "id").
+
+    Requests:
+        {"id": 1, "text": "Max 2x1 + 3x2\\n..."}
+        {"id": 2, "model": {...}, "options": {"method": "dual"},
+         "engine": "revised", "timeout": 5}
+        {"id": 3, "cancel": 2}
+
+    Responses carry status (optimal, unbounded, infeasible, error,
+    timeout or cancelled), optimal_value, solution, iterations,
+    primal_residual, solve_time and error.
+
+    At most max_pending requests are in flight; past that the server stops
+    reading, so the client's writes block (backpressure). A connection
+    error cancels the pending requests of that connection.
+    """
+
+    def __init__(self, workers=None, max_pending=None, timeout=None):
+        self.pool = WorkerPool(workers)
+        self.max_pending = max_pending or 2 * self.pool.size
+        self.timeout = timeout
+        self.slots = None
+
+    async def handle(self, reader, writer):
+        pending = {}
+        lock = asyncio.Lock()
+
+        async def respond(response):
+            async with lock:
+                writer.write((json.dumps(response) + "\n").encode())
+                await writer.drain()
+
+        async def answer(request_id, job):
+            try:
+                try:
+                    record = await self.pool.run(job, job.get("timeout", self.timeout))
+                except asyncio.TimeoutError:
+                    record = {"status": "timeout", "error": "time limit reached"}
+                except asyncio.CancelledError:
+                    record = {"status": "cancelled", "error": None}
+                except Exception as e:
+                    # e.g. a worker that died; the request still gets its answer
+                    record = {"status": "error", "error": f"{type(e).__name__}: {e}"}
+                await respond({"id": request_id, **record})
+            except (ConnectionError, asyncio.CancelledError):
+                pass
+            finally:
+                pending.pop(request_id, None)
+                self.slots.release()
+
+        try:
+            while True:
+                await self.slots.acquire()
+                # the slot goes to the answer task, or back when the line
+                # does not start a solve (or handling it fails)
+                started = False
+                try:
+                    line = await reader.readline()
+                    if not line:
+                        break
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        job = json.loads(line)
+                        if not isinstance(job, dict):
+                            raise ValueError("Request must be a JSON object.")
+                    except ValueError as e:
+                        await respond({"id": None, "status": "error", "error": f"Invalid request: {e}"})
+                        continue
+
+                    if "cancel" in job:
+                        task = pending.get(job["cancel"]) if valid_id(job["cancel"]) else None
+                        if task is not None:
+                            task.cancel()
+                        continue
+                    request_id = job.get("id")
+                    if not valid_id(request_id):
+                        await respond({"id": None, "status": "error",
+                                       "error": "Request id must be a string, an integer or null."})
+                        continue
+                    if not valid_timeout(job.get("timeout")):
+                        await respond({"id": request_id, "status": "error",
+                                       "error": "Request timeout must be a positive number or null."})
+                        continue
+                    if request_id in pending:
+                        await respond({"id": request_id, "status": "error",
+                                       "error": "Request id already in use."})
+                        continue
+                    pending[request_id] = asyncio.create_task(answer(request_id, job))
+                    started = True
+                finally:
+                    if not started:
+                        self.slots.release()
+        except ConnectionError:
+            for task in list(pending.values()):
+                task.cancel()
+        finally:
+            # after EOF the pending requests are still answered (the client
+            # may have only shut down its writing side)
+            await asyncio.gather(*pending.values(), return_exceptions=True)
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8765, unix=None):
+        """
+        Serves until cancelled, on a Unix socket if unix is given, else TCP.
+        """
+        self.pool.start()
+        self.slots = asyncio.Semaphore(self.max_pending)
+        # room for large models sent as a single line
+        limit = 1 << 26
+        if unix:
+            server = await asyncio.start_unix_server(self.handle, path=unix, limit=limit)
+            where = unix
+        else:
+            server = await asyncio.start_server(self.handle, host, port, limit=limit)
+            where = f"{host}:{port}"
+        print(f"Servindo em {where} com {self.pool.size} processos", flush=True)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Local LP solve service (JSON lines).")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--unix", default=None, help="Unix socket path (instead of TCP)")
+    ap.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: all CPUs)")
+    ap.add_argument("--max-pending", type=int, default=None,
+                    help="requests in flight before reading stops (default: 2 per worker)")
+    ap.add_argument("--timeout", type=float, default=None, help="default time limit per request (s)")
+    args = ap.parse_args()
+
+    service = SolveService(workers=args.workers, max_pending=args.max_pending, timeout=args.timeout)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,149 @@
 from tableau import Tableau
+from numpy_tableau import NumpyTableau
+from sparse import CSRMatrix, iter_row
+from pricing import BlandPricing, make_pricing
+from tracing import REPORT_HEADER, make_tracer
+from basis import ARTIFICIAL
+from presolve import Presolve
+from scaling import Scaling
+from factorization import LUFactorization
+from observers import PivotEvent, no_clock
+from contextlib import contextmanager
+import numpy as np
 import os
+import time
+
+TABLEAU_BACKENDS = {
+    "list": Tableau,
+    "numpy": NumpyTableau,
+}
+
+INF = float("inf")
+
+SIGN_BOUNDS = {
+    ">=0": (0.0, INF),
+    "<=0": (-INF, 0.0),
+    "free": (-INF, INF),
+}
+
+def theta_interval(values, steps, lower, upper, tol=1e-12):
+    """
+    Largest interval (low, high) of theta with
+    lower <= values + theta * steps <= upper, elementwise.
+    """
+    low, high = theta_intervals(values, steps[:, None], lower, upper, tol)
+    return float(low[0]), float(high[0])
+
+def theta_intervals(values, steps, lower, upper, tol=1e-12):
+    """
+    theta_interval for every column of steps at once (one direction per
+    column).
+
+    Returns:
+        (low, high) arrays with one entry per column
+    """
+    values, lower, upper = values[:, None], lower[:, None], upper[:, None]
+    up = steps > tol
+    down = steps < -tol
+    with np.errstate(divide="ignore", invalid="ignore"):
+        to_lower = (lower - values) / steps
+        to_upper = (upper - values) / steps
+    low = np.where(up, to_lower, np.where(down, to_upper, -INF)).max(axis=0, initial=-INF)
+    high = np.where(up, to_upper, np.where(down, to_lower, INF)).min(axis=0, initial=INF)
+    return low, high
+
 
 class Simplex:
+    # finite upper bounds and free columns handled in the ratio test
+    supports_bounds = True
+
     def __init__(self, objective_coeffs, constraints, 
-                 objective_type="Max", var_signs=None):
+                 objective_type="Max", var_signs=None, backend="numpy",
+                 method="big_m", pricing="dantzig", trace="full", report_path=None,
+                 presolve=False, scaling=None, bounds=None, observers=None,
+                 crash=False, max_iterations=None, anti_cycling="perturb",
+                 sensitivity=False):
         """
         Args:
             objective_coeffs: objective function coefficients 
-            constraints: List of tuples (coefficients, operator, rhs)
+            constraints: List of tuples (coefficients, operator, rhs); coefficients
+                can be a dense list or a sparse dict {variable_index: coeff}
             objective_type: "Max" (only maximization is supported)
             non_negative: List indicating if each variable is non-negative
+            backend: tableau storage, "numpy" (ndarray) or "list" (pure Python)
+            method: "big_m", "two_phase" (Phase I minimizes the sum of the
+                artificials, which are then dropped before Phase II) or "dual"
+                (dual simplex from the all-slack basis when it is dual
+                feasible, otherwise two-phase)
+            pricing: entering column rule, a name from pricing.PRICING_RULES
+                ("dantzig", "bland", "partial", "multiple", "devex",
+                "steepest_edge") or a PricingRule instance
+            trace: iteration tracing, "off", "summary", "every:N", "full" or a
+                tracing.Tracer
+            report_path: with trace "full"/"every:N", iterations are streamed
+                to this file and write_report(report_path) appends the solution
+            presolve: if True every solve() first reduces the model with
+                presolve.Presolve and maps the solution back afterwards (no
+                warm starts are kept in this mode)
+            scaling: None, a method from scaling.SCALING_METHODS
+                ("geometric", "equilibrate", "geometric+equilibrate") or True
+                for "geometric+equilibrate". The engine then works on the
+                scaled model and the solution is unscaled before it is stored
+            bounds: (lower, upper) per variable (None for no bound), used
+                instead of var_signs. This engine keeps upper bounds and free
+                variables out of the rows (bounded-variable ratio test);
+                with presolve, and in engines with supports_bounds = False,
+                they become extra rows and split columns
+            observers: observers.SolverObserver instances notified when a
+                solve starts, after every pivot and when it ends
+            crash: if True the cold start puts structural columns in the
+                basis of >= and = rows where that keeps it feasible (see
+                crash_basis), so fewer artificials are needed
+            max_iterations: pivots allowed per simplex loop (None: grows
+                with the problem size, see iteration_limit)
+            anti_cycling: what to do when the primal simplex stalls (a run of
+                degenerate pivots, see break_stall): "perturb" (perturb the
+                basic values, then Bland's rule if it stalls again), "bland"
+                or "off"
+            sensitivity: if True every optimal result also has a
+                "sensitivity" entry (see sensitivity_analysis), written by
+                write_report too
         """
+        if backend not in TABLEAU_BACKENDS:
+            raise ValueError(f"Unknown tableau backend: {backend}")
+        if method not in ("big_m", "two_phase", "dual"):
+            raise ValueError(f"Unknown method: {method}")
+        if anti_cycling not in ("perturb", "bland", "off"):
+            raise ValueError(f"Unknown anti-cycling rule: {anti_cycling}")
+        self.backend = backend
+        self.method = method
+        self.presolve = presolve
+        self.presolver = None
+        self.scaling = "geometric+equilibrate" if scaling is True else scaling
+        self.scaler = None
+        self.crash = crash
+        self.max_iterations = max_iterations
+        self.anti_cycling = anti_cycling
+        self.perturbed = False
+        self.sensitivity = sensitivity
+        self.sensitivity_report = None
+        self.pricing = make_pricing(pricing)
+        self.tracer = make_tracer(trace, report_path)
+        self.observers = list(observers) if observers else []
+        self.iterations = 0
+        self.degenerate_pivots = 0
+        self.phase = None
         self.original_objective_type = objective_type
         self.orig_num_vars = len(objective_coeffs)
         self.var_signs = var_signs if var_signs else [">=0"] * self.orig_num_vars
+        self.bounds = self.variable_bounds(self.var_signs, bounds)
+        self.native_bounds = self.supports_bounds and not presolve
         self.original_constraints = constraints[:]
+        self.original_objective = list(objective_coeffs)
 
-        self.c, self.constraints, self._map_orig_to_internal = self.expand_variables(
-            objective_coeffs, constraints, self.var_signs
+        self.internal_columns()
+        self.c, self.A, self.ops, self.rhs, self.offset = self.expand_variables(
+            objective_coeffs, constraints
         )
 
         if objective_type == "Min":
@@ -29,69 +155,348 @@ class Simplex:
         
         self.objective_type = "Max"
         self.num_vars = len(self.c)
+        # bounded-variable simplex: only when some column has a finite upper
+        # bound or is free, otherwise the plain ratio test is used
+        self.bounded = bool(np.isfinite(self.upper).any() or self.free.any())
+        self.flipped = np.zeros(self.num_vars, dtype=bool)
         self.M = 1000000
         self.tableau_obj = None
         self.artificial_indices = []
         self.solution = None
         self.optimal_value = None
+        self.status = None
         self.iteration_logs = []
+        self.final_basis = None
+        self.final_flipped = None
+        self.internal_solution = None
+        # set by update_rhs / update_objective until the next re-optimization
+        self.data_changed = False
+
+    def variable_bounds(self, var_signs, bounds):
+        """
+        (lower, upper) of every original variable: bounds when given (None
+        means no bound on that side), otherwise the sign in var_signs.
+        Crossed bounds (lower > upper) are kept; solve() reports the model
+        infeasible.
+        """
+        if bounds is None:
+            return [SIGN_BOUNDS.get(s, (-INF, INF)) for s in var_signs[:self.orig_num_vars]] + \
+                [(0.0, INF)] * (self.orig_num_vars - len(var_signs))
+        result = []
+        for i in range(self.orig_num_vars):
+            lower, upper = bounds[i] if i < len(bounds) else (0.0, INF)
+            lower = -INF if lower is None else float(lower)
+            upper = INF if upper is None else float(upper)
+            result.append((lower, upper))
+        return result
 
-    def expand_variables(self, c, constraints, var_signs):
-        n = len(c)
-        A = [list(coeffs) for (coeffs, _, _) in constraints]
+    def internal_columns(self):
+        """
+        Lays out the non-negative internal columns of every original
+        variable x with bounds [l, u]:
+            l finite             x = l + x', with x' <= u - l
+            l = -inf, u finite   x = u - x'
+            free                 one free column (native bounds) or x+ - x-
+        With native bounds the upper bounds of x' are kept in self.upper and
+        handled by the ratio test; otherwise they become "<=" rows placed
+        before the model's own rows (self.bound_rows).
+        """
+        mapping, shift, sign, upper, free = [], [], [], [], []
+        for lower, up in self.bounds:
+            col = len(upper)
+            mapping.append([col])
+            if lower > -INF:
+                shift.append(lower)
+                sign.append(1.0)
+                upper.append(up - lower)
+                free.append(False)
+            elif up < INF:
+                shift.append(up)
+                sign.append(-1.0)
+                upper.append(INF)
+                free.append(False)
+            elif self.native_bounds:
+                shift.append(0.0)
+                sign.append(1.0)
+                upper.append(INF)
+                free.append(True)
+            else:
+                mapping[-1].append(col + 1)
+                shift.append(0.0)
+                sign.append(1.0)
+                upper.extend([INF, INF])
+                free.extend([False, False])
+
+        self._map_orig_to_internal = mapping
+        self.shift = np.array(shift)
+        self.sign = np.array(sign)
+        self.upper = np.array(upper)
+        self.free = np.array(free, dtype=bool)
+        self.bound_rows = []
+        if not self.native_bounds:
+            self.bound_rows = [(j, u) for j, u in enumerate(upper) if u < INF]
+            self.upper[:] = INF
+
+    def expand_variables(self, c, constraints):
+        """
+        Rewrites the objective and constraint rows over the internal columns
+        laid out by internal_columns (the bound shifts move to the RHS and to
+        the objective offset). Constraint rows may be dense lists or dicts
+        {column: coeff}; the expanded matrix is returned as CSR.
+
+        Returns:
+            (new_c, A, ops, b, offset)
+        """
+        n = self.orig_num_vars
+        A = CSRMatrix.from_rows([coeffs for (coeffs, _, _) in constraints], n)
         ops = [op for (_, op, _) in constraints]
         b = [rhs for (_, _, rhs) in constraints]
+        if self.shift.any():
+            b = (np.asarray(b, dtype=np.float64) - A.matvec(self.shift)).tolist()
 
-        new_c = []
-        mapping = []
-        col_blocks = []
-        for i in range(n):
-            sign = var_signs[i] if i < len(var_signs) else ">=0"
-            if sign == ">=0":
-                mapping.append([len(new_c)])
-                new_c.append(float(c[i]))
-                col_blocks.append(("single", i, [len(new_c)-1]))
-            elif sign == "<=0":
-                mapping.append([len(new_c)])
-                new_c.append(float(-c[i]))
-                col_blocks.append(("neg", i, [len(new_c)-1]))
-            else:
-                mapping.append([len(new_c), len(new_c)+1])
-                new_c.append(float(c[i]))
-                new_c.append(float(-c[i]))
-                col_blocks.append(("free", i, [len(new_c)-2, len(new_c)-1]))
-
-        A_exp = []
-        for r in range(len(constraints)):
-            row = [0.0] * len(new_c)
-            for i in range(n):
-                a = float(A[r][i])
-                typ, _, idxs = col_blocks[i]
-                if typ == "single":
-                    row[idxs[0]] = a
-                elif typ == "neg":
-                    row[idxs[0]] = -a
-                else:
-                    row[idxs[0]] = a
-                    row[idxs[1]] = -a
-            A_exp.append(row)
-
-        constraints_exp = [(A_exp[i], ops[i], b[i]) for i in range(len(constraints))]
-        return new_c, constraints_exp, mapping
+        target = np.array([cols[0] for cols in self._map_orig_to_internal], dtype=np.intp)
+        split = np.array([len(cols) == 2 for cols in self._map_orig_to_internal], dtype=bool)
+        num_cols = len(self.free)
+        c = np.asarray(c, dtype=np.float64)
+        new_c = np.zeros(num_cols)
+        new_c[target] = c * self.sign
+        new_c[target[split] + 1] = -c[split]
+        offset = float(c @ self.shift)
+
+        # every stored entry moves to its target column; split free columns
+        # get a negated copy next to it
+        cols = A.indices
+        is_split = split[cols]
+        rows = [A.row_ids, A.row_ids[is_split]]
+        columns = [target[cols], target[cols[is_split]] + 1]
+        data = [A.data * self.sign[cols], -A.data[is_split]]
+        k = len(self.bound_rows)
+        if k:
+            rows = [np.arange(k), rows[0] + k, rows[1] + k]
+            columns.insert(0, np.array([j for j, _ in self.bound_rows], dtype=np.intp))
+            data.insert(0, np.ones(k))
+            ops = ["<="] * k + ops
+            b = [u for _, u in self.bound_rows] + b
+        A_exp = CSRMatrix.from_coo(
+            np.concatenate(rows), np.concatenate(columns), np.concatenate(data),
+            (k + len(constraints), num_cols),
+        )
+        return new_c.tolist(), A_exp, ops, b, offset
         
     def solve(self):
         """
-        Solves the LP problem using the Simplex method with Big M.
+        Solves the LP problem using the Simplex method with Big M or, with
+        method="two_phase", the two-phase method. With method="dual" the
+        all-slack basis is tried first (see warm_iterations).
         
         Returns:
             dict with 'status', 'solution', 'optimal_value'
         """
-        self.prepare_tableau()
+        self.iterations = 0
+        self.degenerate_pivots = 0
+        self.solution = None
+        self.optimal_value = None
+        self.phase = None
+        if any(lower > upper for lower, upper in self.bounds):
+            return self.finish("infeasible")
+        if self.presolve:
+            self.presolver = Presolve(self.c, self.A, self.ops, self.rhs).run()
+            if self.presolver.status is not None:
+                return self.finish(self.presolver.status)
+        with self.working_model():
+            result = self.run_solve()
+        return self.with_sensitivity(result)
+    
+    @contextmanager
+    def working_model(self):
+        """
+        Swaps in the model the engine actually works on: the presolve
+        reduction (when presolve ran), then the scaled model (with
+        scaling). The full model is put back on exit, after the solution
+        has been mapped back by extract_solution.
+        """
+        full_model = (self.c, self.A, self.ops, self.rhs, self.num_vars, self.upper, self.free)
+        try:
+            if self.presolve:
+                self.c, self.A, self.ops, self.rhs = self.presolver.reduced_model()
+                self.num_vars = len(self.c)
+                self.upper = self.upper[self.presolver.cols]
+                self.free = self.free[self.presolver.cols]
+            if self.scaling:
+                self.scaler = Scaling(self.A, self.scaling)
+                self.c, self.A, self.rhs = self.scaler.apply(self.c, self.A, self.rhs)
+                self.upper = self.upper / self.scaler.col_factors
+            yield
+        finally:
+            self.c, self.A, self.ops, self.rhs, self.num_vars, self.upper, self.free = full_model
+    
+    def run_solve(self):
+        self.begin_run()
+        status = "error"
+        try:
+            if self.presolve:
+                self.log(f"Presolve: {self.presolver.num_rows} -> {len(self.ops)} restrições, "
+                         f"{self.presolver.num_cols} -> {self.num_vars} variáveis")
+            warm_status = None
+            if self.method == "dual" and "=" not in self.ops:
+                self.prepare_warm_start(self.slack_basis())
+                warm_status = self.warm_iterations()
+            status = warm_status if warm_status is not None else self.cold_iterations()
+        finally:
+            self.end_run(status)
         
+        return self.finish(status)
+    
+    def add_observer(self, observer):
+        """
+        Registers an observers.SolverObserver (e.g. a MetricsCollector).
+        """
+        self.observers.append(observer)
+
+    def begin_run(self):
+        self.tracer.start(self)
+        for observer in self.observers:
+            observer.on_start(self)
+
+    def end_run(self, status):
+        self.tracer.finish(self, status)
+        for observer in self.observers:
+            observer.on_finish(self, status)
+
+    def notify_pivot(self, iteration, entering, leaving, objective, degenerate, times, kind):
+        """
+        Sends a PivotEvent to the observers. times are the clock readings
+        before pricing, before the ratio test and before and after the
+        update.
+        """
+        event = PivotEvent(
+            iteration, entering, leaving, objective, degenerate,
+            times[1] - times[0], times[2] - times[1], times[3] - times[2],
+            self.phase, kind,
+        )
+        for observer in self.observers:
+            observer.on_pivot(self, event)
+
+    def pivot_progress(self, previous):
+        """
+        Objective value after a pivot and whether the pivot was degenerate
+        (objective unchanged), counting it in degenerate_pivots.
+        """
+        objective = self.objective_value()
+        degenerate = abs(objective - previous) <= 1e-12 * (1.0 + abs(objective))
+        self.degenerate_pivots += degenerate
+        return objective, degenerate
+
+    def iteration_limit(self):
+        """
+        Pivots allowed per simplex loop: max_iterations when given,
+        otherwise 10 per row and column of the problem (at least 1000).
+        """
+        if self.max_iterations is not None:
+            return self.max_iterations
+        return max(1000, 10 * (len(self.ops) + self.num_columns()))
+
+    def limit_reached(self, limit):
+        self.log(f"Limite de {limit} iterações atingido "
+                 f"({self.degenerate_pivots} pivôs degenerados)")
+        return "max_iterations_reached"
+
+    def stall_limit(self):
+        """
+        Degenerate pivots in a row after which the primal simplex is
+        considered stalled.
+        """
+        return max(10, min(100, len(self.ops)))
+
+    def break_stall(self):
+        """
+        Called when the primal simplex stalls. With anti_cycling "perturb"
+        the first stall perturbs the basic values (perturb) so ratio test
+        ties are broken, when the basis can be rebuilt afterwards; any other
+        stall switches the pricing to Bland's rule, which cannot cycle, for
+        the rest of the loop.
+        """
+        if self.anti_cycling == "perturb" and not self.perturbed and self.can_perturb():
+            self.perturb()
+            self.perturbed = True
+            self.log("Estagnação: RHS perturbado")
+        elif not isinstance(self.pricing, BlandPricing):
+            self.pricing = BlandPricing()
+            self.pricing.reset(self)
+            self.log("Estagnação: regra de Bland")
+
+    def perturbation(self, values, head):
+        """
+        Small random increases of the basic values (relative 1e-7, kept
+        below half of the room to an upper bound; free basics unchanged).
+        """
+        upper, free = self.column_bounds()
+        rng = np.random.default_rng(len(values))
+        delta = 1e-7 * (1.0 + np.abs(values)) * rng.uniform(0.5, 1.0, len(values))
+        delta = np.minimum(delta, 0.5 * np.maximum(upper[head] - values, 0.0))
+        delta[free[head]] = 0.0
+        return delta
+
+    def can_perturb(self):
+        """
+        The perturbation is removed by rebuilding the tableau of the final
+        basis from the real RHS, so it needs the warm start layout: no
+        artificial columns and no dropped rows.
+        """
+        head = self.tableau_obj.basis.head
+        return not self.artificial_indices and len(head) == len(self.ops) and (head >= 0).all()
+
+    def perturb(self):
+        self.tableau_obj.shift_rhs(self.perturbation(self.basic_values(), self.tableau_obj.basis.head))
+
+    def reload_rhs(self):
+        """
+        Puts the unperturbed basic values back (same basis).
+        """
+        self.prepare_warm_start(self.tableau_obj.basis.head.copy(), self.flipped.copy())
+
+    def remove_perturbation(self, status):
+        """
+        Ends a perturbed loop: the basic values are recomputed from the real
+        RHS. The basis stays dual feasible, so an optimal basis that is no
+        longer primal feasible is repaired with the dual simplex.
+        """
+        self.perturbed = False
+        self.reload_rhs()
+        if status != "optimal" or self.primal_feasible():
+            return status
+        self.log("Perturbação removida: simplex dual")
+        return self.dual_simplex_iterations()
+
+    def cold_iterations(self):
+        """
+        Builds the slack/artificial starting basis and runs Big M or both
+        phases of the two-phase method.
+        """
+        self.prepare_tableau()
+        if self.method == "big_m" or not self.artificial_indices:
+            return self.simplex_iterations()
+
+        self.phase = 1
+        self.log("Fase 1")
         status = self.simplex_iterations()
-        
+        if status == "optimal":
+            self.end_phase_one()
+            self.phase = 2
+            self.log("Fase 2")
+            status = self.simplex_iterations()
+        return status
+    
+    def finish(self, status):
+        self.status = status
+        self.data_changed = False
         if status == "optimal":
             self.extract_solution()
+            self.final_basis = self.saved_basis()
+            self.final_flipped = self.flipped.copy()
+        else:
+            self.final_basis = None
+            self.internal_solution = None
             
         return {
             "status": status,
@@ -99,33 +504,828 @@ class Simplex:
             "optimal_value": self.optimal_value
         }
     
-    def prepare_tableau(self):
+    def resolve(self):
         """
-        Prepares the initial tableau:
-        - Processes constraints
-        - Identifies which need slack/artificial variables
-        - Creates the tableau using the Tableau class
+        Re-optimizes after update_rhs / update_objective starting from the
+        final basis of the previous solve: primal simplex if that basis is
+        still primal feasible, dual simplex if it is still dual feasible.
+        Falls back to a full solve() when there is no usable basis or
+        neither holds.
+        
+        Returns:
+            same dict as solve()
+        """
+        if self.final_basis is None:
+            return self.solve()
+        
+        basis_columns = self.final_basis
+        self.iterations = 0
+        self.degenerate_pivots = 0
+        self.solution = None
+        self.optimal_value = None
+        self.phase = None
+        with self.working_model():
+            self.begin_run()
+            status = "error"
+            try:
+                self.prepare_warm_start(basis_columns, self.final_flipped)
+                status = self.warm_iterations()
+            finally:
+                self.end_run(status)
+            result = None if status is None else self.finish(status)
+        if result is None:
+            return self.solve()
+        return self.with_sensitivity(result)
+    
+    def warm_iterations(self):
         """
-        A = []  
-        b = []  
+        Optimizes from the basis already loaded: primal simplex if it is
+        primal feasible, dual simplex if it is dual feasible, None if it is
+        neither.
+        """
+        if self.primal_feasible():
+            return self.simplex_iterations()
+        if self.dual_feasible():
+            return self.dual_simplex_iterations()
+        return None
+
+    def primal_feasible(self, tol=1e-9):
+        values = self.basic_values()
+        if not self.bounded:
+            return bool((values >= -tol).all())
+        upper, free = self.column_bounds()
+        head = self.tableau_obj.basis.head
+        return bool((free[head] | ((values >= -tol) & (values <= upper[head] + tol))).all())
+
+    def dual_feasible(self, tol=1e-9):
+        d = self.reduced_costs()
+        if not self.bounded:
+            return bool((d >= -tol).all())
+        _, free = self.column_bounds()
+        # a free nonbasic column must have a zero reduced cost
+        return bool(((d >= -tol) & (~free | (d <= tol))).all())
+    
+    def add_constraint(self, coeffs, op, rhs):
+        """
+        Appends the constraint coeffs op rhs ("<=" or ">=") to the model and
+        re-optimizes. After an optimal solve the new row enters the final
+        tableau with its slack basic, which keeps the basis dual feasible,
+        so only dual simplex pivots are needed; otherwise the model is
+        solved from scratch.
+        
+        Args:
+            coeffs: dense list or sparse dict {variable_index: coeff} over
+                the original variables
+        
+        Returns:
+            same dict as solve()
+        """
+        if op not in ("<=", ">="):
+            raise ValueError("add_constraint supports only '<=' and '>=' rows.")
+        basis_columns = self.final_basis
+        self.original_constraints.append((coeffs, op, rhs))
+        _, self.A, self.ops, self.rhs, _ = self.expand_variables(
+            [0.0] * self.orig_num_vars, self.original_constraints
+        )
+        if basis_columns is None:
+            return self.solve()
+        if self.data_changed or self.scaling:
+            # the tableau does not reflect update_rhs / update_objective yet,
+            # or its rows are scaled with factors computed without the new row
+            self.final_basis = np.append(basis_columns, self.slack_basis()[-1])
+            return self.resolve()
+        
+        self.iterations = 0
+        self.degenerate_pivots = 0
+        self.solution = None
+        self.optimal_value = None
+        self.phase = None
+        self.begin_run()
+        status = "error"
+        try:
+            cols, vals = self.A.row(self.A.shape[0] - 1)
+            rhs = float(self.rhs[-1])
+            if self.bounded:
+                # the row over the complemented columns of the final tableau
+                flipped = self.flipped[cols]
+                rhs -= float(vals[flipped] @ self.flip_values()[cols[flipped]])
+                vals = np.where(flipped, -vals, vals)
+            self.add_basic_row(basis_columns, cols, vals, 1.0 if op == "<=" else -1.0, rhs)
+            status = self.dual_simplex_iterations()
+        finally:
+            self.end_run(status)
+        
+        return self.with_sensitivity(self.finish(status))
+    
+    def add_basic_row(self, basis_columns, cols, vals, slack_coef, rhs):
+        """
+        Adds the last row of self.A to the current (optimal) tableau with
+        its slack basic. The slack goes after the existing ones, shifting
+        the artificial columns that Big M leaves in the tableau.
+        """
+        self.tableau_obj.add_row(cols, vals, slack_coef, rhs)
+        self.artificial_indices = [j + 1 for j in self.artificial_indices]
+    
+    def update_rhs(self, rhs):
+        """
+        Replaces the right-hand side of every constraint (same order as the
+        constraints given to the constructor). Call resolve() afterwards.
+        """
+        if len(rhs) != len(self.original_constraints):
+            raise ValueError("update_rhs needs one value per constraint.")
+        self.original_constraints = [
+            (coeffs, op, value) for (coeffs, op, _), value in zip(self.original_constraints, rhs)
+        ]
+        _, _, _, self.rhs, _ = self.expand_variables(
+            [0.0] * self.orig_num_vars, self.original_constraints
+        )
+        self.data_changed = True
+    
+    def update_objective(self, objective_coeffs):
+        """
+        Replaces the objective coefficients (original variables, same sense).
+        Call resolve() afterwards.
+        """
+        if len(objective_coeffs) != self.orig_num_vars:
+            raise ValueError("update_objective needs one coefficient per variable.")
+        self.original_objective = list(objective_coeffs)
+        new_c, _, _, _, self.offset = self.expand_variables(objective_coeffs, [])
+        self.c = [-x for x in new_c] if self.is_minimization else new_c
+        self.data_changed = True
+
+    def update_bounds(self, bounds):
+        """
+        Replaces the bounds of the variables, (lower, upper) per original
+        variable (None for no bound). Call resolve() afterwards.
+
+        With native bounds every variable keeps its column, so the final
+        basis stays a valid warm start: after a bound change (a branch and
+        bound child) it is usually still dual feasible and resolve() only
+        needs a few dual simplex pivots. When the column or row layout
+        changes (bound rows, split free variables) or bounds cross,
+        resolve() starts over.
+        """
+        layout = (self._map_orig_to_internal, [j for j, _ in self.bound_rows])
+        self.bounds = self.variable_bounds(self.var_signs, bounds)
+        self.internal_columns()
+        new_c, self.A, self.ops, self.rhs, self.offset = self.expand_variables(
+            self.original_objective, self.original_constraints
+        )
+        self.c = [-x for x in new_c] if self.is_minimization else new_c
+        self.num_vars = len(self.c)
+        self.bounded = bool(np.isfinite(self.upper).any() or self.free.any())
+        self.flipped = np.zeros(self.num_vars, dtype=bool)
+        crossed = any(lower > upper for lower, upper in self.bounds)
+        if crossed or (self._map_orig_to_internal, [j for j, _ in self.bound_rows]) != layout:
+            self.final_basis = None
+            self.final_flipped = None
+        elif self.final_flipped is not None:
+            # only columns with an upper bound (or free) can stay complemented
+            self.final_flipped = self.final_flipped & (np.isfinite(self.upper) | self.free)
+        self.data_changed = True
+
+    # --- many right-hand sides and parametric analysis -------------------
+
+    def solve_many(self, rhs_list):
+        """
+        Solves the model for every right-hand side in rhs_list (one value
+        per constraint each; A and c stay the same). The first scenario is
+        solved as usual (warm when there is a final basis); its optimal
+        basis is factorized once and the basic values of all the other
+        scenarios come from a single product B^-1 R. Where that basis stays
+        primal feasible it is optimal (the reduced costs do not depend on
+        b) and no pivot is made; the other scenarios are repaired with the
+        dual simplex from it. While there is no optimal basis (presolve,
+        infeasible or unbounded scenarios) each scenario is solved in turn.
+
+        Afterwards the engine holds the scenario whose basis was used (the
+        last one solved if none was optimal), and iterations and
+        degenerate_pivots the totals over all scenarios.
+
+        Returns:
+            list of dicts as solve(), in the order of rhs_list
+        """
+        results = []
+        iterations = degenerate = 0
+        for rhs in rhs_list:
+            self.update_rhs(rhs)
+            results.append(self.resolve())
+            iterations += self.iterations
+            degenerate += self.degenerate_pivots
+            if self.final_basis is not None:
+                break
+
+        rest = rhs_list[len(results):]
+        if rest:
+            reference = rhs_list[len(results) - 1]
+            basis, flipped = self.final_basis, self.final_flipped
+            state = (self.status, self.solution, self.optimal_value, self.internal_solution)
+            repaired = False
+            for rhs, result in zip(rest, self.basis_scenarios(rest)):
+                if result is None:
+                    self.load_basis(basis, flipped)
+                    self.update_rhs(rhs)
+                    result = self.resolve()
+                    iterations += self.iterations
+                    degenerate += self.degenerate_pivots
+                    repaired = True
+                results.append(result)
+            if repaired:
+                self.update_rhs(reference)
+                self.load_basis(basis, flipped)
+            self.status, self.solution, self.optimal_value, self.internal_solution = state
+        self.iterations = iterations
+        self.degenerate_pivots = degenerate
+        return results
+
+    def basis_scenarios(self, rhs_list):
+        """
+        The solution given by the final basis for each right-hand side in
+        rhs_list, or None where that basis is not primal feasible.
+        """
+        with self.working_model():
+            head = np.asarray(self.final_basis)
+            X = self.basis_inverse() @ self.scenario_rhs(rhs_list)
+            structural = head < self.num_vars
+            upper = np.full(len(head), INF)
+            upper[structural] = self.upper[head[structural]]
+            free = np.zeros(len(head), dtype=bool)
+            free[structural] = self.free[head[structural]]
+            feasible = (((X >= -1e-9) | free[:, None]) & (X <= upper[:, None] + 1e-9)).all(axis=0)
+
+            costs = np.asarray(self.c, dtype=np.float64)
+            at_bound = self.nonbasic_at_upper()
+            results = []
+            for k in range(X.shape[1]):
+                if not feasible[k]:
+                    results.append(None)
+                    continue
+                internal = at_bound.copy()
+                internal[head[structural]] = X[structural, k]
+                self.set_solution(internal.tolist(), float(costs @ internal))
+                results.append({
+                    "status": "optimal",
+                    "solution": self.solution,
+                    "optimal_value": self.optimal_value,
+                })
+        return results
+
+    def nonbasic_at_upper(self):
+        """
+        Values of the structural columns that the final basis keeps at their
+        upper bound (complemented and nonbasic), zero elsewhere.
+        """
+        values = np.zeros(self.num_vars)
+        if self.final_flipped is None:
+            return values
+        at_upper = self.final_flipped.copy()
+        head = np.asarray(self.final_basis)
+        at_upper[head[head < self.num_vars]] = False
+        values[at_upper] = self.flip_values()[at_upper]
+        return values
+
+    def warm_columns(self, columns):
+        """
+        Dense matrix of the given columns of the warm start layout of the
+        working model (structural columns, then one slack per inequality).
+        """
+        _, _, slack_indices, slack_types = self.warm_standard_form()
+        csc = self.A.tocsc()
+        M = np.zeros((len(self.ops), len(columns)))
+        for k, j in enumerate(np.asarray(columns).tolist()):
+            if j < self.num_vars:
+                M[:, k] = csc.column(j)
+            else:
+                row = slack_indices[j - self.num_vars]
+                M[row, k] = slack_types[row]
+        return M
+
+    def basis_inverse(self):
+        return LUFactorization(self.warm_columns(self.final_basis)).ftran_many(
+            np.eye(len(self.final_basis))
+        )
+
+    def scenario_rhs(self, rhs_list):
+        """
+        Working model right-hand sides of rhs_list (given over the original
+        constraints) as the columns of a matrix, with the bound shifts, bound
+        rows, scaling and the nonbasic columns at their upper bound applied.
+        """
+        R = np.asarray(rhs_list, dtype=np.float64).reshape(len(rhs_list), -1).T
+        if R.shape[0] != len(self.original_constraints):
+            raise ValueError("Every right-hand side needs one value per constraint.")
+        if self.shift.any():
+            A = CSRMatrix.from_rows([coeffs for coeffs, _, _ in self.original_constraints],
+                                    self.orig_num_vars)
+            R = R - A.matvec(self.shift)[:, None]
+        if self.bound_rows:
+            bound_values = np.array([u for _, u in self.bound_rows], dtype=np.float64)
+            R = np.vstack([np.repeat(bound_values[:, None], R.shape[1], axis=1), R])
+        if self.scaling:
+            R = R * self.scaler.row_factors[:, None]
+        return R - self.A.matvec(self.nonbasic_at_upper())[:, None]
+
+    def optimal_basis(self):
+        """
+        Re-optimizes when the model changed (or was never solved) and
+        checks that there is a final basis to analyse.
+        """
+        if self.final_basis is None or self.data_changed:
+            self.resolve()
+        if self.final_basis is None:
+            raise ValueError(f"Ranging needs an optimal basis (status: {self.status}; "
+                             "no basis is kept with presolve).")
+
+    def current_rhs(self):
+        return [rhs for _, _, rhs in self.original_constraints]
+
+    def rhs_ranging(self, direction):
+        """
+        Interval (low, high) of theta for which the optimal basis stays
+        optimal when the right-hand side becomes b + theta * direction (one
+        value per constraint). Inside it the solution moves linearly and no
+        pivot is needed.
+        """
+        self.optimal_basis()
+        b = np.asarray(self.current_rhs(), dtype=np.float64)
+        with self.working_model():
+            head = np.asarray(self.final_basis)
+            B_inv = self.basis_inverse()
+            R = self.scenario_rhs([b, b + np.asarray(direction, dtype=np.float64)])
+            x_B = B_inv @ R[:, 0]
+            steps = B_inv @ (R[:, 1] - R[:, 0])
+            structural = head < self.num_vars
+            lower = np.zeros(len(head))
+            lower[structural] = np.where(self.free[head[structural]], -INF, 0.0)
+            upper = np.full(len(head), INF)
+            upper[structural] = self.upper[head[structural]]
+        return theta_interval(x_B, steps, lower, upper)
+
+    def objective_ranging(self, direction):
+        """
+        Interval (low, high) of theta for which the optimal basis stays
+        optimal when the objective becomes c + theta * direction (over the
+        original variables, same sense). Inside it the solution does not
+        change.
+        """
+        self.optimal_basis()
+        e, _, _, _, _ = self.expand_variables(direction, [])
+        e = np.asarray(e, dtype=np.float64)
+        if self.is_minimization:
+            e = -e
+        with self.working_model():
+            if self.scaling:
+                e = e * self.scaler.col_factors
+            head = np.asarray(self.final_basis)
+            factor = LUFactorization(self.warm_columns(head))
+            _, _, slack_indices, slack_types = self.warm_standard_form()
+            slack_signs = np.array([slack_types[i] for i in slack_indices])
+
+            def reduced_costs(costs):
+                full = np.concatenate([costs, np.zeros(len(slack_indices))])
+                y = factor.btran(full[head])
+                d = np.concatenate([self.A.rmatvec(y), slack_signs * y[slack_indices]]) - full
+                d[head] = 0.0
+                return d
+
+            d = reduced_costs(np.asarray(self.c, dtype=np.float64))
+            steps = reduced_costs(e)
+            extra = len(slack_indices)
+            at_upper = np.concatenate([self.final_flipped, np.zeros(extra, dtype=bool)])
+            at_upper[head] = False
+            free = np.concatenate([self.free, np.zeros(extra, dtype=bool)])
+            free[head] = False
+        # nonbasic at lower bound: d_j >= 0, at upper bound: d_j <= 0, free: d_j = 0
+        sign = np.where(at_upper, -1.0, 1.0)
+        upper = np.where(free, 0.0, INF)
+        return theta_interval(sign * d, sign * steps, np.zeros(len(d)), upper)
+
+    def with_sensitivity(self, result):
+        """
+        Adds the "sensitivity" entry to a solve() result when the engine was
+        created with sensitivity=True (None unless the result is optimal
+        with a final basis).
+        """
+        if not self.sensitivity:
+            return result
+        self.sensitivity_report = None
+        if result["status"] == "optimal":
+            if self.final_basis is None:
+                self.log("Sensibilidade indisponível: sem base final")
+            else:
+                self.sensitivity_report = self.sensitivity_analysis()
+        result["sensitivity"] = self.sensitivity_report
+        return result
+
+    def sensitivity_analysis(self):
+        """
+        Dual values, reduced costs, slacks and RHS / objective ranging of the
+        optimal basis, all from one factorization of it (the final tableau
+        B^-1 A is formed once and every ranging interval comes from the
+        same vectorized ratio test). Values are in terms of the original
+        variables, constraints and objective sense:
+
+            duals          d(optimal value) / d(rhs) of every constraint
+            reduced_costs  c_j - duals . A_j of every variable
+            slacks         rhs - lhs of "<=" rows, lhs - rhs of the others
+            rhs_ranges     (low, high) of every rhs with the basis optimal
+            cost_ranges    (low, high) of every objective coefficient with
+                           the solution optimal
+
+        Returns:
+            dict with those lists, ranges as tuples (inf when unbounded)
+        """
+        self.optimal_basis()
+        b = np.asarray(self.current_rhs(), dtype=np.float64)
+        c = np.asarray(self.original_objective, dtype=np.float64)
+        A = CSRMatrix.from_rows([coeffs for coeffs, _, _ in self.original_constraints],
+                                self.orig_num_vars)
+        sense = -1.0 if self.is_minimization else 1.0
+        target = np.array([cols[0] for cols in self._map_orig_to_internal], dtype=np.intp)
+        split = np.array([len(cols) == 2 for cols in self._map_orig_to_internal], dtype=bool)
+
+        with self.working_model():
+            n = self.num_vars
+            k = len(self.bound_rows)
+            head = np.asarray(self.final_basis)
+            B_inv = self.basis_inverse()
+            W = self.warm_columns(np.arange(n + sum(op != "=" for op in self.ops)))
+            T = B_inv @ W
+            costs = np.concatenate([np.asarray(self.c, dtype=np.float64), np.zeros(W.shape[1] - n)])
+            y = costs[head] @ B_inv
+            d = y @ W - costs
+            d[head] = 0.0
+            x_B = B_inv @ self.scenario_rhs([b])[:, 0]
+            row_factors = self.scaler.row_factors if self.scaling else np.ones(len(self.ops))
+            col_factors = self.scaler.col_factors if self.scaling else np.ones(n)
+
+            # rhs ranging: one unit of an original rhs is row_factor units of
+            # its working row
+            structural = head < n
+            lower = np.zeros(len(head))
+            lower[structural] = np.where(self.free[head[structural]], -INF, 0.0)
+            upper = np.full(len(head), INF)
+            upper[structural] = self.upper[head[structural]]
+            rows = np.arange(k, len(self.ops))
+            rhs_low, rhs_high = theta_intervals(x_B, B_inv[:, rows] * row_factors[rows],
+                                                lower, upper)
+
+            # cost ranging: column i of E is the change of the working costs
+            # per unit of the original coefficient of variable i
+            E = np.zeros((W.shape[1], self.orig_num_vars))
+            variables = np.arange(self.orig_num_vars)
+            E[target, variables] = sense * self.sign * col_factors[target]
+            E[target[split] + 1, variables[split]] = -sense * col_factors[target[split] + 1]
+            steps = T.T @ E[head] - E
+            steps[head] = 0.0
+            extra = W.shape[1] - n
+            at_upper = np.concatenate([self.final_flipped, np.zeros(extra, dtype=bool)])
+            at_upper[head] = False
+            free = np.concatenate([self.free, np.zeros(extra, dtype=bool)])
+            free[head] = False
+            flip = np.where(at_upper, -1.0, 1.0)
+            cost_low, cost_high = theta_intervals(flip * d, flip[:, None] * steps,
+                                                  np.zeros(len(d)), np.where(free, 0.0, INF))
+
+            # unscaled internal duals and reduced costs; the reduced costs
+            # leave out the bound rows, which are not constraints of the model
+            y = y * row_factors
+            d = d[:n] / col_factors
+            for t, (j, _) in enumerate(self.bound_rows):
+                d[j] -= y[t]
+
+        # + 0.0 turns the -0.0 of the sign changes into 0.0
+        duals = sense * y[k:] + 0.0
+        lhs = A.matvec(np.asarray(self.solution, dtype=np.float64))
+        ops = np.array([op for _, op, _ in self.original_constraints])
+        return {
+            "duals": duals.tolist(),
+            "reduced_costs": (-sense * self.sign * d[target] + 0.0).tolist(),
+            "slacks": np.where(ops == "<=", b - lhs, lhs - b).tolist(),
+            "rhs_ranges": list(zip((b + rhs_low).tolist(), (b + rhs_high).tolist())),
+            "cost_ranges": list(zip((c + cost_low).tolist(), (c + cost_high).tolist())),
+        }
+
+    def parametric_rhs(self, direction, thetas):
+        """
+        Solves for b + theta * direction at every theta in thetas (see
+        solve_many), b being the current right-hand side. The engine is
+        left with b (re-optimized on the next resolve).
+
+        Returns:
+            list of dicts as solve(), one per theta
+        """
+        b = np.asarray(self.current_rhs(), dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        results = self.solve_many([(b + theta * direction).tolist() for theta in thetas])
+        self.update_rhs(b.tolist())
+        return results
+
+    def parametric_objective(self, direction, thetas):
+        """
+        Solves for c + theta * direction at every theta in thetas, c being
+        the current objective. Inside objective_ranging the optimal solution
+        is the current one and only the value is computed; elsewhere the
+        primal simplex re-optimizes from the current basis (it stays primal
+        feasible). The engine is left with the current objective.
+
+        Returns:
+            list of dicts as solve(), one per theta
+        """
+        low, high = self.objective_ranging(direction)
+        c = np.asarray(self.original_objective, dtype=np.float64)
+        direction = np.asarray(direction, dtype=np.float64)
+        x = list(self.solution)
+        basis, flipped = self.final_basis, self.final_flipped
+        state = (self.status, self.solution, self.optimal_value, self.internal_solution)
+        results = []
+        changed = False
+        for theta in thetas:
+            coeffs = c + theta * direction
+            if low <= theta <= high:
+                results.append({"status": "optimal", "solution": list(x),
+                                "optimal_value": float(coeffs @ np.asarray(x))})
+                continue
+            self.load_basis(basis, flipped)
+            self.update_objective(coeffs.tolist())
+            results.append(self.resolve())
+            changed = True
+        if changed:
+            self.update_objective(c.tolist())
+            self.load_basis(basis, flipped)
+            self.status, self.solution, self.optimal_value, self.internal_solution = state
+        return results
+
+    def saved_basis(self):
+        """
+        Final basis as columns of the warm start layout (structural columns,
+        then one slack per inequality row), or None if it cannot be reused
+        (artificial still basic or redundant rows dropped).
+        """
+        if self.presolve:
+            return None
+        basis = self.tableau_obj.basis
+        if len(basis) != len(self.ops):
+            return None
+        if (basis.head < 0).any() or (basis.kind[basis.head] == ARTIFICIAL).any():
+            return None
+        return basis.head.copy()
+
+    def load_basis(self, basis, flipped=None):
+        """
+        Takes a final basis saved elsewhere (final_basis / final_flipped of
+        an engine of the same class on the same model, e.g. from
+        cache.SolveCache) so the next resolve() starts from it.
+        """
+        self.final_basis = np.asarray(basis, dtype=np.intp)
+        self.final_flipped = (np.zeros(self.num_vars, dtype=bool) if flipped is None
+                              else np.asarray(flipped, dtype=bool))
+
+    def warm_standard_form(self):
+        """
+        Constraint rows as given (no RHS flipping), one slack per inequality
+        row: +1 for <= and -1 for >=. No artificial variables.
+
+        Returns:
+            (A, b, slack_indices, slack_types)
+        """
+        slack_indices = [i for i, op in enumerate(self.ops) if op != "="]
+        slack_types = {i: (1.0 if self.ops[i] == "<=" else -1.0) for i in slack_indices}
+        return self.A, [float(x) for x in self.rhs], slack_indices, slack_types
+    
+    def slack_basis(self):
+        """
+        Warm start basis made of the slack of every row (only complete when
+        there are no equality rows).
+        """
+        num_slack = sum(op != "=" for op in self.ops)
+        return np.arange(self.num_vars, self.num_vars + num_slack)
+    
+    def prepare_warm_start(self, basis_columns, flipped=None):
+        """
+        Builds the warm start tableau for basis_columns; flipped marks the
+        columns that were complemented (at their upper bound) in that basis.
+        """
+        A, b, slack_indices, slack_types = self.warm_standard_form()
+        self.tableau_obj = TABLEAU_BACKENDS[self.backend](A, b, self.c)
+        self.tableau_obj.build_tableau(
+            slack_indices=slack_indices,
+            slack_types=slack_types
+        )
+        self.tableau_obj.load_basis(basis_columns)
+        self.artificial_indices = []
+        self.flipped = np.zeros(self.num_vars, dtype=bool)
+        if self.bounded and flipped is not None:
+            for j in np.flatnonzero(flipped).tolist():
+                self.complement(j)
+    
+    def dual_simplex_iterations(self):
+        """
+        Dual simplex: keeps the reduced costs non-negative and removes
+        negative basic values. The leaving row is the most negative one and
+        the entering column comes from the dual ratio test.
+        
+        Returns:
+            "optimal" or "infeasible"
+        """
+        limit = self.iteration_limit()
+        iteration = 0
+        tracer = self.tracer
+        observing = bool(self.observers)
+        clock = time.perf_counter if observing else no_clock
+        objective = self.objective_value()
+
+        if tracer.enabled:
+            tracer.iteration(self, 0)
+
+        while iteration < limit:
+            iteration += 1
+
+            t0 = clock()
+            values = self.basic_values()
+            if len(values) == 0:
+                return "optimal"
+            if self.bounded:
+                pivot_row = self.dual_leaving_row(values)
+                if pivot_row is None:
+                    return "optimal"
+            else:
+                pivot_row = int(np.argmin(values))
+                if values[pivot_row] >= -1e-10:
+                    return "optimal"
+
+            t1 = clock()
+            pivot_col = self.find_dual_pivot_column(pivot_row)
+            if pivot_col is None:
+                # the row cannot be made feasible: the primal has no solution
+                return "infeasible"
+
+            t2 = clock()
+            leaving = self.pivot(pivot_row, pivot_col)
+            self.iterations += 1
+            objective, degenerate = self.pivot_progress(objective)
+
+            if observing:
+                self.notify_pivot(iteration, pivot_col, leaving, objective, degenerate,
+                                  (t0, t1, t2, clock()), "dual")
+
+            if tracer.enabled:
+                tracer.iteration(self, iteration, pivot_col, leaving)
+
+        return self.limit_reached(limit)
+    
+    def find_dual_pivot_column(self, pivot_row):
+        """
+        Dual ratio test: among the negative entries of the pivot row, the
+        column with the smallest d_j / |a_rj|. Returns None if there is none.
+        """
+        row = self.pivot_row_values(pivot_row)
+        if self.bounded:
+            # free columns (zero reduced cost) can move either way: orient
+            # them so they are candidates
+            nonbasic = ~self.tableau_obj.basis.basic_mask()[:self.num_vars]
+            for j in np.flatnonzero(self.free & nonbasic & (row[:self.num_vars] > 1e-10)).tolist():
+                self.complement(j)
+            row = self.pivot_row_values(pivot_row)
+        candidates = np.flatnonzero((row < -1e-10) & (self.column_kinds() != ARTIFICIAL))
+        if len(candidates) == 0:
+            return None
+        d = np.maximum(self.reduced_costs()[candidates], 0.0)
+        ratios = d / -row[candidates]
+        ties = candidates[ratios - ratios.min() < 1e-10]
+        # prefer the largest pivot among ties for stability
+        return int(ties[np.argmax(-row[ties])])
+    
+    def dual_leaving_row(self, values):
+        """
+        Dual simplex leaving row with bounds: the largest violation of
+        0 <= x_B <= u_B (free basics never leave). A basic above its upper
+        bound is complemented first, so it too leaves at zero. None when
+        the basis is primal feasible.
+        """
+        upper, free = self.column_bounds()
+        head = self.tableau_obj.basis.head
+        infeasibility = np.maximum(-values, values - upper[head])
+        infeasibility[free[head]] = 0.0
+        pivot_row = int(np.argmax(infeasibility))
+        if infeasibility[pivot_row] <= 1e-10:
+            return None
+        if values[pivot_row] > 0:
+            self.complement(int(head[pivot_row]))
+        return pivot_row
+
+    # --- bounded-variable simplex ----------------------------------------
+
+    def column_bounds(self):
+        """
+        Upper bound and free flag of every tableau column (slack and
+        artificial columns are [0, inf)).
+        """
+        extra = self.num_columns() - self.num_vars
+        upper = np.concatenate([self.upper, np.full(extra, INF)])
+        free = np.concatenate([self.free, np.zeros(extra, dtype=bool)])
+        return upper, free
+
+    def flip_values(self):
+        """
+        u_j of every structural column, 0 for the ones without an upper
+        bound (complementing those is x_j = -x_j').
+        """
+        return np.where(np.isfinite(self.upper), self.upper, 0.0)
+
+    def complement(self, j):
+        """
+        Substitutes x_j = u_j - x_j' (x_j = -x_j' when there is no upper
+        bound), so a column at its upper bound is nonbasic at zero again.
+        Complementing twice restores the column.
+        """
+        value = float(self.flip_values()[j])
+        row = int(self.tableau_obj.basis.row_of[j])
+        if row >= 0:
+            self.tableau_obj.complement_row(row, j, value)
+        else:
+            self.tableau_obj.complement_column(j, value)
+        self.flipped[j] = not self.flipped[j]
+
+    def orient_free_columns(self):
+        """
+        A nonbasic free column improves the objective in either direction;
+        one with a positive reduced cost is complemented so that the pricing
+        rules see it as improving.
+        """
+        d = self.reduced_costs()[:self.num_vars]
+        nonbasic = ~self.tableau_obj.basis.basic_mask()[:self.num_vars]
+        for j in np.flatnonzero(self.free & nonbasic & (d > 1e-10)).tolist():
+            self.complement(j)
+
+    def bounded_ratio_test(self, pivot_col):
+        """
+        Ratio test with upper bounds: the step stops when a basic variable
+        drops to zero, a basic variable rises to its upper bound or the
+        entering column reaches its own upper bound (bound flip). Free basic
+        variables never block.
+
+        Returns:
+            (row, to_upper), row -1 for a bound flip and to_upper telling
+            whether the leaving variable stops at its upper bound, or None
+            when nothing blocks (unbounded)
+        """
+        alpha = self.tableau_obj.column_values(pivot_col)
+        values = self.basic_values()
+        upper, free = self.column_bounds()
+        head = self.tableau_obj.basis.head
+        blocking = ~free[head]
+        down = blocking & (alpha > 1e-10)
+        up = blocking & (alpha < -1e-10) & np.isfinite(upper[head])
+
+        ratios = np.full(len(alpha), np.inf)
+        np.divide(np.maximum(values, 0.0), alpha, out=ratios, where=down)
+        np.divide(np.maximum(upper[head] - values, 0.0), -alpha, out=ratios, where=up)
+        step = ratios.min() if len(ratios) else np.inf
+        if upper[pivot_col] <= step:
+            return None if upper[pivot_col] == INF else (-1, False)
+
+        ties = np.flatnonzero((down | up) & (ratios - step < 1e-10))
+        if self.pricing.lowest_index_ties:
+            row = int(ties[np.argmin(head[ties])])
+        else:
+            row = int(ties[0])
+        return row, bool(up[row])
+
+    def basic_values(self):
+        return self.tableau_obj.basic_values()
+    
+    def column_kinds(self):
+        return self.tableau_obj.basis.kind
+    
+    def standard_form(self):
+        """
+        Flips rows with negative RHS and decides which rows get slack and
+        artificial variables.
+
+        Returns:
+            (A, b, slack_indices, slack_types, artificial_indices)
+        """
+        b = []
+        row_signs = []
         slack_indices = []
         artificial_indices = []
         slack_types = {} 
         
-        for i, (coeffs, op, rhs) in enumerate(self.constraints):
-            coeffs = [float(x) for x in coeffs]
+        for i, (op, rhs) in enumerate(zip(self.ops, self.rhs)):
             rhs = float(rhs)
             
             # if RHS is negative we multiply by -1 and invert the operator
             if rhs < 0:
-                coeffs = [-x for x in coeffs]
+                row_signs.append(-1.0)
                 rhs = -rhs
                 if op == "<=":
                     op = ">="
                 elif op == ">=":
                     op = "<="
+            else:
+                row_signs.append(1.0)
             
-            A.append(coeffs)
             b.append(rhs)
             
             if op == "<=":
@@ -143,157 +1343,393 @@ class Simplex:
                 # add only an artificial variable
                 artificial_indices.append(i)
         
-        self.tableau_obj = Tableau(A, b, self.c)
+        return self.A.scale_rows(row_signs), b, slack_indices, slack_types, artificial_indices
+    
+    def crash_basis(self, A, b, artificial_rows):
+        """
+        Lower-triangular crash for the rows of the standard form that would
+        get an artificial. The artificial rows are visited sparsest first;
+        row i takes a structural column j that is nonzero in i and zero in
+        every row already taken, so the crash columns form a triangular
+        (nonsingular) block and x_j = r_i / a_ij, r being b minus what the
+        earlier picks use. A column is only taken when x_j respects its
+        bounds, a_ij is not small next to the rest of the column and the
+        slacks and remaining artificials of the rows it touches stay
+        nonnegative. Among the candidates of a row the one touching the
+        fewest open artificial rows wins, then the best objective gain.
+
+        Returns:
+            {row: column} of the structural columns to make basic
+        """
+        m, n = A.shape
+        if not artificial_rows or n == 0:
+            return {}
+        open_rows = np.zeros(m, dtype=bool)
+        open_rows[artificial_rows] = True
+        taken = np.zeros(m, dtype=bool)
+        used = np.zeros(n, dtype=bool)
+        csc = A.tocsc()
+        largest = np.zeros(n)
+        np.maximum.at(largest, A.indices, np.abs(A.data))
+        costs = np.asarray(self.c, dtype=np.float64)
+        # value of the basic slack / artificial of every row
+        r = np.asarray(b, dtype=np.float64).copy()
+
+        crash = {}
+        row_nnz = np.diff(A.indptr)
+        for i in sorted(artificial_rows, key=lambda i: row_nnz[i]):
+            cols, vals = A.row(i)
+            best = None
+            for j, a in zip(cols.tolist(), vals.tolist()):
+                if used[j] or abs(a) < 1e-3 * largest[j]:
+                    continue
+                value = r[i] / a
+                if not self.free[j] and (value < -1e-12 or value > self.upper[j] + 1e-9):
+                    continue
+                start, end = csc.indptr[j], csc.indptr[j + 1]
+                touched, entries = csc.indices[start:end], csc.data[start:end]
+                if taken[touched].any():
+                    continue
+                others = touched != i
+                if (r[touched[others]] - entries[others] * value < -1e-9).any():
+                    continue
+                key = (int(open_rows[touched].sum()), -costs[j] * value)
+                if best is None or key < best[0]:
+                    best = (key, j, value, touched, entries)
+            if best is None:
+                continue
+            _, j, value, touched, entries = best
+            r[touched] -= entries * value
+            r[i] = 0.0
+            taken[i] = True
+            open_rows[i] = False
+            used[j] = True
+            crash[i] = j
+        return crash
+
+    def prepare_tableau(self):
+        """
+        Prepares the initial tableau:
+        - Processes constraints
+        - Identifies which need slack/artificial variables
+        - Creates the tableau using the Tableau class
+        """
+        A, b, slack_indices, slack_types, artificial_indices = self.standard_form()
+        crash = self.crash_basis(A, b, artificial_indices) if self.crash else {}
+        artificial_indices = [i for i in artificial_indices if i not in crash]
+        
+        self.artificial_indices = []
+        self.tableau_obj = TABLEAU_BACKENDS[self.backend](A, b, self.c)
         self.tableau_obj.build_tableau(
             slack_indices=slack_indices,
             artificial_indices=artificial_indices,
             M=self.M,
-            slack_types=slack_types
+            slack_types=slack_types,
+            phase_one=self.method != "big_m" and bool(artificial_indices)
         )
+        for row, col in crash.items():
+            self.pivot(row, col)
+        if crash:
+            self.log(f"Crash: {len(crash)} artificiais evitadas")
         
+        self.flipped = np.zeros(self.num_vars, dtype=bool)
         num_slack = len(slack_indices)
         for i, idx in enumerate(artificial_indices):
             col_idx = self.num_vars + num_slack + i
             self.artificial_indices.append(col_idx)
     
+    def end_phase_one(self):
+        """
+        Drives the artificials left in the basis (at zero level) out with
+        degenerate pivots, drops the rows where that is impossible (they are
+        redundant), removes the artificial columns and installs the real
+        objective.
+        """
+        t = self.tableau_obj
+        first_artificial = t.num_columns() - t.num_artificial
+
+        redundant_rows = []
+        for i in t.basis.artificial_rows().tolist():
+            row = t.tableau[i]
+            col = next((j for j in range(first_artificial) if abs(row[j]) > 1e-10), None)
+            if col is None:
+                redundant_rows.append(i)
+            else:
+                self.pivot(i, col)
+
+        t.drop_rows(redundant_rows)
+        t.drop_artificial_variables()
+        self.artificial_indices = []
+        costs = np.asarray(self.c, dtype=np.float64)
+        if self.bounded:
+            costs = np.where(self.flipped, -costs, costs)
+        t.set_objective(costs.tolist() + [0.0] * t.num_slack)
+        if self.bounded:
+            # constant part of c_j (u_j - x_j') of the complemented columns
+            t.tableau[-1][-1] += float(np.asarray(self.c) @ np.where(self.flipped, self.flip_values(), 0.0))
+    
+    def objective_value(self):
+        return float(self.tableau_obj.tableau[-1][-1])
+    
+    def log(self, line):
+        self.tracer.message(line)
+    
+    def format_iteration(self, iteration, entering=None, leaving=None):
+        return self.tableau_obj.format_tableau(iteration=iteration)
+    
+    def format_summary(self, iteration, entering=None, leaving=None):
+        line = f"Iteracao {iteration}: Z = {self.objective_value():.4f}"
+        if entering is not None:
+            names = self.column_names()
+            line += f" | entra {names[entering]}, sai {names[leaving]}"
+        return line
+    
+    def column_names(self):
+        return self.tableau_obj.get_all_var_names()
+    
     def simplex_iterations(self):
         """
+        Primal simplex (see primal_pivots), with the pricing rule put back
+        and the perturbation removed when the loop ends.
+
         Returns:
             "optimal", "unbounded" or "infeasible"
         """
-        max_iterations = 1000
+        pricing = self.pricing
+        try:
+            status = self.primal_pivots()
+        finally:
+            self.pricing = pricing
+        if self.perturbed:
+            status = self.remove_perturbation(status)
+        return status
+
+    def primal_pivots(self):
+        """
+        The primal simplex loop. After stall_limit degenerate pivots in a
+        row, break_stall is called.
+        """
+        limit = self.iteration_limit()
+        stall_limit = self.stall_limit()
+        stall = 0
         iteration = 0
+        self.pricing.reset(self)
+        tracer = self.tracer
+        observing = bool(self.observers)
+        clock = time.perf_counter if observing else no_clock
+        objective = self.objective_value()
 
-        self.iteration_logs.append(self.tableau_obj.format_tableau(iteration=0))
-        self.tableau_obj.print_tableau(iteration=0)
+        if tracer.enabled:
+            tracer.iteration(self, 0)
         
-        while iteration < max_iterations:
+        while iteration < limit:
             iteration += 1
             
+            # Phase I can stop as soon as the artificials reach zero
+            if self.phase == 1 and self.objective_value() >= -1e-10:
+                return "optimal"
+            
+            t0 = clock()
             pivot_col = self.find_pivot_column()
             if pivot_col is None:
                 if self.check_artificial_in_basis():
                     return "infeasible"
                 return "optimal"
             
-            pivot_row = self.find_pivot_row(pivot_col)
-            if pivot_row is None:
-                return "unbounded"
+            t1 = clock()
+            if self.bounded:
+                step = self.bounded_ratio_test(pivot_col)
+                if step is None:
+                    return "unbounded"
+                pivot_row, to_upper = step
+            else:
+                pivot_row, to_upper = self.find_pivot_row(pivot_col), False
+                if pivot_row is None:
+                    return "unbounded"
             
-            self.pivot(pivot_row, pivot_col)
-            all_var_names = self.tableau_obj.get_all_var_names()
-            self.tableau_obj.basis[pivot_row] = all_var_names[pivot_col]
+            t2 = clock()
+            if pivot_row < 0:
+                # bound flip: the entering column reaches its upper bound
+                # before any basic variable blocks it
+                self.complement(pivot_col)
+                leaving = pivot_col
+            else:
+                self.pricing.update(self, pivot_row, pivot_col,
+                                    self.tableau_obj.column_values(pivot_col))
+                leaving = self.pivot(pivot_row, pivot_col)
+                if to_upper:
+                    self.complement(leaving)
+            self.iterations += 1
+            objective, degenerate = self.pivot_progress(objective)
+
+            if observing:
+                self.notify_pivot(iteration, pivot_col, leaving, objective, degenerate,
+                                  (t0, t1, t2, clock()), "flip" if pivot_row < 0 else "primal")
 
-            self.iteration_logs.append(self.tableau_obj.format_tableau(iteration=iteration))
-            self.tableau_obj.print_tableau(iteration=iteration)
+            if tracer.enabled:
+                tracer.iteration(self, iteration, pivot_col, leaving)
+
+            stall = stall + 1 if degenerate else 0
+            if stall >= stall_limit and self.anti_cycling != "off":
+                self.break_stall()
+                stall = 0
         
-        return "max_iterations_reached"
+        return self.limit_reached(limit)
     
     def find_pivot_column(self):
         """
-        Find the pivot column (non-basic variable with most negative coefficient).
-        Uses Bland's rule to avoid cycling.
+        Find the pivot column with the configured pricing rule.
         
         Returns:
             Index of the pivot column or None if optimal
         """
-        obj_row = self.tableau_obj.tableau[-1][:-1]
-        
-        min_val = min(obj_row)
-        
-        if min_val >= -1e-10:  
-            return None
-        
-        for i, val in enumerate(obj_row):
-            if abs(val - min_val) < 1e-10:
-                return i
-        
-        return None
+        if self.bounded:
+            self.orient_free_columns()
+        return self.pricing.select(self)
     
     def find_pivot_row(self, pivot_col):
-        m = len(self.tableau_obj.basis)
-        ratios = []
-        
-        for i in range(m):
-            if self.tableau_obj.tableau[i][pivot_col] > 1e-10:
-                ratio = self.tableau_obj.tableau[i][-1] / self.tableau_obj.tableau[i][pivot_col]
-                ratios.append((ratio, i))
-            else:
-                ratios.append((float('inf'), i))
-        
-        valid_ratios = [(r, i) for r, i in ratios if r >= 0]
-        
-        if not valid_ratios:
-            return None  # means that the problem is unbounded
-        
-        min_ratio = min(r for r, _ in valid_ratios)
-        
-        for r, i in valid_ratios:
-            if abs(r - min_ratio) < 1e-10:
-                return i
-        
-        return None
+        tie_keys = self.tableau_obj.basis_columns() if self.pricing.lowest_index_ties else None
+        return self.tableau_obj.find_pivot_row(pivot_col, tie_keys)
+    
+    # queries used by the pricing rules (see pricing.PricingRule)
+    
+    def num_columns(self):
+        return self.tableau_obj.num_columns()
+    
+    def reduced_costs(self, cols=None):
+        d = self.tableau_obj.reduced_costs()
+        return d if cols is None else d[cols]
+    
+    def pivot_row_values(self, r):
+        return self.tableau_obj.row_values(r)
+    
+    def column_dots(self, alpha):
+        return self.tableau_obj.column_dots(alpha)
+    
+    def column_norms_sq(self):
+        return self.tableau_obj.column_norms_sq()
+    
+    def basic_column(self, r):
+        return self.tableau_obj.basis[r]
     
     def pivot(self, pivot_row, pivot_col):
-        pivot = self.tableau_obj.tableau[pivot_row][pivot_col]
-        num_cols = len(self.tableau_obj.tableau[0])
-        
-        for j in range(num_cols):
-            self.tableau_obj.tableau[pivot_row][j] /= pivot
-        
-        for i in range(len(self.tableau_obj.tableau)):
-            if i != pivot_row:
-                multiplier = self.tableau_obj.tableau[i][pivot_col]
-                for j in range(num_cols):
-                    self.tableau_obj.tableau[i][j] -= multiplier * self.tableau_obj.tableau[pivot_row][j]
+        self.tableau_obj.pivot(pivot_row, pivot_col)
+        return self.tableau_obj.basis.enter(pivot_row, pivot_col)
     
     def check_artificial_in_basis(self):
         """
         Check for artificial variables in the basis with positive value.
         If true, the problem is infeasible.
         """
-        all_var_names = self.tableau_obj.get_all_var_names()
-        
-        for i, var_name in enumerate(self.tableau_obj.basis):
-            if var_name.startswith('a'):
-                if self.tableau_obj.tableau[i][-1] > 1e-10:
-                    return True
+        t = self.tableau_obj
+        for i in t.basis.artificial_rows().tolist():
+            if t.tableau[i][-1] > 1e-10:
+                return True
         return False
     
     def extract_solution(self):
         internal_solution = [0.0] * self.num_vars
-        all_var_names = self.tableau_obj.get_all_var_names()
-        for i, var_name in enumerate(self.tableau_obj.basis):
-            if var_name and var_name.startswith('x'):
-                var_index = int(var_name[1:]) - 1
-                internal_solution[var_index] = self.tableau_obj.tableau[i][-1]
+        for i, col in enumerate(self.tableau_obj.basis.head.tolist()):
+            if 0 <= col < self.num_vars:
+                internal_solution[col] = float(self.tableau_obj.tableau[i][-1])
+        if self.bounded:
+            x = np.asarray(internal_solution)
+            internal_solution = np.where(self.flipped, self.flip_values() - x, x).tolist()
+
+        self.set_solution(internal_solution, float(self.tableau_obj.tableau[-1][-1]))
+
+    def set_solution(self, internal_solution, objective):
+        """
+        Stores the solution and optimal value in terms of the original
+        variables and objective sense, undoing scaling and then presolve.
+        """
+        if self.scaling:
+            internal_solution, objective = self.scaler.unscale(internal_solution, objective)
+        if self.presolve:
+            internal_solution, objective = self.presolver.restore(internal_solution, objective)
+        self.internal_solution = internal_solution
+        self.solution = self.map_to_original(internal_solution)
+        self.optimal_value = (-objective if self.is_minimization else objective) + self.offset
 
+    def residuals(self):
+        """
+        Violations of the last solution on the full, unscaled internal
+        model: rows beyond their RHS and negative columns.
+
+        Returns:
+            dict {"primal": max row violation, "bounds": max bound
+            violation}, or None when there is no solution
+        """
+        if self.internal_solution is None:
+            return None
+        x = np.asarray(self.internal_solution, dtype=np.float64)
+        slack = np.asarray(self.rhs, dtype=np.float64) - self.A.matvec(x)
+        ops = np.asarray(self.ops)
+        violation = np.where(ops == "<=", -slack, np.where(ops == ">=", slack, np.abs(slack)))
+        bounds = np.maximum(np.where(self.free, 0.0, -x), x - self.upper)
+        return {
+            "primal": float(np.max(violation, initial=0.0)),
+            "bounds": float(np.max(bounds, initial=0.0)),
+        }
+
+    def map_to_original(self, internal_solution):
+        """
+        Maps values of the expanded (internal) variables back to the
+        original ones, undoing the bound shifts, the sign of <=0 variables
+        and the x+ - x- split of free ones.
+        """
         sol = [0.0] * self.orig_num_vars
         for i, idxs in enumerate(self._map_orig_to_internal):
             if len(idxs) == 1:
-                if self.var_signs[i] == "<=0":
-                    sol[i] = -internal_solution[idxs[0]]
-                else:
-                    sol[i] = internal_solution[idxs[0]]
+                value = internal_solution[idxs[0]]
+                if self.sign[i] < 0:
+                    value = -value
+                if self.shift[i]:
+                    value += float(self.shift[i])
+                sol[i] = value
             else:
                 plus, minus = idxs
                 sol[i] = internal_solution[plus] - internal_solution[minus]
+        return sol
 
-        self.solution = sol
-        self.optimal_value = self.tableau_obj.tableau[-1][-1]
-        if self.is_minimization:
-            self.optimal_value = -self.optimal_value
+    def sensitivity_lines(self):
+        report = self.sensitivity_report
+
+        def interval(low, high):
+            low = "None" if low == -INF else f"{low:.4f}"
+            high = "None" if high == INF else f"{high:.4f}"
+            return f"[{low}, {high}]"
+
+        lines = ["", "Sensibilidade", ""]
+        for k, (dual, slack, rhs_range) in enumerate(
+                zip(report["duals"], report["slacks"], report["rhs_ranges"]), start=1):
+            lines.append(f"R{k}: dual = {dual:.4f}, folga = {slack:.4f}, "
+                         f"RHS em {interval(*rhs_range)}")
+        for i, (reduced, cost_range) in enumerate(
+                zip(report["reduced_costs"], report["cost_ranges"]), start=1):
+            lines.append(f"x{i}: custo reduzido = {reduced:.4f}, "
+                         f"custo em {interval(*cost_range)}")
+        return lines
 
     def write_report(self, filepath):
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        directory = os.path.dirname(filepath)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
         lines = []
 
-        lines.append("Iterações do Simplex")
-        lines.append("=" * 80)
-        lines.extend(self.iteration_logs)
+        # when the iterations were streamed to this file only the solution is appended
+        streamed = self.tracer.streams_to(filepath)
+        if not streamed:
+            lines.extend(REPORT_HEADER)
+            lines.extend(self.iteration_logs)
         lines.append("=" * 80)
         lines.append("Solução")
         lines.append("")
+        if self.solution is None:
+            lines.append(f"Status: {self.status}")
+            with open(filepath, "a" if streamed else "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            return
         lines.append(f"FO: {self.optimal_value:.4f}")
         
         for i, v in enumerate(self.solution, start=1):
@@ -302,7 +1738,7 @@ class Simplex:
         
         for k, (coeffs, op, rhs) in enumerate(self.original_constraints, start=1):
             lhs = 0.0
-            for j, a in enumerate(coeffs):
+            for j, a in iter_row(coeffs):
                 lhs += float(a) * float(self.solution[j] if j < len(self.solution) else 0.0)
             if op == "<=":
                 line = f"R{k} = None <= {lhs:.4f} <= {float(rhs):.4f}"
@@ -312,5 +1748,8 @@ class Simplex:
                 line = f"R{k} = {float(rhs):.4f} <= {lhs:.4f} <= {float(rhs):.4f}"
             lines.append(line)
 
-        with open(filepath, "w", encoding="utf-8") as f:
+        if self.sensitivity_report is not None:
+            lines.extend(self.sensitivity_lines())
+
+        with open(filepath, "a" if streamed else "w", encoding="utf-8") as f:
             f.write("\n".join(lines) + "\n")
\ No newline at end of file
@@ -0,0 +1,146 @@
+import numpy as np
+
+
+def iter_row(coeffs):
+    """
+    Yields (column, value) for the nonzero entries of a constraint row given
+    either densely (list) or sparsely (dict {column: value}).
+    """
+    items = coeffs.items() if isinstance(coeffs, dict) else enumerate(coeffs)
+    for j, a in items:
+        if a != 0:
+            yield j, a
+
+
+class CSRMatrix:
+    """
+    Compressed sparse row matrix: the column indices and values of row i are
+    indices[indptr[i]:indptr[i+1]] and data[indptr[i]:indptr[i+1]].
+
+    Only what the solver needs is implemented: building from rows or
+    coordinates, row scaling, products with dense vectors and conversion to
+    CSC / dense.
+    """
+
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = np.asarray(indptr, dtype=np.intp)
+        self.indices = np.asarray(indices, dtype=np.intp)
+        self.data = np.asarray(data, dtype=np.float64)
+        self.shape = shape
+        self._row_ids = None
+
+    @classmethod
+    def from_rows(cls, rows, num_cols):
+        indptr = [0]
+        indices = []
+        data = []
+        for coeffs in rows:
+            for j, a in iter_row(coeffs):
+                if not 0 <= j < num_cols:
+                    raise ValueError(f"Column index {j} out of range for {num_cols} columns.")
+                indices.append(j)
+                data.append(float(a))
+            indptr.append(len(indices))
+        return cls(indptr, indices, data, (len(rows), num_cols))
+
+    @classmethod
+    def from_coo(cls, rows, cols, vals, shape):
+        rows = np.asarray(rows, dtype=np.intp)
+        cols = np.asarray(cols, dtype=np.intp)
+        vals = np.asarray(vals, dtype=np.float64)
+        keep = vals != 0
+        rows, cols, vals = rows[keep], cols[keep], vals[keep]
+        order = np.lexsort((cols, rows))
+        counts = np.bincount(rows, minlength=shape[0])
+        indptr = np.concatenate([[0], np.cumsum(counts)])
+        return cls(indptr, cols[order], vals[order], shape)
+
+    @property
+    def nnz(self):
+        return len(self.data)
+
+    @property
+    def row_ids(self):
+        """
+        Row index of every stored entry (the "coordinate" view).
+        """
+        if self._row_ids is None:
+            self._row_ids = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+        return self._row_ids
+
+    def row(self, i):
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return self.indices[start:end], self.data[start:end]
+
+    def scale_rows(self, factors):
+        factors = np.asarray(factors, dtype=np.float64)
+        return CSRMatrix(self.indptr, self.indices, self.data * factors[self.row_ids], self.shape)
+
+    def scale_columns(self, factors):
+        factors = np.asarray(factors, dtype=np.float64)
+        return CSRMatrix(self.indptr, self.indices, self.data * factors[self.indices], self.shape)
+
+    def matvec(self, x):
+        """
+        A @ x
+        """
+        return np.bincount(self.row_ids, weights=self.data * x[self.indices],
+                           minlength=self.shape[0])
+
+    def rmatvec(self, y):
+        """
+        A.T @ y
+        """
+        return np.bincount(self.indices, weights=self.data * y[self.row_ids],
+                           minlength=self.shape[1])
+
+    def tocsc(self):
+        return CSCMatrix.from_csr(self)
+
+    def to_dense(self):
+        dense = np.zeros(self.shape)
+        dense[self.row_ids, self.indices] = self.data
+        return dense
+
+
+class CSCMatrix:
+    """
+    Compressed sparse column matrix, used where whole columns are needed
+    (entering columns of the revised simplex).
+    """
+
+    def __init__(self, indptr, indices, data, shape):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+        self.shape = shape
+
+    @classmethod
+    def from_csr(cls, csr):
+        order = np.lexsort((csr.row_ids, csr.indices))
+        counts = np.bincount(csr.indices, minlength=csr.shape[1])
+        indptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.intp)
+        return cls(indptr, csr.row_ids[order], csr.data[order], csr.shape)
+
+    def rmatvec(self, y, cols):
+        """
+        (A.T @ y)[cols], touching only the entries of those columns.
+        """
+        cols = np.asarray(cols, dtype=np.intp)
+        starts = self.indptr[cols]
+        lengths = self.indptr[cols + 1] - starts
+        # positions of every stored entry of the selected columns
+        offsets = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        pos = np.repeat(starts, lengths) + offsets
+        owner = np.repeat(np.arange(len(cols)), lengths)
+        return np.bincount(owner, weights=self.data[pos] * y[self.indices[pos]],
+                           minlength=len(cols))
+
+    def column(self, j):
+        """
+        Column j as a dense vector.
+        """
+        col = np.zeros(self.shape[0])
+        start, end = self.indptr[j], self.indptr[j + 1]
+        col[self.indices[start:end]] = self.data[start:end]
+        return col
@@ -1,39 +1,38 @@
+import numpy as np
+
+from basis import ARTIFICIAL, SLACK, STRUCTURAL, Basis, column_names
+from sparse import CSRMatrix
+
+
 class Tableau:
     def __init__(self, A, b, c):
         """
-        A = constraints matrix (lista de listas com coeficientes)
+        A = constraints matrix (CSRMatrix ou lista de listas com coeficientes)
         b = independent terms (lista com RHS das restrições)
         c = coefficients of the objective function (lista)
         """
+        if not isinstance(A, CSRMatrix):
+            A = CSRMatrix.from_rows(A, len(c))
         self.A = A
         self.b = b
         self.c = c
 
-        self.num_constraints = len(A)
+        self.num_constraints = A.shape[0]
         self.num_vars = len(c)
 
-        self.var_names = [f"x{i+1}" for i in range(self.num_vars)]
-        
-        self.slack_vars = []
-        self.artificial_vars = []
+        self.num_slack = 0
+        self.num_artificial = 0
         
-        self.basis = []
+        self.basis = Basis(0, [])
+        self._var_names = None
         
         self.tableau = []
 
-    def add_slack_variable(self, name=None):
-        if name is None:
-            name = f"w{len(self.slack_vars) + 1}"
-        self.slack_vars.append(name)
-        return name
+    def column_kinds(self):
+        return [STRUCTURAL] * self.num_vars + [SLACK] * self.num_slack + [ARTIFICIAL] * self.num_artificial
 
-    def add_artificial_variable(self, name=None):
-        if name is None:
-            name = f"a{len(self.artificial_vars) + 1}"
-        self.artificial_vars.append(name)
-        return name
-
-    def build_tableau(self, slack_indices, artificial_indices=None, M=1000000, slack_types=None):
+    def build_tableau(self, slack_indices, artificial_indices=None, M=1000000, slack_types=None,
+                      phase_one=False):
         """
         Constrói o tableau do simplex.
         
@@ -42,7 +41,11 @@ class Tableau:
             artificial_indices: index list of constraints that receive artificial variables
             M: Big M penalty value for artificial variables
             slack_types: dictionary {constraint_index: coef} where coef is 1 (<=) or -1 (>=)
+            phase_one: if True the objective row is the Phase I one (minimize the
+                sum of the artificials) instead of c with Big M penalties
         """
+        if phase_one:
+            M = 1.0
         m = self.num_constraints
         n = self.num_vars
         num_slack = len(slack_indices) if slack_indices else 0
@@ -50,33 +53,37 @@ class Tableau:
         num_cols = n + num_slack + num_artificial + 1
         self.tableau = [[0.0] * num_cols for _ in range(m + 1)]
 
+        # only the stored nonzeros of A are scattered into the tableau
         for i in range(m):
-            for j in range(n):
-                self.tableau[i][j] = float(self.A[i][j])
-            self.tableau[i][-1] = float(self.b[i])
+            row = self.tableau[i]
+            cols, vals = self.A.row(i)
+            for j, a in zip(cols.tolist(), vals.tolist()):
+                row[j] = a
+            row[-1] = float(self.b[i])
 
-        base = [None] * m
+        self.num_slack = num_slack
+        self.num_artificial = num_artificial
+        basis = Basis(m, self.column_kinds())
 
         slack_col = n
         for idx in (slack_indices or []):
-            var_name = self.add_slack_variable()
             coef = 1.0 if slack_types is None else slack_types.get(idx, 1.0)
             self.tableau[idx][slack_col] = coef
             if coef == 1.0:
-                base[idx] = var_name
+                basis.enter(idx, slack_col)
             slack_col += 1
 
         artificial_col = n + num_slack
         artificial_col_indices = []
         for idx in (artificial_indices or []):
-            var_name = self.add_artificial_variable()
             self.tableau[idx][artificial_col] = 1.0
-            base[idx] = var_name
+            basis.enter(idx, artificial_col)
             artificial_col_indices.append(artificial_col)
             artificial_col += 1
 
-        for j in range(n):
-            self.tableau[-1][j] = -float(self.c[j])
+        if not phase_one:
+            for j in range(n):
+                self.tableau[-1][j] = -float(self.c[j])
 
         for col_idx in artificial_col_indices:
             self.tableau[-1][col_idx] = M
@@ -85,10 +92,210 @@ class Tableau:
                 for j in range(num_cols):
                     self.tableau[-1][j] -= M * self.tableau[idx][j]
 
-        self.basis = base
+        self.basis = basis
+
+    def find_pivot_row(self, pivot_col, tie_keys=None):
+        """
+        Minimum ratio test over the rows with a positive entry in pivot_col.
+        Ties go to the first row, or to the row with the smallest tie_keys
+        entry when given. Returns None when no row limits the step (unbounded).
+        """
+        m = len(self.basis)
+        ratios = []
+
+        for i in range(m):
+            if self.tableau[i][pivot_col] > 1e-10:
+                # round-off can leave degenerate basics at -1e-15; they
+                # still block the step
+                ratio = max(self.tableau[i][-1], 0.0) / self.tableau[i][pivot_col]
+                ratios.append((ratio, i))
+            else:
+                ratios.append((float('inf'), i))
+
+        valid_ratios = [(r, i) for r, i in ratios if r >= 0]
+
+        if not valid_ratios:
+            return None
+
+        min_ratio = min(r for r, _ in valid_ratios)
+
+        ties = [i for r, i in valid_ratios if abs(r - min_ratio) < 1e-10]
+        if not ties:
+            return None
+        if tie_keys is not None:
+            return min(ties, key=lambda i: tie_keys[i])
+        return ties[0]
+
+    def load_basis(self, columns):
+        """
+        Makes columns[i] basic (Gauss-Jordan pivots with partial pivoting
+        over the rows not yet assigned), so the tableau becomes
+        B^-1 [A | b] with the objective row priced for that basis.
+        """
+        m = len(self.basis)
+        free_rows = set(range(m))
+        for col in columns:
+            col = int(col)
+            row = max(free_rows, key=lambda i: abs(self.tableau[i][col]), default=None)
+            if row is None or abs(self.tableau[row][col]) < 1e-12:
+                raise ValueError("Singular basis.")
+            self.pivot(row, col)
+            self.basis.enter(row, col)
+            free_rows.discard(row)
+
+    def add_row(self, cols, vals, slack_coef, rhs):
+        """
+        Appends the constraint sum(vals * x[cols]) + slack_coef * s = rhs to
+        an optimal tableau. The new slack column goes after the existing
+        slacks and is basic in the new row, which is multiplied by
+        slack_coef (so s has coefficient +1) and expressed in terms of the
+        current basis. The objective row does not change.
+        """
+        slack_col = self.num_vars + self.num_slack
+        for row in self.tableau:
+            row.insert(slack_col, 0.0)
+        new_row = [0.0] * len(self.tableau[0])
+        for j, a in zip(cols, vals):
+            new_row[j] = slack_coef * float(a)
+        new_row[slack_col] = 1.0
+        new_row[-1] = slack_coef * float(rhs)
+
+        self.basis.add_row(slack_col, SLACK)
+        for i, j in enumerate(self.basis.head[:-1].tolist()):
+            multiplier = new_row[j] if j >= 0 else 0.0
+            if multiplier != 0.0:
+                row = self.tableau[i]
+                for k in range(len(new_row)):
+                    new_row[k] -= multiplier * row[k]
+
+        self.tableau.insert(len(self.tableau) - 1, new_row)
+        self.num_slack += 1
+        self.num_constraints += 1
+        self._var_names = None
+
+    def complement_column(self, j, value):
+        """
+        Substitutes x_j = value - x_j' for a nonbasic column j: the RHS of
+        every row (objective included) loses value * column j, and the
+        column changes sign.
+        """
+        for row in self.tableau:
+            a = row[j]
+            if a != 0.0:
+                row[-1] -= a * value
+                row[j] = -a
+
+    def complement_row(self, r, j, value):
+        """
+        Same substitution for the column j basic in row r: the row changes
+        sign, so x_j' keeps coefficient 1, and gains value in the RHS.
+        """
+        row = self.tableau[r]
+        for k in range(len(row)):
+            row[k] = -row[k]
+        row[j] = 1.0
+        row[-1] += value
+
+    def shift_rhs(self, delta):
+        """
+        Adds delta to the RHS of the constraint rows (the basic values);
+        the objective row is left as it is.
+        """
+        for i, d in enumerate(delta):
+            self.tableau[i][-1] += float(d)
+
+    def basic_values(self):
+        return np.array([self.tableau[i][-1] for i in range(len(self.basis))])
+
+    def num_columns(self):
+        return len(self.tableau[0]) - 1
+
+    def reduced_costs(self):
+        return np.array(self.tableau[-1][:-1])
+
+    def row_values(self, r):
+        return np.array(self.tableau[r][:-1])
+
+    def column_values(self, q):
+        return np.array([self.tableau[i][q] for i in range(len(self.basis))])
+
+    def column_dots(self, alpha):
+        """
+        alpha^T times the constraint rows, i.e. the dot product of alpha
+        with every tableau column.
+        """
+        dots = [0.0] * self.num_columns()
+        for a, row in zip(alpha.tolist(), self.tableau[:-1]):
+            if a != 0.0:
+                for j in range(len(dots)):
+                    dots[j] += a * row[j]
+        return np.array(dots)
+
+    def column_norms_sq(self):
+        norms = [0.0] * self.num_columns()
+        for row in self.tableau[:-1]:
+            for j in range(len(norms)):
+                norms[j] += row[j] * row[j]
+        return np.array(norms)
+
+    def pivot(self, pivot_row, pivot_col):
+        row_p = self.tableau[pivot_row]
+        pivot = row_p[pivot_col]
+        # zero entries of the pivot row and rows with a zero multiplier
+        # are left untouched
+        nonzero_cols = [j for j, v in enumerate(row_p) if v != 0.0]
+
+        for j in nonzero_cols:
+            row_p[j] /= pivot
+
+        for i, row in enumerate(self.tableau):
+            if i != pivot_row:
+                multiplier = row[pivot_col]
+                if multiplier == 0.0:
+                    continue
+                for j in nonzero_cols:
+                    row[j] -= multiplier * row_p[j]
+
+    def basis_columns(self):
+        return self.basis.head
+
+    def set_objective(self, costs):
+        """
+        Replaces the objective row by the one of costs (one per column),
+        already expressed in terms of the current basis.
+        """
+        obj = [-float(cj) for cj in costs] + [0.0]
+        for i, j in enumerate(self.basis_columns().tolist()):
+            cb = costs[j]
+            if cb != 0:
+                row = self.tableau[i]
+                for k in range(len(obj)):
+                    obj[k] += cb * row[k]
+        self.tableau[-1] = obj
+
+    def drop_rows(self, rows):
+        rows = set(rows)
+        if not rows:
+            return
+        self.tableau = [r for i, r in enumerate(self.tableau[:-1]) if i not in rows] + [self.tableau[-1]]
+        self.basis.drop_rows(sorted(rows))
+        self.num_constraints = len(self.basis)
+
+    def drop_artificial_variables(self):
+        """
+        Removes the artificial columns (they are the last ones before b).
+        """
+        k = self.num_artificial
+        if k:
+            self.tableau = [row[:-k - 1] + row[-1:] for row in self.tableau]
+        self.basis.drop_artificial_columns()
+        self.num_artificial = 0
+        self._var_names = None
 
     def get_all_var_names(self):
-        return self.var_names + self.slack_vars + self.artificial_vars
+        if self._var_names is None:
+            self._var_names = column_names(self.column_kinds())
+        return self._var_names
 
     def format_tableau(self, iteration=0):
         all_vars = self.get_all_var_names()
@@ -97,7 +304,8 @@ class Tableau:
         lines = []
         lines.append(f"=== Iteracao: {iteration} ===")
         lines.append(f"{cabecalho[0]:>15}" + "".join(f"{el:>{largura}}" for el in cabecalho[1:]))
-        for i, var in enumerate(self.basis):
+        for i, col in enumerate(self.basis.head.tolist()):
+            var = all_vars[col] if col >= 0 else None
             row = f"{(var or ''):>15}" + "".join(f"{v:>{largura}.2f}" for v in self.tableau[i])
             lines.append(row)
         obj = f"{'Z':>15}" + "".join(f"{v:>{largura}.2f}" for v in self.tableau[-1])
@@ -0,0 +1,84 @@
+import os
+
+REPORT_HEADER = ["Iterações do Simplex", "=" * 80]
+
+TRACE_LEVELS = ("off", "summary", "every", "full")
+
+
+class Tracer:
+    """
+    Iteration tracing for the simplex engines.
+
+    Levels:
+        off      nothing is formatted, printed or stored
+        summary  one line per iteration (objective value, entering/leaving)
+        every    the full iteration (tableau) every `every` iterations
+        full     the full iteration on every pivot
+
+    Each entry is formatted once and then echoed to stdout and either
+    buffered in engine.iteration_logs or, when stream_path is set, written
+    straight to the report file so nothing accumulates in memory.
+    """
+
+    def __init__(self, level="full", every=1, stream_path=None, echo=True):
+        if level not in TRACE_LEVELS:
+            raise ValueError(f"Unknown trace level: {level}")
+        self.level = level
+        self.every = max(1, int(every))
+        self.stream_path = stream_path
+        self.echo = echo
+        self.enabled = level != "off"
+        self._file = None
+        self._logs = None
+
+    def start(self, engine):
+        self._logs = engine.iteration_logs
+        if self.enabled and self.stream_path and self._file is None:
+            directory = os.path.dirname(self.stream_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._file = open(self.stream_path, "w", encoding="utf-8")
+            self._file.write("\n".join(REPORT_HEADER) + "\n")
+
+    def message(self, line):
+        if self.enabled:
+            self.emit(line)
+
+    def iteration(self, engine, iteration, entering=None, leaving=None):
+        if self.level == "summary":
+            self.emit(engine.format_summary(iteration, entering, leaving))
+        elif self.level == "full" or iteration % self.every == 0:
+            self.emit(engine.format_iteration(iteration, entering, leaving))
+
+    def finish(self, engine, status):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def emit(self, text):
+        if self.echo:
+            print(text, end="" if text.endswith("\n") else "\n")
+        if self._file is not None:
+            # same layout as write_report, which joins the entries with "\n"
+            self._file.write(text + "\n")
+        else:
+            self._logs.append(text)
+
+    def streams_to(self, filepath):
+        return (self.enabled and self.stream_path is not None
+                and os.path.abspath(self.stream_path) == os.path.abspath(filepath))
+
+
+def make_tracer(trace, report_path=None):
+    """
+    trace: "off", "summary", "full", "every:N" or a Tracer instance.
+    report_path: with "full" or "every:N", iterations are streamed to this
+        file; write_report(report_path) then appends the solution.
+    """
+    if isinstance(trace, Tracer):
+        return trace
+    every = 1
+    if isinstance(trace, str) and trace.startswith("every:"):
+        trace, every = "every", int(trace.split(":", 1)[1])
+    stream_path = report_path if trace in ("every", "full") else None
+    return Tracer(trace, every=every, stream_path=stream_path)
@@ -0,0 +1,27 @@
+import os
+import sys
+
+# the modules import each other flat, as when main.py is run from main/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main"))
+
+INF = float("inf")
+
+
+def feasible(solution, constraints, bounds=None, tol=1e-6):
+    """
+    True if solution satisfies every (dense) constraint row and bound.
+    """
+    for row, op, rhs in constraints:
+        lhs = sum(a * x for a, x in zip(row, solution))
+        if op == "<=" and lhs > rhs + tol:
+            return False
+        if op == ">=" and lhs < rhs - tol:
+            return False
+        if op == "=" and abs(lhs - rhs) > tol:
+            return False
+    for x, (lower, upper) in zip(solution, bounds or []):
+        if lower is not None and x < lower - tol:
+            return False
+        if upper is not None and x > upper + tol:
+            return False
+    return True
@@ -0,0 +1,34 @@
+NAME          RANGES
+OBJSENSE
+    MAX
+ROWS
+ N  OBJ
+ L  LIM1
+ G  LIM2
+ E  EQ1
+ E  EQ2
+COLUMNS
+    X         OBJ       2            LIM1      1
+    X         LIM2      1
+    MARKER    'MARKER'  'INTORG'
+    Y         OBJ       3            LIM1      1
+    Y         LIM2      -1           EQ1       1
+    MARKER    'MARKER'  'INTEND'
+    Z         OBJ       1            LIM1      1
+    Z         EQ2       1
+    W         OBJ       -1           EQ1       1
+    W         EQ2       1
+    B         OBJ       1            LIM1      1
+RHS
+    RHS       LIM1      10           LIM2      -2
+    RHS       EQ1       3            EQ2       2
+RANGES
+    RNG       LIM1      4            LIM2      3
+    RNG       EQ1       -2           EQ2       1
+BOUNDS
+ UP BND       X         4
+ LO BND       Z         1
+ MI BND       W
+ UP BND       W         2
+ BV BND       B
+ENDATA
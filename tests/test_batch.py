@@ -0,0 +1,68 @@
+import json
+import os
+
+import pytest
+
+from batch import collect_problems, run_batch
+
+PROBLEMS = {
+    "good.txt": "MAX 3 x1 + 2 x2\nx1 + x2 <= 4\nx1 + 3 x2 <= 6\nx1 <= 3\n",
+    "unbounded.txt": "MAX 1 x1 + 1 x2\n1 x1 - 1 x2 <= 1\n",
+    "broken.lp": "Maximize\n obj: x +\nSubject To\n c1: x <= 1\nEnd\n",
+    "no_rhs.txt": "MAX 1 x1\nx1 + x2 <=\n",
+}
+
+
+@pytest.fixture
+def problems(tmp_path):
+    directory = tmp_path / "problems"
+    directory.mkdir()
+    for name, text in PROBLEMS.items():
+        (directory / name).write_text(text)
+    return directory
+
+
+def read_records(path):
+    with open(path, encoding="utf-8") as f:
+        return {os.path.basename(record["file"]): record for record in map(json.loads, f)}
+
+
+def test_failures_stay_in_their_own_record(problems, tmp_path):
+    paths = collect_problems(str(problems)) + [str(problems / "missing.txt")]
+    output = tmp_path / "out" / "batch.jsonl"
+    # one chunk holds every file, so a failure must not take the others down
+    counts = run_batch(paths, str(output), workers=2, chunksize=8)
+    assert counts == {"optimal": 1, "unbounded": 1, "error": 3}
+
+    records = read_records(output)
+    assert records["good.txt"]["optimal_value"] == 11.0
+    assert records["good.txt"]["error"] is None
+    assert records["unbounded.txt"]["status"] == "unbounded"
+    assert records["broken.lp"]["error"].startswith("ValueError")
+    assert records["no_rhs.txt"]["error"].startswith("ValueError")
+    assert records["missing.txt"]["error"].startswith("FileNotFoundError")
+
+
+def test_cached_rerun(problems, tmp_path):
+    paths = collect_problems(str(problems / "*.txt"))
+    cache = str(tmp_path / "cache.sqlite")
+    run_batch(paths, str(tmp_path / "first.jsonl"), workers=1, cache=cache)
+    counts = run_batch(paths, str(tmp_path / "second.jsonl"), workers=1, cache=cache)
+    # errors are never stored, so only the two final statuses come back cached
+    assert counts == {"optimal": 1, "unbounded": 1, "error": 1, "cached": 2}
+    assert read_records(tmp_path / "second.jsonl")["good.txt"]["optimal_value"] == 11.0
+
+
+def test_collect_problems(problems, tmp_path):
+    assert [os.path.basename(p) for p in collect_problems(str(problems))] == sorted(PROBLEMS)
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# comment\n\nproblems/good.txt\nproblems/broken.lp\n")
+    assert collect_problems(str(manifest)) == [str(tmp_path / "problems" / "good.txt"),
+                                                str(tmp_path / "problems" / "broken.lp")]
+    with pytest.raises(ValueError):
+        collect_problems(str(tmp_path / "nothing"))
+
+
+def test_unknown_engine(tmp_path):
+    with pytest.raises(ValueError):
+        run_batch([], str(tmp_path / "out.jsonl"), engine="nope")
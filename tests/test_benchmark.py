@@ -0,0 +1,17 @@
+import pytest
+
+from benchmark.generator import benchmark_cases
+from simplex import Simplex
+
+
+@pytest.mark.parametrize("name, model, expected",
+                         [case for case in benchmark_cases("small") if not case[0].startswith("random")])
+def test_special_cases_match_expected(name, model, expected):
+    result = Simplex(model["objective_coeffs"], model["constraints"], model["objective_type"],
+                     model["var_signs"], trace="off").solve()
+    if expected is None:
+        assert result["status"] == "optimal"
+        return
+    assert result["status"] == expected["status"]
+    if "optimal_value" in expected:
+        assert result["optimal_value"] == pytest.approx(expected["optimal_value"])
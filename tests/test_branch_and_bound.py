@@ -0,0 +1,124 @@
+import io
+import itertools
+
+import pytest
+
+from branch_and_bound import BranchAndBound
+from conftest import feasible
+from parser import Parser
+from revised_simplex import RevisedSimplex
+from simplex import Simplex
+
+WEIGHTS = [5, 7, 4, 3, 6, 2, 8]
+VALUES = [10, 13, 7, 5, 11, 3, 14]
+CAPACITY = 20
+
+
+def knapsack():
+    return {
+        "objective_type": "Max",
+        "objective_coeffs": VALUES,
+        "constraints": [(WEIGHTS, "<=", CAPACITY), ([1, 1, 0, 0, 0, 0, 1], "<=", 2)],
+        "var_signs": None,
+        "bounds": [(0, 1)] * len(VALUES),
+        "integer": [True] * len(VALUES),
+    }
+
+
+def brute_force(model):
+    best = None
+    for x in itertools.product([0, 1], repeat=len(VALUES)):
+        if feasible(x, model["constraints"]):
+            value = sum(c * v for c, v in zip(model["objective_coeffs"], x))
+            best = value if best is None else max(best, value)
+    return best
+
+
+@pytest.mark.parametrize("node_selection", ["best_bound", "depth_first"])
+def test_knapsack_optimum(node_selection):
+    model = knapsack()
+    result = BranchAndBound(model, node_selection=node_selection).solve()
+    assert result["status"] == "optimal"
+    assert result["optimal_value"] == pytest.approx(brute_force(model))
+    assert all(x in (0.0, 1.0) for x in result["solution"])
+    assert feasible(result["solution"], model["constraints"], model["bounds"])
+    assert result["gap"] == pytest.approx(0.0, abs=1e-6)
+
+
+def test_process_pool_gives_the_same_optimum():
+    model = knapsack()
+    result = BranchAndBound(model, workers=2).solve()
+    assert result["status"] == "optimal"
+    assert result["optimal_value"] == pytest.approx(brute_force(model))
+
+
+def test_engine_without_native_bounds():
+    model = knapsack()
+    result = BranchAndBound(model, engine=RevisedSimplex).solve()
+    assert result["optimal_value"] == pytest.approx(brute_force(model))
+
+
+def test_warm_bound_change_matches_cold_solve():
+    # the bound change of a child node, re-optimized from the parent's basis
+    c = [1, -2]
+    constraints = [([1, 1], ">=", 1), ([1, -1], ">=", -4), ([1, 0], "<=", 2)]
+    simplex = Simplex(c, constraints, "Max", bounds=[(0, None), (None, None)], trace="off")
+    simplex.solve()
+    tighter = [(0, None), (0, None)]
+    simplex.update_bounds(tighter)
+    warm = simplex.resolve()
+    cold = Simplex(c, constraints, "Max", bounds=tighter, trace="off").solve()
+    assert warm["status"] == cold["status"] == "optimal"
+    assert warm["optimal_value"] == pytest.approx(cold["optimal_value"])
+
+
+def test_general_integers_from_the_text_format():
+    # LP optimum 4.75 at (2.5, 2.25); integer optimum 4 at (2, 2), (3, 1)
+    # or (4, 0), plus the continuous x3
+    model = Parser(io.StringIO(
+        "MAX 1 x1 + 1 x2 + 1 x3\n"
+        "3 x1 + 2 x2 <= 12\n"
+        "-1 x1 + 2 x2 <= 2\n"
+        "x3 <= 0.5\n"
+        "inteiras x1, x2\n"
+    )).parse()
+    result = BranchAndBound(model).solve()
+    assert result["status"] == "optimal"
+    assert result["optimal_value"] == pytest.approx(4.5)
+    x1, x2, x3 = result["solution"]
+    assert x1.is_integer() and x2.is_integer() and x3 == pytest.approx(0.5)
+
+
+def test_free_integer_variable():
+    model = {
+        "objective_type": "Min",
+        "objective_coeffs": [1, 1],
+        "constraints": [([2, 2], ">=", -7), ([1, -1], "<=", 0.5), ([1, -1], ">=", -3.5)],
+        "var_signs": None,
+        "bounds": [(None, None), (None, None)],
+        "integer": [True, True],
+    }
+    result = BranchAndBound(model).solve()
+    assert result["status"] == "optimal"
+    assert result["optimal_value"] == pytest.approx(-3.0)
+
+
+def test_integer_infeasible():
+    model = {
+        "objective_type": "Max",
+        "objective_coeffs": [1],
+        "constraints": [([2], "=", 1)],
+        "var_signs": None,
+        "bounds": [(0, None)],
+        "integer": [True],
+    }
+    assert BranchAndBound(model).solve()["status"] == "infeasible"
+
+
+def test_node_limit_and_progress_log():
+    bb = BranchAndBound(knapsack(), max_nodes=1)
+    result = bb.solve()
+    assert result["status"] == "node_limit"
+    assert result["nodes"] == 1
+    assert bb.progress and bb.progress[-1]["nodes"] == 1
+    assert len(bb.report()) == len(bb.progress)
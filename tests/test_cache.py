@@ -0,0 +1,84 @@
+from cache import SolveCache, cache_namespace, model_key
+from revised_simplex import RevisedSimplex
+from simplex import Simplex
+
+
+def make_model(sparse=False):
+    rows = [[1, 1], [1, 3], [1, 0]]
+    if sparse:
+        rows = [{j: a for j, a in enumerate(row) if a} for row in rows]
+    return {
+        "objective_type": "Max",
+        "objective_coeffs": [3, 2],
+        "constraints": [(rows[0], "<=", 4), (rows[1], "<=", 6), (rows[2], "<=", 3)],
+        "var_signs": [">=0", ">=0"],
+        "bounds": None,
+    }
+
+
+def test_equivalent_models_share_a_key():
+    dense = make_model()
+    sparse = make_model(sparse=True)
+    key = model_key("Max", dense["objective_coeffs"], dense["constraints"], dense["var_signs"])
+    assert key == model_key("max", [3.0, 2.0], sparse["constraints"], None, [(0, None), (0, None)])
+
+
+def test_outcome_options_are_part_of_the_key():
+    assert cache_namespace(Simplex, {}) != cache_namespace(Simplex, {"presolve": True})
+    assert cache_namespace(Simplex, {}) != cache_namespace(Simplex, {"method": "two_phase"})
+    assert cache_namespace(Simplex, {}) != cache_namespace(Simplex, {"max_iterations": 5})
+    assert cache_namespace(Simplex, {}) != cache_namespace(RevisedSimplex, {})
+    # the pricing rule and backend only change the path to the optimum
+    assert cache_namespace(Simplex, {}) == cache_namespace(Simplex, {"pricing": "bland"})
+    assert cache_namespace(Simplex, {}) == cache_namespace(Simplex, {"backend": "list"})
+
+
+def test_iteration_limit_result_is_not_cached():
+    cache = SolveCache(10)
+    record, cached = cache.solve(make_model(), max_iterations=1)
+    assert record["status"] == "max_iterations_reached" and not cached
+    record, cached = cache.solve(make_model())
+    assert record["status"] == "optimal" and not cached
+    assert record["optimal_value"] == 11.0
+    record, cached = cache.solve(make_model(), max_iterations=1)
+    assert not cached
+
+
+def test_hits_across_pricing_and_misses_across_presolve():
+    cache = SolveCache(10)
+    cache.solve(make_model())
+    assert cache.solve(make_model(sparse=True), pricing="bland")[1]
+    record, cached = cache.solve(make_model(), presolve=True)
+    assert not cached and record["basis"] is None
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_solve_file_counts_one_lookup_per_solve(tmp_path):
+    text = "MAX 3 x1 + 2 x2\nx1 + x2 <= 4\nx1 + 3 x2 <= 6\nx1 <= 3\n"
+    first = tmp_path / "first.txt"
+    first.write_text(text)
+    # the same model written differently: a file key miss, a model key hit
+    second = tmp_path / "second.txt"
+    second.write_text(text.replace(" + ", "+"))
+    cache = SolveCache(10)
+    record, cached = cache.solve_file(str(first))
+    assert record["optimal_value"] == 11.0 and not cached
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 0
+    assert cache.solve_file(str(first))[1]
+    assert cache.solve_file(str(second))[1]
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 2
+
+
+def test_sqlite_store_is_shared_between_caches(tmp_path):
+    path = str(tmp_path / "cache.sqlite")
+    first = SolveCache(10, path)
+    first.solve(make_model())
+    first.solve(make_model(), max_iterations=1)
+    first.close()
+
+    second = SolveCache(10, path)
+    record, cached = second.solve(make_model())
+    assert cached and record["optimal_value"] == 11.0
+    assert second.stats()["disk_hits"] == 1
+    assert not second.solve(make_model(), max_iterations=1)[1]
+    second.close()
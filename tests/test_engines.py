@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from conftest import feasible
+from interior_point import InteriorPoint, cholesky_solve
+from pricing import PRICING_RULES
+from revised_simplex import RevisedSimplex
+from simplex import Simplex
+
+# name: (objective, constraints, type, bounds, status, optimal value)
+CASES = {
+    "classic": (
+        [3, 5], [([1, 0], "<=", 4), ([0, 2], "<=", 12), ([3, 2], "<=", 18)],
+        "Max", [(0, None), (0, None)], "optimal", 36.0,
+    ),
+    "equality_min": (
+        [2, 3], [([1, 1], ">=", 4), ([1, -1], "=", 1)],
+        "Min", [(0, None), (0, None)], "optimal", 9.5,
+    ),
+    "free": (
+        [1, -2], [([1, 1], ">=", 1), ([1, -1], ">=", -4), ([1, 0], "<=", 2)],
+        "Max", [(0, None), (None, None)], "optimal", 4.0,
+    ),
+    "nonpositive": (
+        [2, 1], [([1, 1], ">=", -6), ([1, -2], "<=", 2)],
+        "Min", [(None, 0), (None, 0)], "optimal", -12.0,
+    ),
+    "bounded": (
+        [1, 2, -1], [([1, 1, 1], "<=", 6), ([1, -1, 0], ">=", -2)],
+        "Max", [(-5, 5), (1, 3), (-2, None)], "optimal", 13.0,
+    ),
+    "degenerate": (
+        [0.75, -20, 0.5, -6],
+        [([0.25, -8, -1, 9], "<=", 0), ([0.5, -12, -0.5, 3], "<=", 0), ([0, 0, 1, 0], "<=", 1)],
+        "Max", [(0, None)] * 4, "optimal", 1.25,
+    ),
+    "infeasible": (
+        [1, 1], [([1, 1], "<=", 1), ([1, 1], ">=", 2)],
+        "Max", [(0, None), (0, None)], "infeasible", None,
+    ),
+    "unbounded": (
+        [1, 1], [([1, -1], "<=", 1)],
+        "Max", [(0, None), (0, None)], "unbounded", None,
+    ),
+}
+
+ENGINES = {
+    "big_m": (Simplex, {}),
+    "two_phase": (Simplex, {"method": "two_phase"}),
+    "dual": (Simplex, {"method": "dual"}),
+    "list_backend": (Simplex, {"backend": "list", "method": "two_phase"}),
+    "presolve": (Simplex, {"presolve": True}),
+    "scaling": (Simplex, {"scaling": True}),
+    "crash": (Simplex, {"crash": True}),
+    "revised_big_m": (RevisedSimplex, {}),
+    "revised_two_phase": (RevisedSimplex, {"method": "two_phase"}),
+    "interior": (InteriorPoint, {}),
+    "interior_no_crossover": (InteriorPoint, {"crossover": False}),
+}
+
+
+def solve(engine, case, **options):
+    cls, defaults = ENGINES[engine]
+    c, constraints, objective_type, bounds = CASES[case][:4]
+    simplex = cls(c, constraints, objective_type, bounds=bounds, trace="off",
+                  **{**defaults, **options})
+    return simplex.solve()
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("case", CASES)
+def test_reference_optimum(engine, case):
+    _, constraints, _, bounds, status, value = CASES[case]
+    result = solve(engine, case)
+    assert result["status"] == status
+    if status == "optimal":
+        assert result["optimal_value"] == pytest.approx(value, rel=1e-6, abs=1e-6)
+        assert feasible(result["solution"], constraints, bounds)
+
+
+@pytest.mark.parametrize("pricing", PRICING_RULES)
+@pytest.mark.parametrize("case", ["classic", "free", "bounded", "degenerate"])
+def test_pricing_rules_agree(pricing, case):
+    for engine in ("big_m", "revised_two_phase"):
+        result = solve(engine, case, pricing=pricing)
+        assert result["optimal_value"] == pytest.approx(CASES[case][5], rel=1e-6, abs=1e-6)
+
+
+def test_revised_big_m_split_free_column():
+    # reduced costs of the split free column come out as -4e-10 (duals of
+    # the size of M); that is round-off, not an unbounded ray
+    rows = [
+        ([0, 0, -2], "<=", 8), ([0, -2, 0], "=", 10), ([0, 0, -2], "=", 4),
+        ([0, 6, 7], "=", -44), ([-1, 4, 8], "<=", -30), ([6, 0, 4], "=", -14),
+    ]
+    for j in range(3):
+        unit = [0, 0, 0]
+        unit[j] = 1
+        rows += [(unit, "<=", 20), (unit, ">=", -20)]
+    for cls in (Simplex, RevisedSimplex):
+        result = cls([8, -1, 9], rows, "Min", ["<=0", "<=0", "free"], trace="off").solve()
+        assert result["status"] == "optimal"
+        assert result["optimal_value"] == pytest.approx(-21.0, rel=1e-8)
+
+
+def test_crossed_bounds_are_infeasible():
+    for cls in (Simplex, RevisedSimplex, InteriorPoint):
+        simplex = cls([1, 1], [([1, 1], "<=", 4)], "Max", bounds=[(0, -2), (0, None)], trace="off")
+        assert simplex.solve()["status"] == "infeasible"
+
+
+def test_cholesky_solve():
+    rng = np.random.default_rng(0)
+    M = rng.normal(size=(30, 30))
+    M = M @ M.T + np.eye(30)
+    r = rng.normal(size=30)
+    x = cholesky_solve(np.linalg.cholesky(M), r)
+    assert np.allclose(M @ x, r)
@@ -0,0 +1,91 @@
+import pytest
+
+import revised_simplex
+import simplex as simplex_module
+from observers import MetricsCollector, SolverObserver
+from revised_simplex import RevisedSimplex
+from simplex import Simplex
+
+# Beale's cycling example: 14 pivots, 10 of them degenerate
+DEGENERATE = (
+    [0.75, -20, 0.5, -6],
+    [([0.25, -8, -1, 9], "<=", 0), ([0.5, -12, -0.5, 3], "<=", 0), ([0, 0, 1, 0], "<=", 1)],
+)
+BOUNDED = (
+    [3, 2, 4],
+    [([1, 1, 2], "<=", 4), ([2, 0, 3], "<=", 5), ([2, 1, 3], "<=", 7), ([1, 1, 1], ">=", 1)],
+)
+
+
+class Recorder(SolverObserver):
+    def __init__(self):
+        self.calls = []
+        self.events = []
+
+    def on_start(self, engine):
+        self.calls.append("start")
+
+    def on_pivot(self, engine, event):
+        self.calls.append("pivot")
+        self.events.append(event)
+
+    def on_finish(self, engine, status):
+        self.calls.append(status)
+
+
+@pytest.mark.parametrize("cls", [Simplex, RevisedSimplex])
+def test_collector_totals_match_the_engine(cls):
+    collector = MetricsCollector()
+    simplex = cls(*DEGENERATE, "Max", trace="off", observers=[collector])
+    assert simplex.solve()["optimal_value"] == pytest.approx(1.25)
+    totals = collector.totals()
+    assert totals["runs"] == 1 and totals["statuses"] == ["optimal"]
+    assert totals["iterations"] == totals["primal_pivots"] == simplex.iterations == 14
+    assert totals["degenerate_pivots"] == simplex.degenerate_pivots == 10
+    steps = totals["pricing_time"] + totals["ratio_time"] + totals["pivot_time"]
+    assert 0.0 < steps <= totals["solve_time"]
+    assert collector.report().startswith("Execuções: 1 (optimal)")
+
+
+def test_collector_adds_up_over_resolves():
+    collector = MetricsCollector()
+    simplex = Simplex(*BOUNDED, "Max", trace="off", bounds=[(0, 3), (0, None), (0, 1)])
+    simplex.add_observer(collector)
+    simplex.solve()
+    cold = simplex.iterations
+    simplex.update_rhs([8, 5, 3, 1])
+    simplex.resolve()
+    totals = collector.totals()
+    assert totals["runs"] == 2 and totals["statuses"] == ["optimal", "optimal"]
+    assert totals["iterations"] == cold + simplex.iterations
+    assert totals["dual_pivots"] > 0 and totals["bound_flips"] > 0
+    assert (totals["primal_pivots"] + totals["dual_pivots"] + totals["bound_flips"]
+            == totals["iterations"])
+
+
+def test_events():
+    recorder = Recorder()
+    simplex = Simplex(*DEGENERATE, "Max", trace="off", observers=[recorder])
+    simplex.solve()
+    assert recorder.calls == ["start"] + ["pivot"] * 14 + ["optimal"]
+    assert [event.iteration for event in recorder.events] == list(range(1, 15))
+    assert sum(event.degenerate for event in recorder.events) == 10
+    assert recorder.events[-1].objective == pytest.approx(1.25)
+    assert all(event.kind == "primal" and event.entering != event.leaving
+               for event in recorder.events)
+
+
+class NoClock:
+    @staticmethod
+    def perf_counter():
+        raise AssertionError("an unobserved solve read the clock")
+
+
+@pytest.mark.parametrize("cls", [Simplex, RevisedSimplex])
+def test_unobserved_solve_reads_no_clock_and_builds_no_events(cls, monkeypatch):
+    monkeypatch.setattr(simplex_module, "time", NoClock)
+    monkeypatch.setattr(revised_simplex, "time", NoClock)
+    monkeypatch.setattr(simplex_module, "PivotEvent", None)
+    assert cls(*DEGENERATE, "Max", trace="off").solve()["optimal_value"] == pytest.approx(1.25)
+    with pytest.raises(AssertionError):
+        cls(*DEGENERATE, "Max", trace="off", observers=[MetricsCollector()]).solve()
@@ -0,0 +1,74 @@
+import pytest
+
+from simplex import Simplex
+
+# optimum (2, 6), value 36, basis {x1, x2, slack of row 1}; duals (0, 1.5, 1)
+C = [3, 5]
+ROWS = [([1, 0], "<=", 4), ([0, 2], "<=", 12), ([3, 2], "<=", 18)]
+
+
+def solved(c=C, rows=ROWS, **options):
+    simplex = Simplex(c, rows, "Max", trace="off", **options)
+    simplex.solve()
+    return simplex
+
+
+def cold(rhs, rows=ROWS, **options):
+    return Simplex(C, [(a, op, b) for (a, op, _), b in zip(rows, rhs)], "Max",
+                   trace="off", **options).solve()
+
+
+@pytest.mark.parametrize("rows, options", [
+    (ROWS, {}),
+    # x1 <= 4 as a native bound instead of a row
+    (ROWS[1:], {"bounds": [(0, 4), (0, None)]}),
+])
+def test_solve_many_matches_cold_solves(rows, options):
+    scenarios = [[12, 18], [12, 24], [12, 9], [6, 18], [12, 15], [12, -1]]
+    if len(rows) == 3:
+        scenarios = [[4] + rhs for rhs in scenarios]
+    results = solved(rows=rows, **options).solve_many(scenarios)
+    assert [r["optimal_value"] for r in results] == pytest.approx([36, 42, 22.5, 27, 33, None])
+    for rhs, result in zip(scenarios, results):
+        expected = cold(rhs, rows, **options)
+        assert result["status"] == expected["status"]
+        if expected["status"] == "optimal":
+            assert result["solution"] == pytest.approx(expected["solution"])
+
+
+def test_scenarios_inside_the_basis_need_no_pivot():
+    simplex = solved()
+    results = simplex.solve_many([[4, 12, 18], [4, 12, 24], [4, 12, 15]])
+    assert simplex.iterations == 0
+    assert [r["solution"] for r in results] == [pytest.approx(x) for x in ([2, 6], [4, 6], [1, 6])]
+
+
+def test_ranging():
+    simplex = solved()
+    # row 3: x1 = (b3 - 12) / 3 must stay in [0, 4]
+    assert simplex.rhs_ranging([0, 0, 1]) == pytest.approx((-6, 6))
+    # row 2: x1 = (18 - b2) / 3 must stay in [0, 4]
+    assert simplex.rhs_ranging([0, 1, 0]) == pytest.approx((-6, 6))
+    # (2, 6) stays optimal for 0 <= c1 <= 7.5
+    assert simplex.objective_ranging([1, 0]) == pytest.approx((-3, 4.5))
+
+
+def test_parametric_rhs_breakpoints():
+    simplex = solved()
+    results = simplex.parametric_rhs([0, 0, 1], [-9, -6, 0, 3, 6, 9])
+    # slope 1 (the dual of row 3) inside the range, other bases outside it
+    assert [r["optimal_value"] for r in results] == pytest.approx([22.5, 30, 36, 39, 42, 42])
+    assert results[0]["solution"] == pytest.approx([0, 4.5])
+    assert results[-1]["solution"] == pytest.approx([4, 6])
+    assert simplex.current_rhs() == [4, 12, 18]
+
+
+def test_parametric_objective_breakpoints():
+    simplex = solved()
+    results = simplex.parametric_objective([1, 0], [-4, -3, 0, 4.5, 6])
+    assert [r["optimal_value"] for r in results] == pytest.approx([30, 30, 36, 45, 51])
+    assert results[0]["solution"] == pytest.approx([0, 6])
+    assert results[-1]["solution"] == pytest.approx([4, 3])
+    # the engine is left with the original objective and solution
+    assert simplex.original_objective == [3, 5]
+    assert simplex.optimal_value == 36
@@ -0,0 +1,79 @@
+import io
+import warnings
+
+import pytest
+
+from conftest import INF
+import parser
+from parser import Parser
+from simplex import Simplex
+
+
+def parse(text):
+    return Parser(io.StringIO(text)).parse()
+
+
+def solve(model):
+    return Simplex(model["objective_coeffs"], model["constraints"], model["objective_type"],
+                   var_signs=model["var_signs"], bounds=model["bounds"], trace="off").solve()
+
+
+def test_bound_lines():
+    model = parse(
+        "MAX 1 x1 + 2 x2 + 1 x3 + 1 x4 + 1 x5 + 1 x6\n"
+        "x1 + x2 <= 4\n"
+        "x1 >= 0\n"
+        "x2 <= 0\n"
+        "-5 <= x3 <= 5\n"
+        "x4 = 2\n"
+        "x5 livre\n"
+        "x6 <= 40\n"
+    )
+    assert model["bounds"] == [(0, INF), (-INF, 0), (-5, 5), (2, 2), (-INF, INF), (0, 40)]
+    assert model["var_signs"] == [">=0", "<=0", "free", ">=0", "free", ">=0"]
+    assert len(model["constraints"]) == 1
+
+
+def test_negative_upper_bound_keeps_lower_bound_zero():
+    # only "xj <= 0" makes a variable nonpositive; "x1 <= -2" bounds a
+    # nonnegative x1, as the row it used to be
+    model = parse("MAX 1 x1 + 1 x2\nx1 + x2 <= 4\nx1 <= -2\n")
+    assert model["bounds"][0] == (0, -2)
+    assert solve(model)["status"] == "infeasible"
+
+
+def test_crossed_bounds_are_infeasible():
+    model = parse("MAX 1 x1 + 1 x2\nx1 + x2 <= 4\nx1 >= 0\nx1 <= -2\n")
+    assert solve(model)["status"] == "infeasible"
+
+
+def test_nonpositive_variable():
+    model = parse("MIN 1 x1 + 1 x2\nx1 + x2 >= -4\nx1 <= 0\nx2 <= 0\n")
+    result = solve(model)
+    assert result["status"] == "optimal"
+    assert result["optimal_value"] == pytest.approx(-4.0)
+
+
+def test_lower_bound_given_before_nonpositive_form():
+    model = parse("MAX 1 x1\nx1 <= 10\nx1 >= -3\nx1 <= 0\n")
+    assert model["bounds"][0] == (-3, 0)
+
+
+def test_integer_declarations():
+    model = parse("MAX 1 x1 + 1 x2 + 1 x3\nx1 + x2 + x3 <= 4\ninteiras x1, x3\ninteiro x2\n")
+    assert model["integer"] == [True, True, True]
+    model = parse("MAX 1 x1 + 1 x2\nx1 + x2 <= 4\n")
+    assert model["integer"] == [False, False]
+
+
+def test_sparse_rows():
+    model = Parser(io.StringIO("MAX 1 x1 + 1 x3\nx1 + 0 x2 + 2 x3 <= 4\n"), sparse=True).parse()
+    assert model["constraints"] == [({0: 1, 2: 2}, "<=", 4)]
+
+
+def test_module_has_no_invalid_escapes():
+    with open(parser.__file__, encoding="utf-8") as f:
+        source = f.read()
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        compile(source, parser.__file__, "exec")
@@ -0,0 +1,51 @@
+import pytest
+
+from presolve import FIX, SHIFT, Presolve
+from simplex import Simplex
+from sparse import CSRMatrix
+
+# x0 = 2 is fixed, x1 >= 1.5 shifted, the last two rows are parallel and
+# x3 (negative cost, only in <= rows with positive entries) is dominated
+C = [1, 2, 3, -1]
+ROWS = [[1, 0, 0, 0], [0, 1, 0, 0], [1, 1, 1, 1], [2, 2, 2, 2]]
+OPS = ["=", ">=", "<=", "<="]
+RHS = [2, 1.5, 10, 30]
+
+
+def presolve(rows=ROWS, ops=OPS, rhs=RHS, c=C):
+    return Presolve(c, CSRMatrix.from_rows(rows, len(c)), ops, rhs).run()
+
+
+def test_reductions_and_postsolve_stack():
+    p = presolve()
+    assert p.status is None
+    assert p.stack == [(FIX, 0, 2.0), (SHIFT, 1, 1.5), (FIX, 3, 0.0)]
+    c, A, ops, rhs = p.reduced_model()
+    assert (p.cols, p.rows) == ([1, 2], [2])
+    assert (c, ops, rhs) == ([2.0, 3.0], ["<="], [6.5])
+    assert A.shape == (1, 2)
+    # optimum of the reduced model: x1' = 0, x2 = 6.5
+    assert p.restore([0.0, 6.5], 19.5) == ([2.0, 1.5, 6.5, 0.0], 24.5)
+
+
+def test_stack_is_undone_in_reverse_order():
+    # x1 >= 1.5 shifts x1 = 1.5 + x1'; then x1 <= 1.5 becomes x1' <= 0 and
+    # fixes x1' at 0, which must be restored before the shift is added back
+    p = presolve(rows=[[0, 1], [0, 1], [1, 1]], ops=[">=", "<=", "<="], rhs=[1.5, 1.5, 4], c=[1, 1])
+    assert p.stack == [(SHIFT, 1, 1.5), (FIX, 1, 0.0)]
+    p.reduced_model()
+    assert p.restore([2.5], 2.5) == ([2.5, 1.5], 4.0)
+
+
+def test_infeasible_singleton():
+    assert presolve(rhs=[-1, 1.5, 10, 30]).status == "infeasible"
+
+
+@pytest.mark.parametrize("objective_type", ["Max", "Min"])
+def test_solution_matches_solve_without_presolve(objective_type):
+    constraints = list(zip(ROWS, OPS, RHS))
+    plain = Simplex(C, constraints, objective_type, trace="off").solve()
+    reduced = Simplex(C, constraints, objective_type, trace="off", presolve=True).solve()
+    assert reduced["status"] == plain["status"] == "optimal"
+    assert reduced["optimal_value"] == pytest.approx(plain["optimal_value"])
+    assert reduced["solution"] == pytest.approx(plain["solution"])
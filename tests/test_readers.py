@@ -0,0 +1,75 @@
+import os
+
+import pytest
+
+from conftest import INF
+from readers import lp_tokens, read_model
+from simplex import Simplex
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def read(name, sparse=False):
+    return read_model(os.path.join(FIXTURES, name), sparse=sparse)
+
+
+def solve(model):
+    return Simplex(model["objective_coeffs"], model["constraints"], model["objective_type"],
+                   bounds=model["bounds"], trace="off").solve()
+
+
+def test_mps_ranges_bounds_and_markers():
+    model = read("ranges.mps")
+    assert model["objective_type"] == "Max"
+    assert model["var_names"] == ["X", "Y", "Z", "W", "B"]
+    assert model["objective_coeffs"] == [2, 3, 1, -1, 1]
+    rows = [(list(row), op, rhs) for row, op, rhs in model["constraints"]]
+    # L row with range 4, G row with range 3, E rows with ranges -2 and 1
+    assert ([1, 1, 1, 0, 1], "<=", 10) in rows and ([1, 1, 1, 0, 1], ">=", 6) in rows
+    assert ([1, -1, 0, 0, 0], ">=", -2) in rows and ([1, -1, 0, 0, 0], "<=", 1) in rows
+    assert ([0, 1, 0, 1, 0], "<=", 3) in rows and ([0, 1, 0, 1, 0], ">=", 1) in rows
+    assert ([0, 0, 1, 1, 0], ">=", 2) in rows and ([0, 0, 1, 1, 0], "<=", 3) in rows
+    assert len(rows) == 8
+    assert model["bounds"] == [(0, 4), (0, INF), (1, INF), (-INF, 2), (0, 1)]
+    assert model["integer"] == [False, True, False, False, True]
+
+
+def test_mps_optimum():
+    result = solve(read("ranges.mps"))
+    assert result["status"] == "optimal"
+    assert result["optimal_value"] == pytest.approx(67 / 3)
+
+
+def test_lp_constants_move_to_the_right_side():
+    model = read("constants.lp")
+    assert model["objective_type"] == "Max"
+    assert model["var_names"] == ["x", "y", "z", "w", "b"]
+    assert model["constraints"][0] == ([1, 1, 0, 0, 0], "<=", 7)
+    assert model["constraints"][2] == ([1, 4, 0, 0, 0], ">=", 4)
+    assert model["bounds"] == [(0, INF), (0, 5), (-1, 1), (-INF, INF), (0, 1)]
+    assert model["integer"] == [False, True, False, False, True]
+
+
+def test_lp_optimum_ignores_objective_constant():
+    result = solve(read("constants.lp"))
+    assert result["status"] == "optimal"
+    assert result["optimal_value"] == pytest.approx(21.5)
+
+
+@pytest.mark.parametrize("name", ["ranges.mps", "constants.lp"])
+def test_sparse_rows_match_dense(name):
+    dense = read(name)
+    sparse = read(name, sparse=True)
+    for (row, op, rhs), (coeffs, sparse_op, sparse_rhs) in zip(dense["constraints"],
+                                                             sparse["constraints"]):
+        assert {j: a for j, a in enumerate(row) if a} == coeffs
+        assert (op, rhs) == (sparse_op, sparse_rhs)
+
+
+def test_lp_tokens():
+    assert lp_tokens("c1: 2 x + .5e1 y >= -4  ") == [
+        ("name", "c1"), ("colon", ":"), ("num", "2"), ("name", "x"), ("sign", "+"),
+        ("num", ".5e1"), ("name", "y"), ("op", ">="), ("sign", "-"), ("num", "4"),
+    ]
+    with pytest.raises(ValueError, match=r"' \* 3 z'"):
+        lp_tokens("2 x + y * 3 z")
@@ -0,0 +1,82 @@
+import pytest
+
+from conftest import INF
+from revised_simplex import RevisedSimplex
+from simplex import Simplex
+
+
+def flat(values):
+    return [x for value in values for x in (value if isinstance(value, tuple) else (value,))]
+
+
+def assert_analysis(report, expected):
+    assert report.keys() == expected.keys()
+    for key, values in expected.items():
+        assert flat(report[key]) == pytest.approx(flat(values)), key
+
+
+@pytest.mark.parametrize("cls", [Simplex, RevisedSimplex])
+def test_max_model(cls):
+    # optimum (2, 6); rows 2 and 3 are binding, row 1 has slack 2.
+    # b2 in [6, 18] and b3 in [12, 24] keep x1 = (b3 - b2) / 3 within [0, 4];
+    # (2, 6) stays optimal for 0 <= c1 <= 7.5 and c2 >= 2
+    simplex = cls([3, 5], [([1, 0], "<=", 4), ([0, 2], "<=", 12), ([3, 2], "<=", 18)], "Max",
+                  trace="off")
+    simplex.solve()
+    assert_analysis(simplex.sensitivity_analysis(), {
+        "duals": [0, 1.5, 1],
+        "reduced_costs": [0, 0],
+        "slacks": [2, 0, 0],
+        "rhs_ranges": [(2, INF), (6, 18), (12, 24)],
+        "cost_ranges": [(0, 7.5), (2, INF)],
+    })
+
+
+@pytest.mark.parametrize("options", [{}, {"method": "two_phase"}, {"scaling": True}])
+def test_min_model_with_nonbasic_variables(options):
+    # optimum x = (10, 0, 0): row 1 binding with dual 2, row 2 with surplus 8.
+    # Reduced costs c_j - 2 a_1j: 1 for x2, 2 for x3; x1 stays optimal
+    # for 0 <= c1 <= 3 (below 0 the model is unbounded, above 3 x2 is
+    # cheaper)
+    result = Simplex([2, 3, 4], [([1, 1, 1], ">=", 10), ([1, -1, 0], ">=", 2)], "Min",
+                     trace="off", sensitivity=True, **options).solve()
+    assert result["optimal_value"] == pytest.approx(20)
+    assert_analysis(result["sensitivity"], {
+        "duals": [2, 0],
+        "reduced_costs": [0, 1, 2],
+        "slacks": [0, 8],
+        "rhs_ranges": [(2, INF), (-INF, 10)],
+        "cost_ranges": [(0, 3), (2, INF), (2, INF)],
+    })
+
+
+def test_variable_at_its_upper_bound():
+    # x1 <= 1 is a native bound and x1 stays at it: reduced cost 3 and
+    # optimal for any c1 >= 0; x2 = b1 / 2 with 3 + b1 <= 18
+    result = Simplex([3, 5], [([0, 2], "<=", 12), ([3, 2], "<=", 18)], "Max", trace="off",
+                     bounds=[(0, 1), (0, None)], sensitivity=True).solve()
+    assert result["solution"] == pytest.approx([1, 6])
+    assert_analysis(result["sensitivity"], {
+        "duals": [2.5, 0],
+        "reduced_costs": [3, 0],
+        "slacks": [0, 3],
+        "rhs_ranges": [(0, 15), (15, INF)],
+        "cost_ranges": [(0, INF), (0, INF)],
+    })
+
+
+def test_report_and_non_optimal_results(tmp_path):
+    simplex = Simplex([3, 5], [([1, 0], "<=", 4), ([0, 2], "<=", 12), ([3, 2], "<=", 18)], "Max",
+                      trace="off", sensitivity=True)
+    simplex.solve()
+    path = str(tmp_path / "report.txt")
+    simplex.write_report(path)
+    with open(path, encoding="utf-8") as f:
+        text = f.read()
+    assert "Sensibilidade" in text
+    assert "R2: dual = 1.5000, folga = 0.0000, RHS em [6.0000, 18.0000]" in text
+    assert "x2: custo reduzido = 0.0000, custo em [2.0000, None]" in text
+
+    infeasible = Simplex([1, 1], [([1, 1], "<=", 1), ([1, 1], ">=", 2)], "Max", trace="off",
+                         sensitivity=True).solve()
+    assert infeasible["sensitivity"] is None
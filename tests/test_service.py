@@ -0,0 +1,101 @@
+import asyncio
+import json
+
+from service import SolveService, solve_job, valid_id, valid_timeout
+
+MODEL = "MAX 3 x1 + 2 x2\nx1 + x2 <= 4\nx1 + 3 x2 <= 6\nx1 <= 3\n"
+
+
+def test_valid_ids():
+    assert valid_id(None) and valid_id(7) and valid_id("a")
+    assert not valid_id([1]) and not valid_id({"a": 1}) and not valid_id(True)
+
+
+def test_valid_timeouts():
+    assert valid_timeout(None) and valid_timeout(5) and valid_timeout(0.5)
+    assert not valid_timeout("5") and not valid_timeout(0) and not valid_timeout(-1)
+    assert not valid_timeout(True) and not valid_timeout(float("nan"))
+
+
+def test_solve_job():
+    record = solve_job({"text": MODEL, "options": {"method": "two_phase", "unknown": 1}})
+    assert record["status"] == "optimal" and record["optimal_value"] == 11.0
+    assert record["error"] is None
+
+
+def test_solve_job_reports_errors():
+    record = solve_job({"text": MODEL, "engine": "nope"})
+    assert record["status"] == "error" and "Unknown engine" in record["error"]
+
+
+class FakePool:
+    """
+    Stands in for the worker pool: answers at once, or raises like a pool
+    whose worker died when the job asks for it.
+    """
+
+    def __init__(self):
+        self.jobs = []
+
+    async def run(self, job, timeout=None):
+        self.jobs.append((job["id"], timeout))
+        if job.get("die"):
+            raise RuntimeError("Worker died")
+        return {"status": "optimal", "error": None}
+
+
+class FakeWriter:
+    def __init__(self):
+        self.data = b""
+
+    def write(self, data):
+        self.data += data
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def exchange(requests):
+    """
+    Feeds the requests to SolveService.handle on a fake connection and
+    returns (responses by id, jobs the pool was given).
+    """
+    service = SolveService(workers=1, timeout=30)
+    service.pool = FakePool()
+
+    async def run():
+        service.slots = asyncio.Semaphore(service.max_pending)
+        reader = asyncio.StreamReader()
+        for request in requests:
+            reader.feed_data((json.dumps(request) + "\n").encode())
+        reader.feed_eof()
+        writer = FakeWriter()
+        await service.handle(reader, writer)
+        return writer.data
+
+    data = asyncio.run(run())
+    responses = {r["id"]: r for r in map(json.loads, data.decode().splitlines())}
+    return responses, service.pool.jobs
+
+
+def test_invalid_timeout_is_answered_with_an_error():
+    responses, jobs = exchange([
+        {"id": 1, "text": MODEL, "timeout": "5"},
+        {"id": 2, "text": MODEL, "timeout": -1},
+        {"id": 3, "text": MODEL, "timeout": None},
+        {"id": 4, "text": MODEL},
+    ])
+    for request_id in (1, 2):
+        assert responses[request_id]["status"] == "error"
+        assert "timeout" in responses[request_id]["error"]
+    assert responses[3]["status"] == responses[4]["status"] == "optimal"
+    assert sorted(jobs) == [(3, None), (4, 30)]
+
+
+def test_worker_failure_is_answered_with_an_error():
+    responses, _ = exchange([{"id": 1, "text": MODEL, "die": True}, {"id": 2, "text": MODEL}])
+    assert responses[1] == {"id": 1, "status": "error", "error": "RuntimeError: Worker died"}
+    assert responses[2]["status"] == "optimal"
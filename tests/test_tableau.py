@@ -0,0 +1,14 @@
+import pytest
+
+from numpy_tableau import NumpyTableau
+from tableau import Tableau
+
+
+@pytest.mark.parametrize("backend", [Tableau, NumpyTableau])
+def test_round_off_negative_basic_blocks_the_step(backend):
+    # the slack of row 1 is degenerate; round-off left it at -1e-17 instead
+    # of 0, and entering x1 must still stop at that row
+    tableau = backend([[1, 1], [1, 0]], [4, 0], [1, 1])
+    tableau.build_tableau([0, 1])
+    tableau.tableau[1][-1] = -1e-17
+    assert tableau.find_pivot_row(0) == 1
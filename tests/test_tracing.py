@@ -0,0 +1,55 @@
+import pytest
+
+from simplex import Simplex
+from tracing import Tracer
+
+C = [3, 5]
+ROWS = [([1, 0], "<=", 4), ([0, 2], "<=", 12), ([3, 2], "<=", 18)]
+
+
+def solve(trace, report_path=None):
+    simplex = Simplex(C, ROWS, "Max", trace=trace, report_path=report_path)
+    simplex.solve()
+    return simplex
+
+
+def test_off_formats_and_prints_nothing(capsys):
+    simplex = solve("off")
+    assert simplex.iteration_logs == []
+    assert capsys.readouterr().out == ""
+
+
+def test_summary_is_one_line_per_iteration(capsys):
+    simplex = solve("summary")
+    assert len(simplex.iteration_logs) == simplex.iterations + 1
+    assert simplex.iteration_logs[0] == "Iteracao 0: Z = 0.0000"
+    assert simplex.iteration_logs[1] == "Iteracao 1: Z = 30.0000 | entra x2, sai w2"
+    assert capsys.readouterr().out.splitlines() == simplex.iteration_logs
+
+
+def test_every_n_keeps_every_nth_tableau():
+    full = solve("full")
+    every = solve("every:2")
+    assert len(full.iteration_logs) == full.iterations + 1
+    assert every.iteration_logs == full.iteration_logs[::2]
+
+
+def test_unknown_level():
+    with pytest.raises(ValueError):
+        Tracer("verbose")
+
+
+def test_streamed_report_matches_buffered_report(tmp_path):
+    streamed_path = str(tmp_path / "streamed.txt")
+    streamed = solve("full", report_path=streamed_path)
+    # the iterations went to the file, not to memory
+    assert streamed.iteration_logs == []
+    streamed.write_report(streamed_path)
+
+    buffered_path = str(tmp_path / "buffered.txt")
+    buffered = solve("full")
+    buffered.write_report(buffered_path)
+    with open(streamed_path, encoding="utf-8") as a, open(buffered_path, encoding="utf-8") as b:
+        text = a.read()
+        assert text == b.read()
+    assert "=== Iteracao: 2 ===" in text and "FO: 36.0000" in text
@@ -0,0 +1,92 @@
+import pytest
+
+from revised_simplex import RevisedSimplex
+from simplex import Simplex
+
+C = [3, 2, 4]
+ROWS = [([1, 1, 2], "<=", 4), ([2, 0, 3], "<=", 5), ([2, 1, 3], "<=", 7), ([1, 1, 1], ">=", 1)]
+
+ENGINES = {
+    "big_m": (Simplex, {}),
+    "two_phase": (Simplex, {"method": "two_phase"}),
+    "dual": (Simplex, {"method": "dual"}),
+    "scaling": (Simplex, {"scaling": True}),
+    "bounded": (Simplex, {"bounds": [(0, 3), (0, None), (0, 1)]}),
+    "revised": (RevisedSimplex, {}),
+}
+
+
+def make(engine, c=C, rhs=None, extra=()):
+    cls, options = ENGINES[engine]
+    rows = ROWS if rhs is None else [(a, op, b) for (a, op, _), b in zip(ROWS, rhs)]
+    rows = rows + list(extra)
+    return cls(c, rows, "Max", trace="off", **options)
+
+
+def assert_same(warm, cold):
+    assert warm["status"] == cold["status"]
+    if cold["status"] == "optimal":
+        assert warm["optimal_value"] == pytest.approx(cold["optimal_value"])
+        assert warm["solution"] == pytest.approx(cold["solution"], abs=1e-8)
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("rhs", [[8, 5, 3, 1], [4, 1, 7, 1], [2, 5, 7, 3]])
+def test_update_rhs_matches_cold_solve(engine, rhs):
+    simplex = make(engine)
+    simplex.solve()
+    simplex.update_rhs(rhs)
+    assert_same(simplex.resolve(), make(engine, rhs=rhs).solve())
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+def test_update_objective_matches_cold_solve(engine):
+    simplex = make(engine)
+    simplex.solve()
+    simplex.update_objective([1, 5, 1])
+    assert_same(simplex.resolve(), make(engine, c=[1, 5, 1]).solve())
+
+
+def test_rhs_change_is_repaired_from_the_final_basis():
+    simplex = make("big_m")
+    simplex.solve()
+    simplex.update_rhs([8, 5, 3, 1])
+    simplex.resolve()
+    warm_iterations = simplex.iterations
+    cold = make("big_m", rhs=[8, 5, 3, 1])
+    cold.solve()
+    assert warm_iterations < cold.iterations
+
+
+def test_update_rhs_needs_one_value_per_constraint():
+    with pytest.raises(ValueError):
+        make("big_m").update_rhs([1, 2])
+
+
+@pytest.mark.parametrize("engine", ENGINES)
+@pytest.mark.parametrize("row", [
+    ([1, 0, 1], "<=", 1),
+    ({1: 1}, ">=", 3.5),
+    ([1, 1, 0], "<=", 0.5),
+    ([1, 1, 1], ">=", 10),
+])
+def test_add_constraint_matches_cold_solve(engine, row):
+    simplex = make(engine)
+    simplex.solve()
+    assert_same(simplex.add_constraint(*row), make(engine, extra=[row]).solve())
+
+
+def test_added_rows_accumulate():
+    simplex = make("big_m")
+    simplex.solve()
+    simplex.add_constraint([1, 0, 1], "<=", 1)
+    result = simplex.add_constraint([1, 1, 0], "<=", 0.5)
+    cold = make("big_m", extra=[([1, 0, 1], "<=", 1), ([1, 1, 0], "<=", 0.5)]).solve()
+    assert_same(result, cold)
+
+
+def test_add_constraint_rejects_equalities():
+    simplex = make("big_m")
+    simplex.solve()
+    with pytest.raises(ValueError):
+        simplex.add_constraint([1, 1, 1], "=", 2)